@@ -0,0 +1,30 @@
+"""
+Resume analysis engine
+Pure analysis logic shared by the Streamlit app, workers and benchmarks.
+Importing this package has no Streamlit or database side effects.
+"""
+from analysis.resume_extractor import extract_resume_data
+from analysis.job_templates import get_job_description_by_title, match_job_template
+from analysis.gap_analysis import (
+    analyze_resume_gaps, calculate_selection_probability,
+    generate_improvement_suggestions
+)
+from analysis.skill_matcher import SkillMatcher, get_skill_matcher
+from analysis.analysis_cache import analyze_resume
+from analysis.review import generate_honest_review
+from analysis.chatbot import chatbot_response, chatbot_response_stream
+
+__all__ = [
+    'extract_resume_data',
+    'get_job_description_by_title',
+    'match_job_template',
+    'analyze_resume_gaps',
+    'calculate_selection_probability',
+    'generate_improvement_suggestions',
+    'SkillMatcher',
+    'get_skill_matcher',
+    'analyze_resume',
+    'generate_honest_review',
+    'chatbot_response',
+    'chatbot_response_stream',
+]
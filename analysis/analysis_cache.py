@@ -0,0 +1,75 @@
+"""
+Memoized resume analysis
+Gap analysis, suggestions and selection probability computed once per
+content hash of (resume_data, job_requirements) and kept in a bounded
+LRU shared by every session in the process.
+
+Cached results are shared between callers and must not be mutated.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from analysis.gap_analysis import generate_improvement_suggestions
+from analysis.incremental import get_resume_profile
+from metrics import timed
+
+def analysis_key(resume_data, job_requirements):
+    """Content hash identifying one resume analyzed against one set of requirements"""
+    payload = json.dumps([resume_data, job_requirements], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class AnalysisCache:
+    """Thread-safe bounded LRU of analysis results"""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+analysis_cache = AnalysisCache(int(os.getenv('ANALYSIS_CACHE_SIZE', '512')))
+
+@timed('analyze_resume')
+def analyze_resume(resume_data, job_description, job_requirements):
+    """Return {'gaps', 'suggestions', 'selection_probability'}, computing it at most once per content hash"""
+    key = analysis_key(resume_data, job_requirements)
+    result = analysis_cache.get(key)
+    if result is None:
+        # Misses are incremental: the resume's profile remembers every skill and setting seen before
+        profile = get_resume_profile(resume_data)
+        gaps = profile.gaps(job_requirements)
+        result = {
+            'gaps': gaps,
+            'suggestions': generate_improvement_suggestions(resume_data, job_description, gaps),
+            'selection_probability': profile.selection_probability(job_requirements, gaps),
+        }
+        analysis_cache.put(key, result)
+    return result
@@ -0,0 +1,199 @@
+"""
+Career advisor chatbot
+Rule-based responses to questions about the analyzed resume.
+Messages are classified in one pass by the intent router in analysis.intents;
+new intents and response templates are added with register_intent.
+
+Responses are generated section by section (chatbot_response_stream) and the
+resume analysis and AI analysis are only computed when a handler first needs
+them, so the opening of a response can be shown before slow work finishes.
+"""
+from analysis.analysis_cache import analyze_resume
+from analysis.intents import ExampleClassifier, IntentRouter
+from analysis.review import honest_review_sections
+from metrics import timed
+
+def improvement_response(context):
+    """Overall improvement suggestions with the AI analysis"""
+    # The rule-based suggestions are ready long before the AI analysis, so they come first
+    response = "🔍 **Enhanced Resume Analysis:**\n\n"
+    suggestions = context['suggestions']
+    if suggestions:
+        response += "**Priority Improvements:**\n"
+        for suggestion in suggestions[:3]:  # Top 3 suggestions
+            priority_emoji = "🔴" if suggestion['priority'] == 'High' else "🟡" if suggestion['priority'] == 'Medium' else "🟢"
+            response += f"{priority_emoji} **{suggestion['category']}**: {suggestion['suggestion']}\n"
+            response += f"   💡 *Action*: {suggestion['action']}\n\n"
+    else:
+        response += "✅ Your resume looks well-aligned with the job requirements!\n\n"
+    yield response
+
+    # Add AI analysis results
+    ai_analysis = context['ai_analysis']
+    response = f"📊 **AI Similarity Score: {ai_analysis['similarity_score']:.1f}%**\n\n"
+
+    if ai_analysis['missing_keywords']:
+        response += f"⚠️ **Missing Keywords:** {', '.join(ai_analysis['missing_keywords'][:5])}\n\n"
+    yield response
+
+    if ai_analysis['strengths']:
+        response = "✅ **Strengths:**\n"
+        for strength in ai_analysis['strengths']:
+            response += f"• {strength}\n"
+        yield response + "\n"
+
+    if ai_analysis['improvements']:
+        response = "🔧 **AI Suggestions:**\n"
+        for improvement in ai_analysis['improvements']:
+            response += f"• {improvement}\n"
+        yield response + "\n"
+
+def review_response(context):
+    """Honest review with the selection probability, streamed section by section"""
+    return honest_review_sections(context['resume_data'], context['job_requirements'],
+                                  context['gaps'], context['selection_probability'])
+
+def skills_response(context):
+    """Skill gap analysis"""
+    gaps = context['gaps']
+    if gaps['missing_skills']:
+        response = "🎯 **Skills Analysis:**\n\n"
+        response += f"**Missing Skills**: {', '.join(gaps['missing_skills'])}\n\n"
+        response += "**Recommendations:**\n"
+        response += "• Take online courses (Coursera, Udemy, edX)\n"
+        response += "• Work on personal projects using these technologies\n"
+        response += "• Add relevant certifications to your resume\n"
+        response += "• Include these skills in your projects section\n"
+    else:
+        response = "✅ **Skills Analysis:** Your skills match well with the job requirements!"
+    return response
+
+def experience_response(context):
+    """Experience section tips"""
+    response = "💼 **Experience Analysis:**\n\n"
+    if context['gaps']['weak_experience']:
+        response += "**Areas for Improvement:**\n"
+        response += "• Add quantifiable achievements (e.g., 'Increased efficiency by 25%')\n"
+        response += "• Use strong action verbs (Developed, Implemented, Managed)\n"
+        response += "• Include specific technologies and tools used\n"
+        response += "• Add metrics and results where possible\n"
+    else:
+        response += "✅ Your experience section looks strong!"
+    return response
+
+def projects_response(context):
+    """Projects section tips"""
+    response = "🚀 **Projects Analysis:**\n\n"
+    if context['gaps']['project_gaps']:
+        response += "**Recommendations:**\n"
+        response += "• Add 2-3 relevant projects that showcase required skills\n"
+        response += "• Include GitHub links and live demos if available\n"
+        response += "• Describe the technologies used and your role\n"
+        response += "• Highlight problem-solving and technical skills\n"
+    else:
+        response += "✅ Your projects section looks good!"
+    return response
+
+HELP_RESPONSE = (
+    "📊 **ResumePro Career Advisor**\n\n"
+    "I can help you improve your resume! Ask me about:\n\n"
+    "• **'How can I improve my resume?'** - Get overall suggestions\n"
+    "• **'Will I be selected?'** - Check selection probability\n"
+    "• **'Give me an honest review'** - Get detailed feedback\n"
+    "• **'Analyze my skills'** - Check skill gaps\n"
+    "• **'Review my experience'** - Experience section tips\n"
+    "• **'Check my projects'** - Project section advice\n\n"
+    "Just type your question and I'll provide personalized advice! 💡"
+)
+
+GENERAL_RESPONSE = (
+    "💡 **General Resume Tips:**\n\n"
+    "• **Tailor your resume** to match the job description\n"
+    "• **Use keywords** from the job posting\n"
+    "• **Quantify achievements** with numbers and metrics\n"
+    "• **Keep it concise** (1-2 pages maximum)\n"
+    "• **Proofread carefully** for errors\n\n"
+    "Ask me specific questions like 'Will I be selected?' or 'Give me an honest review' for detailed feedback! 🎯"
+)
+
+# Keywords are word prefixes with weights; priorities break ties in the order of the old if-chain
+chat_router = IntentRouter(default_intent='general')
+chat_router.register('improve', {'improv': 2, 'better': 2, 'enhanc': 1.5, 'strengthen': 1.5, 'stronger': 1.5,
+                                 'suggest': 1, 'fix': 1},
+                     improvement_response, priority=7)
+chat_router.register('selection', {'selected': 2, 'select': 1.5, 'chance': 2, 'probabilit': 2, 'odds': 2,
+                                   'hired': 2, 'hire me': 2, 'shortlist': 2, 'get the job': 2, 'likely': 1},
+                     review_response, priority=6)
+chat_router.register('review', {'honest': 2, 'review': 1.5, 'feedback': 1.5, 'rate my': 1.5, 'opinion': 1.5,
+                                'critique': 2, 'evaluat': 1.5, 'assess': 1.5},
+                     review_response, priority=5)
+chat_router.register('skills', {'skill': 2, 'missing': 1.5, 'gap': 1.5, 'technolog': 1, 'learn': 1},
+                     skills_response, priority=4)
+chat_router.register('experience', {'experience': 2, 'work history': 2, 'employment': 1.5, 'internship': 1.5},
+                     experience_response, priority=3)
+chat_router.register('projects', {'project': 2, 'portfolio': 1.5, 'github': 1},
+                     projects_response, priority=2)
+chat_router.register('help', {'help': 2, 'what can you': 2.5, 'what do you': 2, 'how do i use': 2,
+                              'hello': 1, 'what': 0.5},
+                     HELP_RESPONSE, priority=1)
+chat_router.register('general', {}, GENERAL_RESPONSE)
+
+# Nearest-example fallback for messages without any keyword
+chat_router.set_classifier(ExampleClassifier({
+    'improve': ["how do i make my resume stand out", "what should i change in my cv"],
+    'selection': ["will they call me back", "am i a good fit for this role", "do i qualify for this job"],
+    'review': ["is my resume good", "how does my resume look", "grade my cv"],
+}), min_confidence=0.3)
+
+def register_intent(name, keywords, handler, priority=0):
+    """Add or replace a chat intent; handler is a callable(context) or a template string"""
+    chat_router.register(name, keywords, handler, priority)
+
+DEFAULT_AI_ANALYSIS = {'similarity_score': 0, 'missing_keywords': [], 'strengths': [], 'improvements': []}
+
+class ChatContext(dict):
+    """Handler context whose analysis entries are computed on first access"""
+
+    def __init__(self, values, loaders):
+        super().__init__(values)
+        self._loaders = loaders
+
+    def __missing__(self, key):
+        if key not in self._loaders:
+            raise KeyError(key)
+        value = self[key] = self._loaders[key](self)
+        return value
+
+def _load_ai_analysis(context):
+    # AI-powered analysis (semantic similarity) is computed by the caller when enabled,
+    # either up front or as a zero-argument callable evaluated on demand
+    ai_analysis = context['ai_analysis_source']
+    if callable(ai_analysis):
+        ai_analysis = ai_analysis()
+    return ai_analysis if ai_analysis is not None else DEFAULT_AI_ANALYSIS
+
+CONTEXT_LOADERS = {
+    # Analyze resume gaps (memoized per resume and job requirements)
+    'analysis': lambda c: analyze_resume(c['resume_data'], c['job_description'], c['job_requirements']),
+    'gaps': lambda c: c['analysis']['gaps'],
+    'suggestions': lambda c: c['analysis']['suggestions'],
+    'selection_probability': lambda c: c['analysis']['selection_probability'],
+    'ai_analysis': _load_ai_analysis,
+}
+
+@timed('chatbot_response')
+def chatbot_response_stream(user_message, resume_data, job_description, job_requirements, ai_analysis=None):
+    """Yield the chatbot response in sections as each one is ready"""
+    context = ChatContext({
+        'user_message': user_message,
+        'resume_data': resume_data,
+        'job_description': job_description,
+        'job_requirements': job_requirements,
+        'ai_analysis_source': ai_analysis,
+    }, CONTEXT_LOADERS)
+    yield from chat_router.stream(user_message, context)
+
+def chatbot_response(user_message, resume_data, job_description, job_requirements, ai_analysis=None):
+    """Generate enhanced chatbot response with AI features"""
+    return ''.join(chatbot_response_stream(user_message, resume_data, job_description, job_requirements,
+                                           ai_analysis))
@@ -0,0 +1,137 @@
+"""
+Gap analysis and scoring
+Compares structured resume data against job requirements
+"""
+from analysis.skill_matcher import get_skill_matcher, resume_text
+from metrics import timed
+
+@timed('analyze_resume_gaps')
+def analyze_resume_gaps(resume_data, job_description, job_requirements):
+    """Analyze gaps between resume and job requirements"""
+    gaps = {
+        'missing_skills': [],
+        'matching_skills': [],
+        'weak_experience': [],
+        'education_gaps': [],
+        'project_gaps': [],
+        'suggestions': []
+    }
+    
+    # Analyze skills across the whole resume, not just the SKILLS section
+    matcher = get_skill_matcher(job_requirements.get('skills', []))
+    gaps['matching_skills'], gaps['missing_skills'] = matcher.match(resume_text(resume_data))
+    
+    # Analyze experience
+    if job_requirements.get('min_experience', 0) > 0:
+        experience_text = ' '.join(resume_data['experience']).lower()
+        experience_keywords = ['years', 'experience', 'worked', 'developed', 'managed']
+        experience_indicators = sum(1 for keyword in experience_keywords if keyword in experience_text)
+        
+        if experience_indicators < 3:
+            gaps['weak_experience'].append(f"Add more detailed work experience descriptions")
+    
+    # Analyze education
+    education_text = ' '.join(resume_data['education']).lower()
+    required_education = job_requirements.get('education_level', '').lower()
+    
+    if required_education == "bachelor's" and 'bachelor' not in education_text:
+        gaps['education_gaps'].append("Consider adding Bachelor's degree or equivalent")
+    elif required_education == "master's" and 'master' not in education_text:
+        gaps['education_gaps'].append("Consider adding Master's degree or equivalent")
+    
+    # Analyze projects
+    if len(resume_data['projects']) < 2:
+        gaps['project_gaps'].append("Add more relevant projects to showcase practical skills")
+    
+    return gaps
+
+def skills_score_penalty(missing_count):
+    """Points lost for missing skills (40% weight, 10 points per missing skill)"""
+    skills_match_percentage = max(0, 100 - (missing_count * 10))
+    return (100 - skills_match_percentage) * 0.4
+
+def selection_score_adjustment(resume_data, gaps):
+    """Points gained or lost for everything except skills"""
+    score = 0
+    
+    # Experience quality (30% weight)
+    if gaps['weak_experience']:
+        score -= 20 * 0.3
+    else:
+        score += 10 * 0.3
+    
+    # Education match (15% weight)
+    if gaps['education_gaps']:
+        score -= 15 * 0.15
+    else:
+        score += 5 * 0.15
+    
+    # Projects quality (15% weight)
+    if gaps['project_gaps']:
+        score -= 15 * 0.15
+    else:
+        score += 5 * 0.15
+    
+    # Bonus for having certifications
+    if resume_data['certifications']:
+        score += 5
+    
+    return score
+
+def calculate_selection_probability(resume_data, job_requirements, gaps):
+    """Calculate the probability of being selected for the job"""
+    score = 100
+    score -= skills_score_penalty(len(gaps['missing_skills']))
+    score += selection_score_adjustment(resume_data, gaps)
+    return max(0, min(100, score))
+
+def generate_improvement_suggestions(resume_data, job_description, gaps):
+    """Generate personalized improvement suggestions"""
+    suggestions = []
+    
+    # Skills suggestions
+    if gaps['missing_skills']:
+        suggestions.append({
+            'category': 'Skills',
+            'priority': 'High',
+            'suggestion': f"Add these missing skills: {', '.join(gaps['missing_skills'])}",
+            'action': "Consider taking online courses or adding relevant projects that demonstrate these skills"
+        })
+    
+    # Experience suggestions
+    if gaps['weak_experience']:
+        suggestions.append({
+            'category': 'Experience',
+            'priority': 'High',
+            'suggestion': "Strengthen your work experience section",
+            'action': "Add quantifiable achievements, use action verbs, and include specific technologies used"
+        })
+    
+    # Education suggestions
+    if gaps['education_gaps']:
+        suggestions.append({
+            'category': 'Education',
+            'priority': 'Medium',
+            'suggestion': gaps['education_gaps'][0],
+            'action': "Highlight relevant coursework or certifications that demonstrate required knowledge"
+        })
+    
+    # Project suggestions
+    if gaps['project_gaps']:
+        suggestions.append({
+            'category': 'Projects',
+            'priority': 'Medium',
+            'suggestion': "Add more relevant projects",
+            'action': "Create projects that showcase the required skills and technologies"
+        })
+    
+    # General suggestions
+    if not resume_data['certifications']:
+        suggestions.append({
+            'category': 'Certifications',
+            'priority': 'Low',
+            'suggestion': "Consider adding relevant certifications",
+            'action': "Look for industry-recognized certifications in your field"
+        })
+    
+    return suggestions
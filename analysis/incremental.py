@@ -0,0 +1,99 @@
+"""
+Incremental re-analysis
+A ResumeProfile holds everything about one resume that doesn't depend on
+the job: an index of its token n-grams, the match result of every skill
+already asked about, and the non-skill gap components per set of job
+settings. Editing the required skills then only evaluates skills that
+haven't been seen before, and the selection probability is recomputed
+from cached components.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from analysis.gap_analysis import (
+    analyze_resume_gaps, selection_score_adjustment, skills_score_penalty
+)
+from analysis.skill_matcher import canonical_skill, resume_text, skill_phrases, tokenize
+
+# Longest phrase served from the n-gram index; longer skills fall back to a token scan
+MAX_INDEXED_NGRAM = 4
+
+class ResumeProfile:
+    """Cached, job-independent analysis state for one resume"""
+
+    def __init__(self, resume_data):
+        self.resume_data = resume_data
+        self._tokens = tokenize(resume_text(resume_data))
+        self._ngrams = set()
+        for size in range(1, MAX_INDEXED_NGRAM + 1):
+            for start in range(len(self._tokens) - size + 1):
+                self._ngrams.add(tuple(self._tokens[start:start + size]))
+        self._skills = {}
+        self._components = {}
+        self._lock = threading.Lock()
+
+    def _contains(self, phrase):
+        if len(phrase) <= MAX_INDEXED_NGRAM:
+            return phrase in self._ngrams
+        size = len(phrase)
+        return any(tuple(self._tokens[i:i + size]) == phrase for i in range(len(self._tokens) - size + 1))
+
+    def has_skill(self, skill):
+        """Whether the resume mentions a skill (or one of its aliases); evaluated once per skill"""
+        found = self._skills.get(skill)
+        if found is None:
+            key = canonical_skill(skill)
+            found = bool(key) and any(self._contains(phrase) for phrase in skill_phrases(key))
+            self._skills[skill] = found
+        return found
+
+    def _non_skill_components(self, job_requirements):
+        settings = tuple(sorted((k, str(v)) for k, v in job_requirements.items() if k != 'skills'))
+        components = self._components.get(settings)
+        if components is None:
+            gaps = analyze_resume_gaps(self.resume_data, '', dict(job_requirements, skills=[]))
+            components = (gaps, selection_score_adjustment(self.resume_data, gaps))
+            self._components[settings] = components
+        return components
+
+    def gaps(self, job_requirements):
+        """Same result as analyze_resume_gaps, reusing per-skill and per-setting results"""
+        with self._lock:
+            base, _ = self._non_skill_components(job_requirements)
+            gaps = {key: list(value) for key, value in base.items()}
+            for skill in job_requirements.get('skills', []):
+                (gaps['matching_skills'] if self.has_skill(skill) else gaps['missing_skills']).append(skill)
+            return gaps
+
+    def selection_probability(self, job_requirements, gaps):
+        """Same result as calculate_selection_probability, from cached components"""
+        with self._lock:
+            _, adjustment = self._non_skill_components(job_requirements)
+        score = 100 - skills_score_penalty(len(gaps['missing_skills'])) + adjustment
+        return max(0, min(100, score))
+
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+MAX_PROFILES = 256
+
+def resume_key(resume_data):
+    """Content hash of structured resume data"""
+    return hashlib.sha256(json.dumps(resume_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def get_resume_profile(resume_data):
+    """Profile for a resume, reused across job requirement edits"""
+    key = resume_key(resume_data)
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+            return profile
+    profile = ResumeProfile(resume_data)
+    with _profiles_lock:
+        profile = _profiles.setdefault(key, profile)
+        _profiles.move_to_end(key)
+        while len(_profiles) > MAX_PROFILES:
+            _profiles.popitem(last=False)
+    return profile
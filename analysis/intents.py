@@ -0,0 +1,123 @@
+"""
+Chat intent router
+Classifies a chat message in one pass with a compiled keyword alternation.
+
+Every registered keyword is a word prefix ("improv" matches "improve" and
+"improving") with a weight per intent. One regex scan of the lowercased
+message sums the weights per intent; the highest score wins, with ties
+going to the intent with the higher priority. When no keyword matches,
+an optional pluggable classifier (any callable returning
+(intent, confidence)) gets a chance before falling back to the default
+intent.
+"""
+import re
+from collections import defaultdict
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+class IntentRouter:
+    """Registry of intents, their keywords and their response handlers"""
+
+    def __init__(self, default_intent='general'):
+        self.default_intent = default_intent
+        self._handlers = {}
+        self._priorities = {}
+        self._keywords = defaultdict(list)
+        self._pattern = None
+        self._classifier = None
+        self._classifier_min_confidence = 0.0
+
+    def register(self, name, keywords, handler, priority=0):
+        """Register an intent with {keyword: weight} (or a list of keywords) and a handler.
+
+        The handler is a callable taking the context dict, or a template string
+        formatted with the context.
+        """
+        if not isinstance(keywords, dict):
+            keywords = {keyword: 1.0 for keyword in keywords}
+        for keyword, weight in keywords.items():
+            self._keywords[keyword.lower()].append((name, weight))
+        self._handlers[name] = handler
+        self._priorities[name] = priority
+        self._pattern = None
+
+    def set_classifier(self, classifier, min_confidence=0.5):
+        """Fallback classifier used when no keyword matches: classifier(message) -> (intent, confidence)"""
+        self._classifier = classifier
+        self._classifier_min_confidence = min_confidence
+
+    def _compiled(self):
+        if self._pattern is None:
+            # Longest keywords first so multi-word keywords win over their prefixes
+            alternation = '|'.join(re.escape(k) for k in sorted(self._keywords, key=len, reverse=True))
+            self._pattern = re.compile(rf"\b({alternation})") if alternation else re.compile(r"(?!)")
+        return self._pattern
+
+    def classify(self, message):
+        """Return (intent, score) for a message"""
+        scores = {}
+        for keyword in self._compiled().findall(message.lower()):
+            for intent, weight in self._keywords[keyword]:
+                scores[intent] = scores.get(intent, 0.0) + weight
+        if scores:
+            intent = max(scores, key=lambda name: (scores[name], self._priorities.get(name, 0)))
+            return intent, scores[intent]
+        if self._classifier is not None:
+            intent, confidence = self._classifier(message)
+            if intent in self._handlers and confidence >= self._classifier_min_confidence:
+                return intent, confidence
+        return self.default_intent, 0.0
+
+    def handler(self, intent):
+        return self._handlers.get(intent) or self._handlers[self.default_intent]
+
+    def route(self, message, context):
+        """Classify a message and render its response"""
+        return ''.join(self.stream(message, context))
+
+    def stream(self, message, context):
+        """Classify a message and yield its response in chunks.
+
+        Handlers may return a string or yield chunks as each part is ready.
+        """
+        intent, _ = self.classify(message)
+        handler = self.handler(intent)
+        if isinstance(handler, str):
+            yield handler.format_map(context)
+            return
+        result = handler(context)
+        if isinstance(result, str):
+            yield result
+        else:
+            yield from result
+
+class ExampleClassifier:
+    """Lightweight local classifier: nearest labeled example by word overlap"""
+
+    def __init__(self, examples=None):
+        self._examples = []
+        self._postings = defaultdict(list)
+        for intent, phrases in (examples or {}).items():
+            for phrase in phrases:
+                self.add_example(intent, phrase)
+
+    def add_example(self, intent, phrase):
+        words = set(WORD_PATTERN.findall(phrase.lower()))
+        for word in words:
+            self._postings[word].append(len(self._examples))
+        self._examples.append((intent, len(words)))
+
+    def __call__(self, message):
+        """Return (intent, Jaccard overlap) of the closest example, or (None, 0.0)"""
+        words = set(WORD_PATTERN.findall(message.lower()))
+        shared = {}
+        for word in words:
+            for position in self._postings.get(word, ()):
+                shared[position] = shared.get(position, 0) + 1
+        best_intent, best_score = None, 0.0
+        for position, overlap in shared.items():
+            intent, size = self._examples[position]
+            score = overlap / (len(words) + size - overlap)
+            if score > best_score:
+                best_intent, best_score = intent, score
+        return best_intent, best_score
@@ -0,0 +1,187 @@
+"""
+Job description templates
+Role templates used to pre-fill the job requirements form.
+
+Templates are loaded once from a JSON data file (analysis/data/job_templates.json,
+or the file named by JOB_TEMPLATES_PATH) into an index of normalized title
+tokens plus character trigrams, so abbreviated or misspelled titles such as
+"Sr. SWE" or "ML Eng" still find the right template, with a confidence score.
+A template only matches when the query shares one of its specific title words
+(exactly, as part of a word, or misspelled); sharing just a role noun such as
+"engineer" or "manager" falls back to the default template.
+"""
+import json
+import os
+import re
+from collections import Counter
+
+DEFAULT_TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'job_templates.json')
+
+# Below this confidence the default template is used
+MIN_CONFIDENCE = 0.56
+
+TITLE_TOKEN_PATTERN = re.compile(r"[a-z0-9+#/]+")
+
+# Common abbreviations and synonyms in job titles -> their normalized form
+TITLE_ABBREVIATIONS = {
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dev": "engineer",
+    "developer": "engineer",
+    "programmer": "engineer",
+    "ml": "machine learning",
+    "mle": "machine learning engineer",
+    "ds": "data scientist",
+    "pm": "product manager",
+    "fe": "frontend",
+    "be": "backend",
+    "sre": "devops engineer",
+    "infosec": "cybersecurity",
+    "ux": "ui/ux",
+    "ui": "ui/ux",
+    "mgr": "manager",
+    "front": "frontend",
+    "back": "backend",
+}
+
+# Role nouns shared by many templates; sharing only these doesn't make titles alike
+GENERIC_TITLE_WORDS = {"engineer", "manager", "analyst", "designer", "specialist", "consultant", "architect"}
+
+# Two title words at least this similar (character trigram dice) count as the same word
+MIN_WORD_SIMILARITY = 0.6
+
+# Seniority and filler words that don't change which template applies
+TITLE_NOISE_WORDS = {
+    "sr", "senior", "jr", "junior", "lead", "principal", "staff", "head", "associate",
+    "intern", "trainee", "i", "ii", "iii", "iv", "remote", "hybrid", "onsite",
+    "the", "a", "an", "of", "at", "for", "and", "end",
+}
+
+def normalize_title_tokens(title):
+    """Lowercase, expand abbreviations and drop seniority/filler words"""
+    tokens = []
+    for token in TITLE_TOKEN_PATTERN.findall(title.lower()):
+        for part in TITLE_ABBREVIATIONS.get(token, token).split():
+            if part not in TITLE_NOISE_WORDS:
+                tokens.append(part)
+    return tokens
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _similar_words(word, other):
+    """Same word, one a 3+ letter part of the other ("sci", "security"), or a close misspelling"""
+    if word == other:
+        return True
+    if min(len(word), len(other)) >= 3 and (word in other or other in word):
+        return True
+    a, b = _trigrams(word), _trigrams(other)
+    return 2 * len(a & b) / (len(a) + len(b)) >= MIN_WORD_SIMILARITY
+
+class JobTemplateIndex:
+    """Token and character-trigram index over job templates"""
+
+    def __init__(self, templates=None, default=None):
+        self.templates = {}
+        self.default = default or {"description": "", "skills": []}
+        self._titles = []
+        self._title_tokens = []
+        self._title_trigrams = []
+        self._specific_words = []
+        self._exact = {}
+        self._token_postings = {}
+        self._trigram_postings = {}
+        for title, template in (templates or {}).items():
+            self.add(title, template["description"], template["skills"])
+
+    @classmethod
+    def from_file(cls, path):
+        """Load templates from a JSON file: {"default": {...}, "templates": {title: {...}}}"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get("templates", {}), data.get("default"))
+
+    def add(self, title, description, skills):
+        """Add a template, or replace the description and skills of an existing one"""
+        exists = title in self.templates
+        self.templates[title] = {"description": description, "skills": list(skills)}
+        if exists:
+            return
+        position = len(self._titles)
+        tokens = normalize_title_tokens(title)
+        normalized = ' '.join(tokens)
+        trigrams = _trigrams(normalized)
+        self._titles.append(title)
+        self._title_tokens.append(len(set(tokens)))
+        self._title_trigrams.append(len(trigrams))
+        self._specific_words.append(set(tokens) - GENERIC_TITLE_WORDS or set(tokens))
+        self._exact.setdefault(normalized, position)
+        for token in set(tokens):
+            self._token_postings.setdefault(token, []).append(position)
+        for trigram in trigrams:
+            self._trigram_postings.setdefault(trigram, []).append(position)
+
+    def match(self, job_title):
+        """Return (title, template, confidence) for the best template, or (None, default, confidence)"""
+        tokens = normalize_title_tokens(job_title)
+        normalized = ' '.join(tokens)
+        if not normalized:
+            return None, self.default, 0.0
+        position = self._exact.get(normalized)
+        if position is not None:
+            title = self._titles[position]
+            return title, self.templates[title], 1.0
+
+        token_hits = Counter()
+        for token in set(tokens):
+            token_hits.update(self._token_postings.get(token, ()))
+        query_trigrams = _trigrams(normalized)
+        trigram_hits = Counter()
+        for trigram in query_trigrams:
+            trigram_hits.update(self._trigram_postings.get(trigram, ()))
+
+        query_words = set(tokens)
+        best, best_score = None, 0.0
+        for candidate, shared in trigram_hits.items():
+            if not any(_similar_words(word, query_word)
+                       for word in self._specific_words[candidate] for query_word in query_words):
+                continue
+            # Share of the template's title words present in the query ("google software engineer")
+            containment = token_hits[candidate] / max(self._title_tokens[candidate], 1)
+            # Character similarity catches typos and partial words ("sofware enginer", "data sci")
+            dice = 2 * shared / (len(query_trigrams) + self._title_trigrams[candidate])
+            score = max(dice, 0.6 * containment + 0.4 * dice)
+            if score > best_score or (score == best_score and candidate < best):
+                best, best_score = candidate, score
+
+        if best is None or best_score < MIN_CONFIDENCE:
+            return None, self.default, round(best_score, 3)
+        title = self._titles[best]
+        return title, self.templates[title], round(best_score, 3)
+
+_index = None
+
+def get_template_index():
+    """Template index loaded once per process from JOB_TEMPLATES_PATH or the bundled data file"""
+    global _index
+    if _index is None:
+        _index = JobTemplateIndex.from_file(os.getenv('JOB_TEMPLATES_PATH', DEFAULT_TEMPLATES_PATH))
+    return _index
+
+def match_job_template(job_title):
+    """Find the best template for a job title, with a 0-1 confidence score"""
+    title, template, confidence = get_template_index().match(job_title)
+    return {
+        'title': title,
+        'description': template['description'],
+        'skills': template['skills'],
+        'confidence': confidence
+    }
+
+def get_job_description_by_title(job_title):
+    """Auto-generate job description and skills based on job title"""
+    match = match_job_template(job_title)
+    return match['description'], match['skills']
@@ -0,0 +1,118 @@
+"""
+Resume text extraction
+Turns raw resume text into the structured dict used by the analysis engine
+"""
+import re
+
+from metrics import timed
+
+@timed('extract_resume_data')
+def extract_resume_data(raw_text):
+    """Extract structured data from resume text"""
+    lines = raw_text.split('\n')
+    
+    data = {
+        'name': '',
+        'email': '',
+        'phone': '',
+        'education': [],
+        'skills': [],
+        'experience': [],
+        'projects': [],
+        'certifications': []
+    }
+    
+    current_section = ""
+    current_project = []
+    current_experience = []
+    current_education = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Detect sections
+        if line.upper() in ['EDUCATION', 'SKILLS', 'EXPERIENCE', 'PROJECTS', 'CERTIFICATIONS', 'WORK EXPERIENCE']:
+            # Save current project/experience/education before switching sections
+            if current_section == "PROJECTS" and current_project:
+                data['projects'].append(' '.join(current_project))
+                current_project = []
+            elif current_section in ["EXPERIENCE", "WORK EXPERIENCE"] and current_experience:
+                data['experience'].append(' '.join(current_experience))
+                current_experience = []
+            elif current_section == "EDUCATION" and current_education:
+                data['education'].append(' '.join(current_education))
+                current_education = []
+            
+            current_section = line.upper()
+            continue
+            
+        # Extract name (first non-empty line that's not a section header)
+        if not data['name'] and current_section == "" and line and not line.upper() in ['EDUCATION', 'SKILLS', 'EXPERIENCE', 'PROJECTS', 'CERTIFICATIONS']:
+            data['name'] = line
+            continue
+            
+        # Extract email
+        if '@' in line and '.' in line:
+            email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', line)
+            if email_match:
+                data['email'] = email_match.group()
+                
+        # Extract phone
+        phone_match = re.search(r'[\+]?[1-9][\d]{0,15}', line)
+        if phone_match and len(phone_match.group()) >= 10:
+            data['phone'] = phone_match.group()
+            
+        # Extract content based on current section
+        if current_section == "EDUCATION":
+            # Check if this looks like a new education entry (contains degree keywords or dates)
+            if any(keyword in line.lower() for keyword in ['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'school', '202', '201', '2020', '2021', '2022', '2023', '2024']):
+                if current_education:  # Save previous education entry
+                    data['education'].append(' '.join(current_education))
+                    current_education = []
+            current_education.append(line)
+            
+        elif current_section == "SKILLS":
+            data['skills'].append(line)
+            
+        elif current_section in ["EXPERIENCE", "WORK EXPERIENCE"]:
+            # Check if this looks like a new job entry (contains job keywords or dates)
+            if any(keyword in line.lower() for keyword in ['202', '202', '201', 'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']) or \
+               any(keyword in line.lower() for keyword in ['engineer', 'developer', 'manager', 'analyst', 'specialist', 'coordinator', 'intern', 'associate']):
+                if current_experience:  # Save previous experience entry
+                    data['experience'].append(' '.join(current_experience))
+                    current_experience = []
+            current_experience.append(line)
+            
+        elif current_section == "PROJECTS":
+            # Detect new project: Look for project titles (short lines without bullet points)
+            # or lines that end with | or : which typically indicate project names
+            is_new_project = False
+            
+            # Check if it's a project title (not a bullet point)
+            if not (line.startswith('•') or line.startswith('-') or line.startswith('*') or line.startswith('○')):
+                # Check if it looks like a title (ends with | or :, or contains "Project" keyword)
+                if (line.endswith('|') or line.endswith(':') or 
+                    ('project' in line.lower() and len(line) < 80)):
+                    is_new_project = True
+            
+            if is_new_project and current_project:
+                # Save previous project
+                data['projects'].append(' '.join(current_project))
+                current_project = []
+            
+            current_project.append(line)
+            
+        elif current_section == "CERTIFICATIONS":
+            data['certifications'].append(line)
+    
+    # Save any remaining entries
+    if current_project:
+        data['projects'].append(' '.join(current_project))
+    if current_experience:
+        data['experience'].append(' '.join(current_experience))
+    if current_education:
+        data['education'].append(' '.join(current_education))
+    
+    return data
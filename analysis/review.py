@@ -0,0 +1,76 @@
+"""
+Honest resume review
+Renders the selection probability and gaps as a markdown review,
+section by section so the chat can stream it
+"""
+
+def honest_review_sections(resume_data, job_requirements, gaps, selection_probability):
+    """Yield the review one section at a time: assessment, strengths, improvements, probability"""
+    review = "🔍 **Honest Resume Review:**\n\n"
+    
+    # Overall assessment
+    if selection_probability >= 80:
+        review += "🎯 **Overall Assessment: Strong Candidate**\n"
+        review += "Your resume shows strong alignment with the job requirements. You have a good chance of being selected.\n\n"
+    elif selection_probability >= 60:
+        review += "📈 **Overall Assessment: Good Candidate**\n"
+        review += "Your resume is competitive but has some areas for improvement. With some enhancements, you could be a strong candidate.\n\n"
+    elif selection_probability >= 40:
+        review += "⚠️ **Overall Assessment: Needs Improvement**\n"
+        review += "Your resume needs significant improvements to be competitive for this position.\n\n"
+    else:
+        review += "❌ **Overall Assessment: Not Ready**\n"
+        review += "Your resume is not well-aligned with this job. Consider applying for positions that better match your current skills.\n\n"
+    yield review
+    
+    # Strengths
+    strengths = []
+    if not gaps['missing_skills']:
+        strengths.append("Strong skill match")
+    if not gaps['weak_experience']:
+        strengths.append("Good experience descriptions")
+    if not gaps['project_gaps']:
+        strengths.append("Relevant projects")
+    if resume_data['certifications']:
+        strengths.append("Professional certifications")
+    
+    if strengths:
+        review = "✅ **Strengths:**\n"
+        for strength in strengths:
+            review += f"• {strength}\n"
+        review += "\n"
+        yield review
+    
+    # Areas for improvement
+    improvements = []
+    if gaps['missing_skills']:
+        improvements.append(f"Missing key skills: {', '.join(gaps['missing_skills'][:3])}")
+    if gaps['weak_experience']:
+        improvements.append("Experience section needs strengthening")
+    if gaps['education_gaps']:
+        improvements.append("Education requirements not fully met")
+    if gaps['project_gaps']:
+        improvements.append("Need more relevant projects")
+    
+    if improvements:
+        review = "🔧 **Areas for Improvement:**\n"
+        for improvement in improvements:
+            review += f"• {improvement}\n"
+        review += "\n"
+        yield review
+    
+    # Selection probability
+    review = f"📊 **Selection Probability: {selection_probability:.1f}%**\n"
+    if selection_probability >= 80:
+        review += "🎉 High chance of being selected!"
+    elif selection_probability >= 60:
+        review += "👍 Good chance with some improvements"
+    elif selection_probability >= 40:
+        review += "⚠️ Moderate chance, needs work"
+    else:
+        review += "💡 Consider other opportunities or significant improvements"
+    yield review
+
+def generate_honest_review(resume_data, job_requirements, gaps, selection_probability):
+    """Generate an honest review of the resume"""
+    return ''.join(honest_review_sections(resume_data, job_requirements, gaps, selection_probability))
@@ -0,0 +1,120 @@
+"""
+Best-fit role scoring
+Scores one resume against every role template at once.
+
+Each role is a row of a binary role x skill matrix (stored transposed so
+the resume's skills select contiguous rows). The resume is encoded once
+as the set of vocabulary columns it contains, and matched-skill counts
+for all roles come from a single NumPy reduction over those rows. The
+rest of the selection probability doesn't depend on the role, so it is
+computed once and broadcast.
+"""
+import numpy as np
+
+from analysis.gap_analysis import analyze_resume_gaps, selection_score_adjustment
+from analysis.job_templates import get_template_index
+from analysis.skill_matcher import SkillMatcher, canonical_skill, resume_text
+
+class RoleScorer:
+    """Role x skill matrix that ranks roles for a resume"""
+
+    def __init__(self, roles=None):
+        self.titles = []
+        self._role_keys = []
+        self._vocabulary = {}
+        self._skill_names = []
+        self._matrix = None
+        self._totals = None
+        self._matcher = None
+        for title, skills in (roles or {}).items():
+            self.add_role(title, skills)
+
+    def add_role(self, title, skills):
+        """Add a role; the matrix is rebuilt lazily on the next score"""
+        keys = []
+        for skill in skills:
+            key = canonical_skill(skill)
+            if not key or key in keys:
+                continue
+            if key not in self._vocabulary:
+                self._vocabulary[key] = len(self._skill_names)
+                self._skill_names.append(skill)
+            keys.append(key)
+        self.titles.append(title)
+        self._role_keys.append(keys)
+        self._matrix = None
+
+    def _build(self):
+        matrix = np.zeros((len(self._skill_names), len(self.titles)), dtype=np.float32)
+        for row, keys in enumerate(self._role_keys):
+            matrix[[self._vocabulary[key] for key in keys], row] = 1.0
+        self._matrix = matrix
+        self._totals = matrix.sum(axis=0)
+        self._matcher = SkillMatcher(self._skill_names)
+
+    def encode(self, resume_data):
+        """Return the vocabulary columns of the skills found in the resume"""
+        if self._matrix is None:
+            self._build()
+        found = self._matcher.find(resume_text(resume_data))
+        return np.fromiter((self._vocabulary[key] for key in found), dtype=np.intp, count=len(found))
+
+    def score_encoded(self, columns, adjustment):
+        """Selection probability for every role given encoded skills and the non-skill adjustment"""
+        if self._matrix is None:
+            self._build()
+        matched = self._matrix[columns].sum(axis=0)
+        missing = self._totals - matched
+        penalty = (100 - np.maximum(0, 100 - missing * 10)) * 0.4
+        return np.clip(100 - penalty + adjustment, 0, 100), matched
+
+    def rank(self, resume_data, job_requirements=None, top_k=5, adjustment=None):
+        """Rank roles for a resume, best first"""
+        if not self.titles:
+            return []
+        if adjustment is None:
+            adjustment = role_adjustment(resume_data, job_requirements)
+
+        probabilities, matched = self.score_encoded(self.encode(resume_data), adjustment)
+        # Ties (scores saturate at 100) go to the role whose skills are better covered
+        coverage = matched / np.maximum(self._totals, 1)
+        top = np.lexsort((-coverage, -probabilities))[:top_k or len(self.titles)]
+        return [{
+            'title': self.titles[i],
+            'selection_probability': float(probabilities[i]),
+            'matched_skills': int(matched[i]),
+            'total_skills': int(self._totals[i]),
+        } for i in top]
+
+def role_adjustment(resume_data, job_requirements=None):
+    """The role-independent part of the selection probability"""
+    requirements = dict(job_requirements or {}, skills=[])
+    gaps = analyze_resume_gaps(resume_data, '', requirements)
+    return selection_score_adjustment(resume_data, gaps)
+
+def _rank_key(role):
+    return (-role['selection_probability'], -role['matched_skills'] / max(role['total_skills'], 1))
+
+_default_scorer = None
+
+def get_default_role_scorer():
+    """Role scorer over the built-in job templates, built once per process"""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = RoleScorer({title: template['skills'] for title, template in get_template_index().templates.items()})
+    return _default_scorer
+
+def rank_best_fit_roles(resume_data, job_requirements=None, custom_roles=None, top_k=5):
+    """Rank the built-in templates plus any custom {title: skills} roles for a resume"""
+    if not custom_roles:
+        return get_default_role_scorer().rank(resume_data, job_requirements, top_k)
+    # Custom roles get their own small scorer; the cached template scorer is reused as is
+    adjustment = role_adjustment(resume_data, job_requirements)
+    custom_titles = {title.strip().lower() for title in custom_roles}
+    default_scorer = get_default_role_scorer()
+    # Over-fetch by the number of templates a custom role can replace
+    templates = [role for role in default_scorer.rank(resume_data, job_requirements,
+                                                      top_k and top_k + len(custom_titles), adjustment)
+                 if role['title'].strip().lower() not in custom_titles]
+    custom = RoleScorer(custom_roles).rank(resume_data, job_requirements, None, adjustment)
+    return sorted(templates + custom, key=_rank_key)[:top_k or None]
@@ -0,0 +1,133 @@
+"""
+Resume <-> job semantic similarity
+Embeds texts with a locally stored sentence-transformers model when one is
+present under the models directory, and falls back to normalized hashed
+term vectors from scikit-learn when it isn't.
+
+Embeddings are looked up by a hash of their text, first in a bounded
+in-process cache and then in an optional persistent cache (any object with
+get_many(hashes, model_name) and put_many(vectors, model_name)), so each
+resume and job description is only encoded once. Misses are encoded in a
+single batch.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from metrics import timed
+
+FALLBACK_MODEL = 'hashing-tfidf'
+FALLBACK_FEATURES = 2 ** 14
+
+KEYWORD_PATTERN = re.compile(r"[a-z][a-z0-9+#.]{3,}")
+STOP_WORDS = {
+    "with", "that", "this", "will", "have", "from", "your", "their", "they", "team", "work",
+    "working", "about", "into", "such", "other", "ideal", "candidate", "should", "strong",
+    "responsible", "responsibilities", "including", "across", "within", "using", "seeking",
+    "looking", "join", "help", "well", "able", "must", "also", "more", "both", "high",
+}
+
+def text_hash(text):
+    """Stable cache key for a text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class SimilarityEngine:
+    """Batched, cached text embeddings with cosine similarity"""
+
+    def __init__(self, models_dir='models', model_name='all-MiniLM-L6-v2', cache=None,
+                 batch_size=32, memory_size=1024):
+        self.models_dir = models_dir
+        self.model_name = model_name
+        self.cache = cache
+        self.batch_size = batch_size
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._model = None
+        self._vectorizer = None
+        self.backend = None
+
+    def _load(self):
+        if self.backend is not None:
+            return
+        model_path = os.path.join(self.models_dir, self.model_name)
+        if os.path.isdir(model_path):
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(model_path, device='cpu')
+                self.backend = self.model_name
+                return
+            except Exception as e:
+                print(f"⚠️ Could not load embedding model from {model_path}: {e}")
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self._vectorizer = HashingVectorizer(n_features=FALLBACK_FEATURES, alternate_sign=False,
+                                             ngram_range=(1, 2), stop_words='english', norm=None,
+                                             dtype=np.float32)
+        self.backend = FALLBACK_MODEL
+
+    def _embed(self, texts):
+        if self._model is not None:
+            return self._model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True,
+                                      convert_to_numpy=True).astype(np.float32)
+        counts = self._vectorizer.transform(texts)
+        counts.data = np.log1p(counts.data)
+        norms = np.sqrt(counts.multiply(counts).sum(axis=1)).A1
+        return (counts.toarray() / np.maximum(norms, 1e-9)[:, None]).astype(np.float32)
+
+    def encode(self, texts):
+        """Return one normalized embedding per text, encoding only cache misses"""
+        with self._lock:
+            self._load()
+            hashes = [text_hash(text) for text in texts]
+            vectors = {h: self._memory[h] for h in hashes if h in self._memory}
+
+            missing = [h for h in dict.fromkeys(hashes) if h not in vectors]
+            # Hashed fallback vectors are cheaper to recompute than to fetch, so only model
+            # embeddings go to the persistent cache
+            persistent = self.cache if self._model is not None else None
+            if missing and persistent is not None:
+                vectors.update(persistent.get_many(missing, self.backend))
+                missing = [h for h in missing if h not in vectors]
+
+            if missing:
+                by_hash = dict(zip(hashes, texts))
+                encoded = self._embed([by_hash[h] for h in missing])
+                fresh = dict(zip(missing, encoded))
+                vectors.update(fresh)
+                if persistent is not None:
+                    persistent.put_many(fresh, self.backend)
+
+            for h in hashes:
+                self._memory[h] = vectors[h]
+                self._memory.move_to_end(h)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+            return np.stack([vectors[h] for h in hashes])
+
+    def similarity(self, text_a, text_b):
+        """Cosine similarity of two texts as a 0-100 percentage"""
+        if not text_a.strip() or not text_b.strip():
+            return 0.0
+        a, b = self.encode([text_a, text_b])
+        return float(max(0.0, min(1.0, float(np.dot(a, b)))) * 100)
+
+def missing_keywords(resume_text, job_description, limit=10):
+    """Most frequent job description keywords that never appear in the resume"""
+    resume_words = {word.rstrip('.') for word in KEYWORD_PATTERN.findall(resume_text.lower())}
+    counts = Counter(word.rstrip('.') for word in KEYWORD_PATTERN.findall(job_description.lower()))
+    return [word for word, _ in counts.most_common()
+            if word not in resume_words and word not in STOP_WORDS][:limit]
+
+@timed('semantic_analysis')
+def semantic_analysis(engine, resume_text, job_description):
+    """AI analysis dict used by chatbot_response"""
+    return {
+        'similarity_score': engine.similarity(resume_text, job_description),
+        'missing_keywords': missing_keywords(resume_text, job_description),
+        'strengths': [],
+        'improvements': []
+    }
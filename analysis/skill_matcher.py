@@ -0,0 +1,165 @@
+"""
+Multi-skill matcher
+Finds every required skill in a resume in a single pass over its tokens.
+
+Skills and resume text go through the same tokenizer, so matching has
+word-boundary semantics ("Java" does not match "JavaScript", "Go" does not
+match "Google"). Words joined by "/" or "-" in resume text also count as
+their parts ("Java/Python", "Python-based"), unless the joined form is
+itself a known skill (ci/cd, scikit-learn). A token trie built from the required skills and their
+aliases is walked once from each token position, which keeps matching
+linear in the resume length regardless of how many skills are required.
+"""
+import re
+from functools import lru_cache
+
+# Tokens keep the punctuation that is part of skill names: node.js, c++, c#, ci/cd, scikit-learn
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:[./\-][a-z0-9+#]+)*")
+
+# Alias -> canonical skill. Both sides are tokenized, so case and spacing don't matter.
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vue": "vue.js",
+    "vuejs": "vue.js",
+    "angularjs": "angular",
+    "golang": "go",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "rest api": "rest apis",
+    "restful api": "rest apis",
+    "restful apis": "rest apis",
+    "microservice": "microservices",
+    "ci cd": "ci/cd",
+    "cicd": "ci/cd",
+    "iac": "infrastructure as code",
+    "ab testing": "a/b testing",
+    "a b testing": "a/b testing",
+    "html5": "html",
+    "css3": "css",
+    "scss": "sass",
+    "shell scripting": "bash",
+    "jira software": "jira",
+    "ux research": "user research",
+    "dataviz": "data visualization",
+}
+
+JOIN_PATTERN = re.compile(r"[/\-]")
+
+# Joined tokens that name a skill on their own and are never split into parts
+KNOWN_JOINED_TOKENS = {
+    token
+    for phrase in list(SKILL_ALIASES) + list(SKILL_ALIASES.values())
+    for token in TOKEN_PATTERN.findall(phrase.lower())
+    if JOIN_PATTERN.search(token)
+}
+
+def tokenize(text):
+    """Lowercase text and split it into skill-aware tokens
+
+    A token joined by "/" or "-" that is not a known skill is followed by
+    its parts, so "java/python" also yields "java" and "python".
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if token not in KNOWN_JOINED_TOKENS and JOIN_PATTERN.search(token):
+            tokens.extend(part for part in JOIN_PATTERN.split(token) if part)
+    return tokens
+
+def _skill_tokens(skill):
+    # Skill names keep joined tokens whole; text tokens always include the whole token too
+    return tuple(TOKEN_PATTERN.findall(skill.lower()))
+
+def _alias_table():
+    table = {}
+    for alias, canonical in SKILL_ALIASES.items():
+        table[_skill_tokens(alias)] = _skill_tokens(canonical)
+    return table
+
+_ALIASES = _alias_table()
+_ALIASES_BY_CANONICAL = {}
+for _alias, _canonical in _ALIASES.items():
+    _ALIASES_BY_CANONICAL.setdefault(_canonical, []).append(_alias)
+
+def canonical_skill(skill):
+    """Return the canonical token tuple for a skill name, resolving aliases"""
+    tokens = _skill_tokens(skill)
+    return _ALIASES.get(tokens, tokens)
+
+def skill_phrases(key):
+    """All token phrases (canonical form and aliases) that count as a canonical skill"""
+    return [key] + _ALIASES_BY_CANONICAL.get(key, [])
+
+class SkillMatcher:
+    """Token trie over a fixed set of required skills and their aliases"""
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self._keys = [canonical_skill(skill) for skill in self.skills]
+        self._trie = {}
+        self.max_length = 0
+        for key in set(self._keys):
+            if not key:
+                continue
+            for phrase in skill_phrases(key):
+                node = self._trie
+                for token in phrase:
+                    node = node.setdefault(token, {})
+                node[None] = key
+                self.max_length = max(self.max_length, len(phrase))
+
+    def find(self, text):
+        """Return the set of canonical skill keys present in text"""
+        tokens = tokenize(text)
+        found = set()
+        trie = self._trie
+        for start in range(len(tokens)):
+            node = trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                key = node.get(None)
+                if key is not None:
+                    found.add(key)
+                if position >= len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return found
+
+    def match(self, text):
+        """Split the required skills into (matched, missing), keeping their original names"""
+        found = self.find(text)
+        matched, missing = [], []
+        for skill, key in zip(self.skills, self._keys):
+            (matched if key and key in found else missing).append(skill)
+        return matched, missing
+
+@lru_cache(maxsize=256)
+def _cached_matcher(skills):
+    return SkillMatcher(skills)
+
+def get_skill_matcher(skills):
+    """Return a prebuilt matcher for a list of skills, reusing it across calls"""
+    return _cached_matcher(tuple(skills))
+
+def resume_text(resume_data):
+    """Join every section of structured resume data into one searchable text"""
+    parts = []
+    for field in ('skills', 'experience', 'projects', 'certifications', 'education'):
+        parts.extend(resume_data.get(field, []))
+    return '\n'.join(parts)
@@ -0,0 +1,403 @@
+"""
+JSON HTTP API
+Exposes resume parsing, analysis, scoring and the job tracker for
+integrations. Runs next to the Streamlit app from the same image:
+
+    python api_server.py
+
+Parsing and analysis are CPU-bound and run in a process pool so they never
+block the request threads. Every request holds one of API_MAX_CONCURRENCY
+slots (503 when none is free) and waits at most API_REQUEST_TIMEOUT seconds
+for pool work (504). Endpoints other than /health and /api/login take the
+session token returned by /api/login as `Authorization: Bearer <token>`.
+"""
+import base64
+import binascii
+import json
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import api_tasks
+from auth import get_session_user, login_user
+from config import API_CONFIG
+from job_tracker import (
+    APPLICATION_STATUSES, add_job_application, get_application_funnel,
+    get_application_statistics, get_user_applications, update_application_status_bulk,
+)
+from metrics import stage, start_metrics_server
+from resume_manager import get_analysis_history, get_resume_improvement_trends, get_user_resumes
+from search import search_user_content
+
+DEFAULT_JOB_REQUIREMENTS = {'skills': [], 'min_experience': 0, 'education_level': 'Any'}
+
+# Fields of structured resume data (as produced by extract_resume_data) and their empty values
+RESUME_DATA_FIELDS = {
+    'name': '', 'email': '', 'phone': '',
+    'education': [], 'skills': [], 'experience': [], 'projects': [], 'certifications': [],
+}
+
+class APIError(Exception):
+    """Error returned to the client as {"error": message} with an HTTP status"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(API_CONFIG['max_concurrency'])
+
+def get_worker_pool():
+    """Process pool for CPU-bound work (created once, replaced if a worker dies)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=API_CONFIG['workers'])
+        return _pool
+
+def _reset_worker_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def run_in_pool(fn, *args):
+    """Run fn(*args) in a worker process, bounded by the request timeout"""
+    future = get_worker_pool().submit(fn, *args)
+    try:
+        return future.result(timeout=API_CONFIG['request_timeout'])
+    except FutureTimeout:
+        # A job that already started keeps its worker until it finishes; queued ones are dropped
+        future.cancel()
+        raise APIError(504, "Request timed out")
+    except BrokenProcessPool:
+        _reset_worker_pool()
+        raise APIError(500, "Worker process failed, please retry")
+    except ValueError as e:
+        raise APIError(400, str(e))
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class Request:
+    """Parsed request passed to the endpoint functions"""
+    def __init__(self, headers, query, body, user=None):
+        self.headers = headers
+        self.query = query
+        self.body = body
+        self.user = user
+
+    def json(self):
+        """Request body as a JSON object"""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise APIError(400, "Request body must be valid JSON")
+        if not isinstance(data, dict):
+            raise APIError(400, "Request body must be a JSON object")
+        return data
+
+def _job_arguments(data):
+    """job_description and job_requirements from a request body"""
+    job_description = data.get('job_description') or ''
+    if not isinstance(job_description, str):
+        raise APIError(400, "job_description must be text")
+    requirements = data.get('job_requirements') or {}
+    if not isinstance(requirements, dict):
+        raise APIError(400, "job_requirements must be an object")
+    job_requirements = {**DEFAULT_JOB_REQUIREMENTS, **requirements}
+    skills = job_requirements['skills']
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise APIError(400, "job_requirements.skills must be a list of text")
+    if not isinstance(job_requirements['education_level'], str):
+        raise APIError(400, "job_requirements.education_level must be text")
+    try:
+        job_requirements['min_experience'] = int(job_requirements['min_experience'])
+    except (TypeError, ValueError, OverflowError):
+        raise APIError(400, "job_requirements.min_experience must be a number")
+    return job_description, job_requirements
+
+def _is_text_field(value, default):
+    if isinstance(default, str):
+        return isinstance(value, str)
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def _resume_value(resume, label):
+    """Validate resume text or structured data, filling in missing resume_data fields"""
+    if isinstance(resume, str) and resume.strip():
+        return resume
+    if not isinstance(resume, dict) or not resume:
+        raise APIError(400, f"{label} must be resume text or resume data")
+    invalid = [field for field, default in RESUME_DATA_FIELDS.items()
+               if field in resume and not _is_text_field(resume[field], default)]
+    if invalid:
+        raise APIError(400, f"Invalid {label} fields (text or list of text expected): {', '.join(invalid)}")
+    return {**{field: type(default)() for field, default in RESUME_DATA_FIELDS.items()}, **resume}
+
+def _resume_argument(data):
+    """Structured resume_data or raw resume_text from a request body"""
+    resume = data.get('resume_data') or data.get('resume_text')
+    if not resume:
+        raise APIError(400, "Provide resume_data or resume_text")
+    return _resume_value(resume, 'resume_data' if isinstance(resume, dict) else 'resume_text')
+
+# Endpoints
+
+def health(request):
+    """Liveness check"""
+    return 200, {'status': 'ok'}
+
+def login(request):
+    """Exchange email and password for a session token"""
+    data = request.json()
+    success, result = login_user(data.get('email', ''), data.get('password', ''))
+    if not success:
+        raise APIError(401, result)
+    return 200, result
+
+def parse(request):
+    """Parse a PDF/DOCX resume sent as raw bytes (?filename=) or JSON {filename, content_base64}"""
+    if request.headers.get('Content-Type', '').startswith('application/json'):
+        data = request.json()
+        filename = data.get('filename', '')
+        try:
+            content = base64.b64decode(data.get('content_base64', ''), validate=True)
+        except (binascii.Error, ValueError):
+            raise APIError(400, "content_base64 is not valid base64")
+    else:
+        filename = request.query.get('filename', [request.headers.get('X-Filename', '')])[0]
+        content = request.body
+    if not filename or not content:
+        raise APIError(400, "Provide a filename and the file content")
+    return 200, run_in_pool(api_tasks.parse_resume_file, filename, content)
+
+def analyze(request):
+    """Gaps, suggestions, selection probability and review for one resume"""
+    data = request.json()
+    resume = _resume_argument(data)
+    job_description, job_requirements = _job_arguments(data)
+    return 200, run_in_pool(api_tasks.analyze_resume_for_job, resume, job_description, job_requirements)
+
+def score(request):
+    """Rank a batch of resumes (data or text) against one job"""
+    data = request.json()
+    resumes = data.get('resumes')
+    if not isinstance(resumes, list) or not resumes:
+        raise APIError(400, "Provide a non-empty resumes list")
+    resumes = [_resume_value(resume, f"resumes[{i}]") for i, resume in enumerate(resumes)]
+    job_description, job_requirements = _job_arguments(data)
+    return 200, {'scores': run_in_pool(api_tasks.score_resumes, resumes, job_description, job_requirements)}
+
+def list_resumes(request):
+    """The user's resumes, without their raw text"""
+    resumes = get_user_resumes(request.user['user_id'])
+    return 200, {'resumes': [{key: value for key, value in resume.items() if key != 'raw_text'} for resume in resumes]}
+
+def resume_history(request, resume_id):
+    """Analysis history of one of the user's resumes"""
+    resume_id = int(resume_id)
+    if not any(resume['resume_id'] == resume_id for resume in get_user_resumes(request.user['user_id'])):
+        raise APIError(404, "Resume not found")
+    return 200, {'history': get_analysis_history(resume_id)}
+
+def trends(request):
+    """Selection probability trend per job title"""
+    job_title = request.query.get('job_title', [None])[0]
+    return 200, {'trends': get_resume_improvement_trends(request.user['user_id'], job_title)}
+
+def list_applications(request):
+    """The user's job applications, optionally filtered by ?status="""
+    status = request.query.get('status', [None])[0]
+    return 200, {'applications': get_user_applications(request.user['user_id'], status)}
+
+def add_application(request):
+    """Add a job application"""
+    data = request.json()
+    missing = [field for field in ('company_name', 'job_title', 'application_date') if not data.get(field)]
+    if missing:
+        raise APIError(400, f"Missing fields: {', '.join(missing)}")
+    if data.get('status', 'Applied') not in APPLICATION_STATUSES:
+        raise APIError(400, f"status must be one of {', '.join(APPLICATION_STATUSES)}")
+    success, app_id, msg = add_job_application(request.user['user_id'], data, data.get('resume_id'))
+    if not success:
+        raise APIError(500, msg)
+    return 201, {'application_id': app_id, 'message': msg}
+
+def update_statuses(request):
+    """Bulk status update: {"changes": {application_id: status}, "notes": optional}"""
+    data = request.json()
+    changes = data.get('changes')
+    if not isinstance(changes, dict):
+        raise APIError(400, "changes must be an object of application_id: status")
+    try:
+        changes = {int(app_id): status for app_id, status in changes.items()}
+    except ValueError:
+        raise APIError(400, "application ids must be integers")
+    invalid = sorted({status for status in changes.values() if status not in APPLICATION_STATUSES}, key=str)
+    if invalid:
+        raise APIError(400, f"Unknown status: {', '.join(map(str, invalid))}")
+    success, updated, msg = update_application_status_bulk(request.user['user_id'], changes, data.get('notes'))
+    if not success:
+        raise APIError(500, msg)
+    return 200, {'updated': updated, 'message': msg}
+
+def application_stats(request):
+    """Totals, active applications and success rate"""
+    stats = get_application_statistics(request.user['user_id'])
+    if stats is None:
+        raise APIError(500, "Failed to load application statistics")
+    return 200, stats
+
+def application_funnel(request):
+    """Funnel conversion and time-in-stage"""
+    funnel = get_application_funnel(request.user['user_id'])
+    if funnel is None:
+        raise APIError(500, "Failed to load application funnel")
+    return 200, funnel
+
+def search(request):
+    """Full-text search over the user's applications and resumes: ?q=&page=&page_size="""
+    query = request.query.get('q', [''])[0]
+    try:
+        page = int(request.query.get('page', ['1'])[0])
+        page_size = int(request.query.get('page_size', ['0'])[0]) or None
+    except ValueError:
+        raise APIError(400, "page and page_size must be integers")
+    success, found, msg = search_user_content(request.user['user_id'], query, page, page_size)
+    if not success:
+        raise APIError(500, msg)
+    return 200, found
+
+# (method, path pattern, endpoint, requires a session token)
+ROUTES = [
+    ('GET', r'/health', health, False),
+    ('POST', r'/api/login', login, False),
+    ('POST', r'/api/parse', parse, True),
+    ('POST', r'/api/analyze', analyze, True),
+    ('POST', r'/api/score', score, True),
+    ('GET', r'/api/resumes', list_resumes, True),
+    ('GET', r'/api/resumes/(\d+)/history', resume_history, True),
+    ('GET', r'/api/trends', trends, True),
+    ('GET', r'/api/applications', list_applications, True),
+    ('POST', r'/api/applications', add_application, True),
+    ('PATCH', r'/api/applications', update_statuses, True),
+    ('GET', r'/api/applications/stats', application_stats, True),
+    ('GET', r'/api/applications/funnel', application_funnel, True),
+    ('GET', r'/api/search', search, True),
+]
+_compiled_routes = [(method, re.compile(pattern + r'/?'), endpoint, auth) for method, pattern, endpoint, auth in ROUTES]
+
+def resolve_route(method, path):
+    """Return (endpoint, path arguments, requires auth) for a request"""
+    allowed = False
+    for route_method, pattern, endpoint, auth in _compiled_routes:
+        match = pattern.fullmatch(path)
+        if match:
+            if route_method == method:
+                return endpoint, match.groups(), auth
+            allowed = True
+    raise APIError(405 if allowed else 404, "Method not allowed" if allowed else "Not found")
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """Dispatches requests to ROUTES under the concurrency limit"""
+    server_version = 'JobPathAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+    # Socket timeout: slow clients cannot hold a thread for longer than this
+    timeout = API_CONFIG['request_timeout']
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def _dispatch(self, method):
+        if not _slots.acquire(blocking=False):
+            self._send(503, {'error': "Server busy, please retry"}, {'Retry-After': '1'})
+            self.close_connection = True
+            return
+        try:
+            status, payload = self._handle(method)
+        except APIError as e:
+            status, payload = e.status, {'error': e.message}
+        except Exception as e:
+            self.log_error("Unhandled error: %r", e)
+            status, payload = 500, {'error': "Internal server error"}
+        finally:
+            _slots.release()
+        self._send(status, payload)
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        endpoint, args, requires_auth = resolve_route(method, url.path)
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise APIError(400, "Invalid Content-Length")
+        if length > API_CONFIG['max_body_mb'] * 1024 * 1024:
+            self.close_connection = True
+            raise APIError(413, f"Request body exceeds {API_CONFIG['max_body_mb']} MB")
+        body = self.rfile.read(length) if length else b''
+
+        user = None
+        if requires_auth:
+            scheme, _, token = self.headers.get('Authorization', '').partition(' ')
+            user = get_session_user(token.strip()) if scheme.lower() == 'bearer' and token.strip() else None
+            if user is None:
+                raise APIError(401, "Missing or invalid session token")
+
+        with stage(f"api.{endpoint.__name__}"):
+            return endpoint(Request(self.headers, parse_qs(url.query), body, user), *args)
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def main():
+    """Start the API server"""
+    # Create the pool up front; its worker processes start on the first submitted task
+    get_worker_pool()
+    start_metrics_server()
+    server = ThreadingHTTPServer((API_CONFIG['host'], API_CONFIG['port']), APIRequestHandler)
+    server.daemon_threads = True
+    print(f"🚀 API listening on http://{API_CONFIG['host']}:{API_CONFIG['port']}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        _reset_worker_pool()
+
+if __name__ == "__main__":
+    main()
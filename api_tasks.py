@@ -0,0 +1,64 @@
+"""
+CPU-bound work for the HTTP API
+These functions run in the API server's worker processes, so they only import
+the parser and the analysis engine (no database, no Streamlit) and take and
+return plain JSON-serialisable values.
+"""
+import os
+import tempfile
+
+from resume_parser import extract_text_from_pdf, extract_text_from_docx
+from analysis import extract_resume_data, analyze_resume, generate_honest_review
+
+PARSERS = {
+    '.pdf': extract_text_from_pdf,
+    '.docx': extract_text_from_docx,
+}
+
+def parse_resume_file(filename, content):
+    """Extract raw text and structured resume data from uploaded PDF/DOCX bytes"""
+    suffix = os.path.splitext(filename)[1].lower()
+    if suffix not in PARSERS:
+        raise ValueError("Unsupported file format. Please upload PDF or DOCX files.")
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        raw_text = PARSERS[suffix](path)
+    finally:
+        os.remove(path)
+    return {'raw_text': raw_text, 'resume_data': extract_resume_data(raw_text)}
+
+def resolve_resume_data(resume):
+    """Accept either structured resume data or raw resume text"""
+    if isinstance(resume, dict):
+        return resume
+    return extract_resume_data(resume)
+
+def analyze_resume_for_job(resume, job_description, job_requirements):
+    """Gaps, suggestions, selection probability and the honest review for one resume"""
+    resume_data = resolve_resume_data(resume)
+    analysis = analyze_resume(resume_data, job_description, job_requirements)
+    return {
+        'resume_data': resume_data,
+        'gaps': analysis['gaps'],
+        'suggestions': analysis['suggestions'],
+        'selection_probability': analysis['selection_probability'],
+        'review': generate_honest_review(resume_data, job_requirements, analysis['gaps'], analysis['selection_probability']),
+    }
+
+def score_resumes(resumes, job_description, job_requirements):
+    """Selection probability for each resume against one job, best first"""
+    scores = []
+    for position, resume in enumerate(resumes):
+        resume_data = resolve_resume_data(resume)
+        analysis = analyze_resume(resume_data, job_description, job_requirements)
+        scores.append({
+            'index': position,
+            'name': resume_data.get('name', ''),
+            'selection_probability': analysis['selection_probability'],
+            'matching_skills': len(analysis['gaps']['matching_skills']),
+            'missing_skills': analysis['gaps']['missing_skills'],
+        })
+    scores.sort(key=lambda score: score['selection_probability'], reverse=True)
+    return scores
@@ -1,8 +1,9 @@
-import streamlit as st
 from database import get_db_connection, hash_password, verify_password
+from metrics import timed_query
 from datetime import datetime
 import secrets
 
+@timed_query
 def register_user(email, password, full_name, phone=None):
     """Register a new user"""
     try:
@@ -29,6 +30,7 @@ def register_user(email, password, full_name, phone=None):
             return False, "Email already exists!"
         return False, f"Registration failed: {str(e)}"
 
+@timed_query
 def login_user(email, password):
     """Login user and create session"""
     try:
@@ -70,6 +72,7 @@ def login_user(email, password):
     except Exception as e:
         return False, f"Login failed: {str(e)}"
 
+@timed_query
 def logout_user(session_token):
     """Logout user and deactivate session"""
     try:
@@ -84,6 +87,7 @@ def logout_user(session_token):
     except:
         return False
 
+@timed_query
 def get_user_profile(user_id):
     """Get user profile information"""
     try:
@@ -99,6 +103,7 @@ def get_user_profile(user_id):
     except:
         return None
 
+@timed_query
 def update_user_profile(user_id, profile_data):
     """Update user profile"""
     try:
@@ -132,14 +137,27 @@ def update_user_profile(user_id, profile_data):
     except Exception as e:
         return False, f"Update failed: {str(e)}"
 
+@timed_query
+def get_session_user(session_token):
+    """Return the user behind an active session token, or None"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT u.user_id, u.email, u.full_name, u.role FROM user_sessions s JOIN users u ON s.user_id = u.user_id WHERE s.session_token = %s AND s.is_active = 1 AND u.is_active = 1', (session_token,))
+            return cursor.fetchone()
+    except:
+        return None
+
 def check_authentication():
     """Check if user is authenticated"""
+    import streamlit as st
     if 'user' not in st.session_state:
         return False
     return True
 
 def require_authentication():
     """Decorator to require authentication"""
+    import streamlit as st
     if not check_authentication():
         st.warning("⚠️ Please login to access this feature")
         st.stop()
@@ -0,0 +1,4 @@
+"""
+Benchmark suite for the resume analyzer
+Run with: python -m benchmarks.run_benchmarks
+"""
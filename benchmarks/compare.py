@@ -0,0 +1,53 @@
+"""
+Compare two benchmark result files
+Usage: python -m benchmarks.compare baseline.json current.json [--threshold 0.2]
+Exits non-zero when any benchmark's median regressed by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+def compare_reports(baseline, current, threshold=0.2):
+    """Return (rows, regressions) comparing median timings by benchmark name"""
+    rows, regressions = [], []
+    base_results, cur_results = baseline['results'], current['results']
+    for name in sorted(set(base_results) | set(cur_results)):
+        old, new = base_results.get(name, {}), cur_results.get(name, {})
+        if 'median' not in old or 'median' not in new:
+            rows.append((name, old.get('median'), new.get('median'), None))
+            continue
+        change = (new['median'] - old['median']) / old['median'] if old['median'] else 0.0
+        rows.append((name, old['median'], new['median'], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative slowdown (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows, regressions = compare_reports(baseline, current, args.threshold)
+    print(f"{'benchmark':<55} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, old, new, change in rows:
+        old_s = f"{old:.1f}" if old is not None else '-'
+        new_s = f"{new:.1f}" if new is not None else '-'
+        change_s = f"{change:+.1%}" if change is not None else 'n/a'
+        flag = '  ❌' if name in regressions else ''
+        print(f"{name:<55} {old_s:>12} {new_s:>12} {change_s:>9}{flag}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Synthetic resume/job corpus generator
+Produces realistic, reproducible resumes and job specs from a seed so
+benchmark runs on different commits see exactly the same inputs.
+"""
+import os
+import random
+
+FIRST_NAMES = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Liam", "Sofia", "Kenji", "Amara"]
+LAST_NAMES = ["Sharma", "Smith", "Garcia", "Chen", "Khan", "Okafor", "Müller", "Rossi", "Tanaka", "Patel"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Fintech",
+             "Hooli", "Pied Piper", "Vandelay Imports", "Soylent Systems"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "Frontend Developer",
+          "DevOps Engineer", "Machine Learning Engineer", "Cloud Engineer", "Product Manager",
+          "Data Analyst", "Security Analyst"]
+SKILLS = ["Python", "Java", "JavaScript", "TypeScript", "React", "Node.js", "SQL", "Git", "Docker",
+          "Kubernetes", "AWS", "Azure", "GCP", "Terraform", "Linux", "Bash", "Pandas", "NumPy",
+          "Scikit-learn", "TensorFlow", "PyTorch", "Statistics", "Machine Learning", "Deep Learning",
+          "HTML", "CSS", "Vue.js", "Angular", "SASS", "Webpack", "MongoDB", "Redis", "REST APIs",
+          "Microservices", "Jenkins", "CI/CD", "Figma", "Agile", "JIRA", "Data Visualization",
+          "Go", "Rust", "C++", "R", "Spark", "Kafka", "GraphQL", "PostgreSQL", "MySQL", "Airflow"]
+VERBS = ["Developed", "Implemented", "Managed", "Designed", "Led", "Optimized", "Built", "Automated",
+         "Migrated", "Reduced", "Improved", "Worked on"]
+OBJECTS = ["a microservice platform", "the data pipeline", "CI/CD workflows", "customer dashboards",
+           "an ML recommendation model", "REST APIs", "the billing system", "infrastructure as code",
+           "search ranking", "monitoring and alerting"]
+RESULTS = ["reducing latency by {n}%", "serving {n}k daily users", "cutting costs by {n}%",
+           "improving accuracy by {n}%", "over {n} years of experience", "saving {n} hours per week"]
+DEGREES = ["Bachelor of Technology in Computer Science", "Master of Science in Data Science",
+           "Bachelor of Engineering in Electronics", "Master of Business Administration", "PhD in Statistics"]
+SCHOOLS = ["State University", "Institute of Technology", "National College", "City University"]
+CERTS = ["AWS Certified Solutions Architect", "Certified Kubernetes Administrator",
+         "Google Professional Data Engineer", "Scrum Master Certification", "Azure Fundamentals"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+SIZES = {
+    'small': {'skills': 8, 'experience': 2, 'bullets': 2, 'projects': 2, 'education': 1, 'certifications': 1, 'job_skills': 10},
+    'medium': {'skills': 20, 'experience': 4, 'bullets': 4, 'projects': 4, 'education': 2, 'certifications': 2, 'job_skills': 25},
+    'large': {'skills': 45, 'experience': 10, 'bullets': 8, 'projects': 10, 'education': 3, 'certifications': 5, 'job_skills': 100},
+}
+
+def _sentence(rng):
+    result = rng.choice(RESULTS).format(n=rng.randint(2, 90))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, {result}"
+
+def generate_resume_text(rng, size='medium'):
+    """Generate one resume as plain text in the section layout the parser expects"""
+    spec = SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +91{rng.randint(7000000000, 9999999999)}",
+        "",
+        "EDUCATION",
+    ]
+    for _ in range(spec['education']):
+        year = rng.randint(2010, 2024)
+        lines.append(f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} {year - 4} - {year}")
+    lines += ["", "SKILLS"]
+    skills = rng.sample(SKILLS, min(spec['skills'], len(SKILLS)))
+    for i in range(0, len(skills), 5):
+        lines.append(", ".join(skills[i:i + 5]))
+    lines += ["", "EXPERIENCE"]
+    for _ in range(spec['experience']):
+        start = rng.randint(2012, 2022)
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} {rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {start + rng.randint(1, 3)}")
+        for _ in range(spec['bullets']):
+            lines.append(f"• {_sentence(rng)}")
+    lines += ["", "PROJECTS"]
+    for i in range(spec['projects']):
+        lines.append(f"{rng.choice(OBJECTS).title()} Project {i + 1}:")
+        for _ in range(max(1, spec['bullets'] // 2)):
+            lines.append(f"• {_sentence(rng)}")
+    lines += ["", "CERTIFICATIONS"]
+    for cert in rng.sample(CERTS, min(spec['certifications'], len(CERTS))):
+        lines.append(cert)
+    return "\n".join(lines)
+
+def generate_job_spec(rng, size='medium'):
+    """Generate a job title, description and requirements dict"""
+    spec = SIZES[size]
+    title = rng.choice(TITLES)
+    pool = SKILLS + [f"{s} {suffix}" for s in SKILLS for suffix in ("Testing", "Architecture")]
+    skills = rng.sample(pool, min(spec['job_skills'], len(pool)))
+    description = f"We are seeking a {title} to join {rng.choice(COMPANIES)}.\n\nKey Responsibilities:\n"
+    description += "\n".join(f"• {_sentence(rng)}" for _ in range(6))
+    requirements = {
+        'skills': skills,
+        'min_experience': rng.randint(0, 8),
+        'education_level': rng.choice(["Any", "Bachelor's", "Master's"]),
+    }
+    return title, description, requirements
+
+def generate_corpus(seed=42, count=10, size='medium'):
+    """Generate a list of (resume_text, job_spec) pairs from a seed"""
+    rng = random.Random(seed)
+    return [(generate_resume_text(rng, size), generate_job_spec(rng, size)) for _ in range(count)]
+
+def write_pdf(text, path, lines_per_page=55):
+    """Write resume text to a PDF file with PyMuPDF"""
+    import fitz
+    doc = fitz.open()
+    lines = text.split("\n")
+    for i in range(0, len(lines), lines_per_page):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 560, 800), "\n".join(lines[i:i + lines_per_page]), fontsize=10)
+    doc.save(path)
+    doc.close()
+    return path
+
+def write_docx(text, path):
+    """Write resume text to a DOCX file with python-docx"""
+    import docx
+    doc = docx.Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.save(path)
+    return path
+
+def write_resume_files(text, directory, stem='resume'):
+    """Write a resume as both PDF and DOCX, returning the two paths"""
+    os.makedirs(directory, exist_ok=True)
+    pdf_path = write_pdf(text, os.path.join(directory, f"{stem}.pdf"))
+    docx_path = write_docx(text, os.path.join(directory, f"{stem}.docx"))
+    return pdf_path, docx_path
@@ -0,0 +1,74 @@
+"""
+Benchmark harness
+Timing helpers, a small registry and JSON result files that can be
+diffed across commits with benchmarks/compare.py.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+BENCHMARKS = []
+
+def benchmark(group):
+    """Register a benchmark function under a group name"""
+    def decorator(func):
+        BENCHMARKS.append((group, func))
+        return func
+    return decorator
+
+def measure(fn, repeat=20, number=1, warmup=1):
+    """Time fn and return summary statistics in microseconds per call"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter_ns() - start) / number / 1000)
+    samples.sort()
+    return {
+        'unit': 'us',
+        'runs': repeat * number,
+        'min': round(samples[0], 3),
+        'median': round(statistics.median(samples), 3),
+        'p95': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'mean': round(statistics.fmean(samples), 3),
+    }
+
+def skipped(reason):
+    """Result entry for a benchmark that could not run in this environment"""
+    return {'skipped': reason}
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+def build_report(results, **meta):
+    """Wrap results with metadata describing the run"""
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            **meta,
+        },
+        'results': dict(sorted(results.items())),
+    }
+
+def write_report(report, path):
+    """Write a report as stable, diff-friendly JSON"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,112 @@
+"""
+Cold-start import time
+Runs an entry point's top-level imports (not the rest of the script) in a
+fresh interpreter, several times, and fails when the median exceeds the
+budget or when a module that must stay lazy was imported at startup.
+Usage: python -m benchmarks.import_time [resume_chatbot.py] [--budget 3.0] [--runs 5] [--output import_time.json]
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.harness import build_report, write_report
+
+# Heavy modules that are imported on first use, never at startup
+LAZY_MODULES = ['fitz', 'docx', 'torch', 'transformers', 'sentence_transformers', 'spacy', 'nltk', 'sklearn',
+                'resume_index']
+
+DEFAULT_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', '3.0'))
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+exec(compile({source!r}, {path!r}, 'exec'), {{'__name__': '__import_probe__'}})
+print(json.dumps({{'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}}))
+'''
+
+def entry_imports(path):
+    """Source of the module-level import statements of a script"""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return '\n'.join(ast.unparse(node) for node in imports)
+
+def parse_importtime(stderr, top=15):
+    """Slowest top-level imports from `python -X importtime` output, as (module, cumulative ms)"""
+    totals = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under the module that triggered them
+        if not name.startswith('  '):
+            totals.append((name.strip(), int(cumulative) / 1000))
+    totals.sort(key=lambda item: item[1], reverse=True)
+    return totals[:top]
+
+def measure_cold_import(path, runs=5):
+    """Median cold import time of a script's imports plus what they loaded"""
+    source = entry_imports(path)
+    probe = PROBE.format(source=source, path=path)
+    directory = os.path.dirname(os.path.abspath(path))
+    samples, modules, slowest = [], [], []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe], cwd=directory,
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else
+                               f"exit code {completed.returncode}")
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        samples.append(result['seconds'])
+        modules = result['modules']
+        slowest = parse_importtime(completed.stderr)
+    return {
+        'unit': 's',
+        'runs': runs,
+        'min': round(min(samples), 4),
+        'median': round(statistics.median(samples), 4),
+        'max': round(max(samples), 4),
+        'modules_loaded': len(modules),
+        'eager_lazy_modules': sorted(name for name in LAZY_MODULES if name in modules),
+        'slowest_imports_ms': [[name, round(ms, 1)] for name, ms in slowest],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('entry', nargs='?', default='resume_chatbot.py', help='Script whose imports are measured')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help='Maximum median import time in seconds')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', default=None, help='Also write a JSON report')
+    args = parser.parse_args(argv)
+
+    try:
+        stats = measure_cold_import(args.entry, args.runs)
+    except RuntimeError as e:
+        print(f"❌ Importing {args.entry} failed: {e}")
+        return 2
+    stats['budget'] = args.budget
+    if args.output:
+        write_report(build_report({f"import_time.{os.path.basename(args.entry)}": stats}), args.output)
+
+    print(f"⏱️ {args.entry}: median {stats['median']:.3f}s over {stats['runs']} cold starts "
+          f"(budget {args.budget:.3f}s, {stats['modules_loaded']} modules)")
+    for name, ms in stats['slowest_imports_ms']:
+        print(f"   {name:<40} {ms:>9.1f} ms")
+
+    failed = False
+    if stats['median'] > args.budget:
+        print(f"❌ Cold-start import time exceeds the budget by {stats['median'] - args.budget:.3f}s")
+        failed = True
+    if stats['eager_lazy_modules']:
+        print(f"❌ Imported at startup but should load on first use: {', '.join(stats['eager_lazy_modules'])}")
+        failed = True
+    if not failed:
+        print("✅ Within the import-time budget")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
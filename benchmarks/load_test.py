@@ -0,0 +1,382 @@
+"""
+Concurrent-user load test
+Simulates N users running the app's real flows against the MySQL database
+from .env (point it at a scratch database): login, resume upload + analysis,
+chat turns and job-tracker updates. Each user is a thread, like a Streamlit
+session, and picks flows from a weighted mix with think time in between.
+
+Reports throughput and p50/p95/p99 latency per flow and per database
+function, plus the peak number of simultaneously open connections (the
+connection pool size this load needs).
+
+Usage: python -m benchmarks.load_test [--users 20] [--duration 60] [--ramp-up 10] [--write-queue]
+                                      [--output load_output.json]
+"""
+import argparse
+import functools
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from benchmarks.corpus import generate_corpus, write_docx, write_pdf
+from benchmarks.harness import build_report, write_report
+from analysis import analyze_resume, chatbot_response, extract_resume_data
+
+# Module -> database functions timed individually
+DB_FUNCTIONS = {
+    'auth': ['register_user', 'login_user', 'logout_user', 'get_user_profile'],
+    'resume_manager': ['save_resume', 'get_user_resumes', 'count_user_resumes', 'save_analysis',
+                       'get_analysis_history', 'get_resume_improvement_trends'],
+    'chat_history': ['save_chat_messages', 'get_chat_messages', 'count_chat_messages'],
+    'job_tracker': ['add_job_application', 'get_user_applications', 'update_application_status_bulk',
+                    'get_application_statistics', 'get_application_funnel'],
+}
+
+# Modules whose connections count towards the peak (the write queue opens its own)
+CONNECTION_MODULES = list(DB_FUNCTIONS) + ['write_queue']
+
+# Flow -> relative weight in each user's mix
+FLOW_MIX = {
+    'login': 1,
+    'upload_analyze': 2,
+    'chat': 4,
+    'tracker': 3,
+}
+
+CHAT_QUESTIONS = [
+    "How can I improve my resume?",
+    "Will I be selected?",
+    "Give me an honest review",
+    "What skills am I missing?",
+    "Review my experience",
+    "Check my projects",
+]
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+class LatencyRecorder:
+    """Thread-safe latency samples, error counts and open-connection tracking"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(list)
+        self._errors = defaultdict(int)
+        self.open_connections = 0
+        self.peak_connections = 0
+
+    def record(self, name, seconds, ok=True):
+        with self._lock:
+            self._samples[name].append(seconds * 1000)
+            if not ok:
+                self._errors[name] += 1
+
+    @contextmanager
+    def timer(self, name):
+        """Time a block; an exception counts as an error and propagates"""
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, time.perf_counter() - start, ok)
+
+    def connection_opened(self):
+        with self._lock:
+            self.open_connections += 1
+            self.peak_connections = max(self.peak_connections, self.open_connections)
+
+    def connection_closed(self):
+        with self._lock:
+            self.open_connections -= 1
+
+    def summary(self, elapsed):
+        """Per-name count, errors, throughput (ops/s) and latency percentiles in ms"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            errors = dict(self._errors)
+        return {
+            name: {
+                'unit': 'ms',
+                'count': len(values),
+                'errors': errors.get(name, 0),
+                'throughput': round(len(values) / elapsed, 2) if elapsed else 0.0,
+                'p50': round(percentile(values, 0.50), 3),
+                'p95': round(percentile(values, 0.95), 3),
+                'p99': round(percentile(values, 0.99), 3),
+                'max': round(values[-1], 3),
+            }
+            for name, values in sorted(samples.items())
+        }
+
+def _succeeded(result):
+    """The app's DB functions report failure as (False, ...) or None rather than raising"""
+    return result is not None and not (isinstance(result, tuple) and result and result[0] is False)
+
+def instrument(recorder):
+    """Wrap the DB functions and connections with timers; returns a function that undoes it"""
+    import importlib
+    originals = []
+
+    def timed(name, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = _succeeded(result)
+                return result
+            finally:
+                recorder.record(f"db.{name}", time.perf_counter() - start, ok)
+        return wrapper
+
+    def counted(get_db_connection):
+        @contextmanager
+        def wrapper():
+            recorder.connection_opened()
+            try:
+                with get_db_connection() as conn:
+                    yield conn
+            finally:
+                recorder.connection_closed()
+        return wrapper
+
+    for module_name in CONNECTION_MODULES:
+        module = importlib.import_module(module_name)
+        originals.append((module, 'get_db_connection', module.get_db_connection))
+        module.get_db_connection = counted(module.get_db_connection)
+    for module_name, names in DB_FUNCTIONS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            originals.append((module, name, getattr(module, name)))
+            setattr(module, name, timed(name, getattr(module, name)))
+
+    def restore():
+        for module, name, fn in reversed(originals):
+            setattr(module, name, fn)
+    return restore
+
+class SimulatedUser:
+    """One user session running weighted flows until the deadline"""
+
+    def __init__(self, index, run_id, corpus, files, recorder, write_queue=None, think_time=1.0, seed=42):
+        self.email = f"load-{run_id}-{index}@example.com"
+        self.password = 'load-test-password'
+        self.corpus = corpus
+        self.files = files
+        self.recorder = recorder
+        self.write_queue = write_queue
+        self.think_time = think_time
+        self.rng = random.Random(seed + index)
+        self.user = None
+        self.resume_id = None
+        self.resume_job = None
+        self.resume = None
+        self.application_ids = []
+
+    def run(self, deadline):
+        """Register, then run flows from FLOW_MIX until the deadline"""
+        import auth
+        with self.recorder.timer('flow.register'):
+            success, msg = auth.register_user(self.email, self.password, 'Load Test User')
+            if not success:
+                raise RuntimeError(msg)
+        self.login()
+        flows, weights = zip(*FLOW_MIX.items())
+        while time.monotonic() < deadline:
+            flow = self.rng.choices(flows, weights)[0]
+            if flow in ('chat', 'tracker') and self.resume is None:
+                flow = 'upload_analyze'
+            try:
+                with self.recorder.timer(f"flow.{flow}"):
+                    getattr(self, flow)()
+            except Exception as e:
+                self.recorder.record(f"error.{flow}.{type(e).__name__}", 0, ok=False)
+            # Exponential think time keeps arrivals from synchronising across users
+            time.sleep(min(self.rng.expovariate(1 / self.think_time), 5 * self.think_time) if self.think_time else 0)
+
+    def login(self):
+        import auth
+        success, user = auth.login_user(self.email, self.password)
+        if not success:
+            raise RuntimeError(user)
+        self.user = user
+        auth.get_user_profile(user['user_id'])
+
+    def upload_analyze(self):
+        import resume_manager
+        text, (title, description, requirements) = self.rng.choice(self.corpus)
+        raw_text = text
+        if self.files:
+            import resume_parser
+            path = self.rng.choice(self.files)
+            extract = resume_parser.extract_text_from_pdf if path.endswith('.pdf') else resume_parser.extract_text_from_docx
+            with self.recorder.timer('step.parse'):
+                raw_text = extract(path)
+        with self.recorder.timer('step.extract_resume_data'):
+            resume_data = extract_resume_data(raw_text)
+        user_id = self.user['user_id']
+        if self.write_queue:
+            with self.recorder.timer('step.queue_save_resume'):
+                self.resume_job = self.write_queue.submit('save_resume', {
+                    'user_id': user_id, 'resume_name': 'load.pdf', 'file_path': 'uploads/load.pdf',
+                    'file_size': len(raw_text), 'file_type': 'pdf', 'raw_text': raw_text, 'extracted_data': resume_data
+                })
+        else:
+            success, self.resume_id, msg = resume_manager.save_resume(user_id, 'load.pdf', 'uploads/load.pdf', len(raw_text),
+                                                                      'pdf', raw_text, resume_data)
+            if not success:
+                raise RuntimeError(msg)
+        with self.recorder.timer('step.analyze_resume'):
+            analysis = analyze_resume(resume_data, description, requirements)
+        results = {'selection_probability': analysis['selection_probability'],
+                   'missing_skills': analysis['gaps']['missing_skills']}
+        if self.write_queue:
+            with self.recorder.timer('step.queue_save_analysis'):
+                self.write_queue.submit('save_analysis', {
+                    'resume_id': None, 'resume_job': self.resume_job, 'version_id': None, 'job_title': title,
+                    'job_description': description, 'analysis_results': results
+                })
+        else:
+            resume_manager.save_analysis(self.resume_id, None, title, description, results)
+        self.resume = (resume_data, description, requirements)
+        # The sidebar reloads its counts after a save
+        resume_manager.count_user_resumes(user_id)
+        resume_manager.get_user_resumes(user_id)
+
+    def chat(self):
+        from chat_history import ChatHistory
+        resume_data, description, requirements = self.resume
+        history = ChatHistory(self.user['user_id'], self.resume_id).load()
+        for question in self.rng.sample(CHAT_QUESTIONS, 2):
+            history.append('user', question)
+            with self.recorder.timer('step.chatbot_response'):
+                answer = chatbot_response(question, resume_data, description, requirements)
+            history.append('assistant', answer)
+        history.flush()
+
+    def tracker(self):
+        import job_tracker
+        user_id = self.user['user_id']
+        title = self.rng.choice(self.corpus)[1][0]
+        success, app_id, msg = job_tracker.add_job_application(user_id, {
+            'company_name': f"Load Corp {self.rng.randint(1, 20)}", 'job_title': title,
+            'application_date': '2024-01-15', 'status': 'Applied', 'notes': 'load test'
+        })
+        if not success:
+            raise RuntimeError(msg)
+        self.application_ids.append(app_id)
+        job_tracker.get_user_applications(user_id)
+        changes = {a: self.rng.choice(job_tracker.APPLICATION_STATUSES)
+                   for a in self.rng.sample(self.application_ids, min(5, len(self.application_ids)))}
+        job_tracker.update_application_status_bulk(user_id, changes)
+        job_tracker.get_application_statistics(user_id)
+        job_tracker.get_application_funnel(user_id)
+
+def cleanup(run_id):
+    """Delete the run's users (their resumes, chats and applications cascade)"""
+    from database import get_db_connection
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM users WHERE email LIKE %s', (f"load-{run_id}-%",))
+        return cursor.rowcount
+
+def run_load_test(users=20, duration=60.0, ramp_up=10.0, think_time=1.0, seed=42, size='medium', count=10,
+                  parse_files=True, use_write_queue=False, keep_data=False):
+    """Run the simulation and return (results, meta)"""
+    recorder = LatencyRecorder()
+    run_id = uuid.uuid4().hex[:8]
+    corpus = generate_corpus(seed=seed, count=count, size=size)
+    restore = instrument(recorder)
+    write_queue = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        if parse_files:
+            try:
+                for i, (text, _) in enumerate(corpus[:4]):
+                    files.append(write_pdf(text, os.path.join(tmpdir, f"resume{i}.pdf")))
+                    files.append(write_docx(text, os.path.join(tmpdir, f"resume{i}.docx")))
+            except ImportError as e:
+                print(f"⚠️ Parsing skipped ({e}); uploads use the raw corpus text")
+                files = []
+        if use_write_queue:
+            from write_queue import WriteQueue
+            write_queue = WriteQueue(os.path.join(tmpdir, 'write_queue.sqlite3')).start()
+
+        sessions = [SimulatedUser(i, run_id, corpus, files, recorder, write_queue, think_time, seed)
+                    for i in range(users)]
+        failures = []
+
+        def run_session(session, delay, deadline):
+            time.sleep(delay)
+            try:
+                session.run(deadline)
+            except Exception as e:
+                failures.append(f"{session.email}: {type(e).__name__}: {e}")
+
+        start = time.monotonic()
+        deadline = start + ramp_up + duration
+        threads = [threading.Thread(target=run_session, args=(s, ramp_up * i / users, deadline), daemon=True)
+                   for i, s in enumerate(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if write_queue:
+            with recorder.timer('step.queue_drain'):
+                write_queue.close()
+        elapsed = time.monotonic() - start
+        restore()
+
+    deleted = 0 if keep_data else cleanup(run_id)
+    meta = {
+        'run_id': run_id, 'users': users, 'duration': duration, 'ramp_up': ramp_up, 'think_time': think_time,
+        'seed': seed, 'size': size, 'write_queue': use_write_queue, 'elapsed': round(elapsed, 2),
+        'peak_connections': recorder.peak_connections, 'failed_sessions': failures, 'deleted_users': deleted,
+    }
+    return recorder.summary(elapsed), meta
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=20, help='Simultaneous simulated users')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds of steady load after ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=10, help='Seconds over which users start')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Mean seconds between a user\'s flows')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--size', default='medium')
+    parser.add_argument('--no-parse', action='store_true', help='Skip PDF/DOCX parsing in the upload flow')
+    parser.add_argument('--write-queue', action='store_true', help='Save resumes/analyses through the write queue')
+    parser.add_argument('--keep-data', action='store_true', help='Keep the simulated users and their data')
+    parser.add_argument('--output', default='load_output.json')
+    args = parser.parse_args(argv)
+
+    results, meta = run_load_test(users=args.users, duration=args.duration, ramp_up=args.ramp_up,
+                                  think_time=args.think_time, seed=args.seed, size=args.size,
+                                  parse_files=not args.no_parse, use_write_queue=args.write_queue,
+                                  keep_data=args.keep_data)
+    report = build_report(results, **meta)
+    write_report(report, args.output)
+
+    print(f"{'name':<45} {'count':>7} {'err':>5} {'ops/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in report['results'].items():
+        print(f"{name:<45} {stats['count']:>7} {stats['errors']:>5} {stats['throughput']:>8.2f} "
+              f"{stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f}")
+    print(f"\n🔌 Peak open DB connections: {meta['peak_connections']}")
+    for failure in meta['failed_sessions']:
+        print(f"❌ {failure}")
+    print(f"📄 Results written to {args.output}")
+    return 1 if meta['failed_sessions'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
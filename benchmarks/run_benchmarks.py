@@ -0,0 +1,556 @@
+"""
+Run the benchmark suite and write a JSON report
+Usage: python -m benchmarks.run_benchmarks [--size medium] [--seed 42] [--db] [--output results.json]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import uuid
+
+from benchmarks.corpus import SIZES, generate_corpus, write_docx, write_pdf
+from benchmarks.harness import BENCHMARKS, benchmark, build_report, measure, skipped, write_report
+from analysis import (
+    extract_resume_data, analyze_resume_gaps, calculate_selection_probability, chatbot_response, SkillMatcher
+)
+
+CHAT_QUESTIONS = [
+    "How can I improve my resume?",
+    "Will I be selected?",
+    "Give me an honest review",
+    "Analyze my skills",
+    "Review my experience",
+    "Check my projects",
+    "What can you do?",
+    "Tell me a joke",
+]
+
+# ============================================================================
+# PARSER
+# ============================================================================
+@benchmark('parser')
+def bench_parser(ctx):
+    text = ctx['corpus'][0][0]
+    results = {}
+    for kind, writer in (('pdf', write_pdf), ('docx', write_docx)):
+        name = f"parser.extract_text_from_{kind}"
+        try:
+            import resume_parser
+            path = writer(text, os.path.join(ctx['tmpdir'], f"resume.{kind}"))
+        except ImportError as e:
+            results[name] = skipped(str(e))
+            continue
+        extract = getattr(resume_parser, f"extract_text_from_{kind}")
+        results[name] = measure(lambda: extract(path), repeat=ctx['repeat'])
+    return results
+
+# ============================================================================
+# ANALYSIS ENGINE
+# ============================================================================
+@benchmark('analysis')
+def bench_extract_resume_data(ctx):
+    texts = [text for text, _ in ctx['corpus']]
+    return {'analysis.extract_resume_data': measure(lambda: [extract_resume_data(t) for t in texts],
+                                                    repeat=ctx['repeat'])}
+
+@benchmark('analysis')
+def bench_gap_analysis(ctx):
+    pairs = [(extract_resume_data(text), job) for text, job in ctx['corpus']]
+
+    def gaps_all():
+        for resume_data, (_, description, requirements) in pairs:
+            analyze_resume_gaps(resume_data, description, requirements)
+
+    gaps = [analyze_resume_gaps(r, d, q) for r, (_, d, q) in pairs]
+
+    def probability_all():
+        for (resume_data, (_, _, requirements)), g in zip(pairs, gaps):
+            calculate_selection_probability(resume_data, requirements, g)
+
+    return {
+        'analysis.analyze_resume_gaps': measure(gaps_all, repeat=ctx['repeat']),
+        'analysis.calculate_selection_probability': measure(probability_all, repeat=ctx['repeat']),
+    }
+
+@benchmark('analysis')
+def bench_skill_matcher(ctx):
+    from benchmarks.corpus import SKILLS
+    text = ctx['corpus'][0][0]
+    skills = [f"{skill} {n}" if n else skill for n in range(10) for skill in SKILLS][:500]
+    matcher = SkillMatcher(skills)
+    return {
+        'analysis.skill_matcher_build_500': measure(lambda: SkillMatcher(skills), repeat=ctx['repeat']),
+        'analysis.skill_matcher_match_500': measure(lambda: matcher.match(text), repeat=ctx['repeat']),
+    }
+
+@benchmark('analysis')
+def bench_role_scorer(ctx):
+    import random
+    from benchmarks.corpus import SKILLS
+    from analysis.role_scorer import RoleScorer
+    rng = random.Random(ctx['seed'])
+    pool = [f"{skill} {n}" if n else skill for n in range(40) for skill in SKILLS]
+    scorer = RoleScorer({f"Role {i}": rng.sample(pool, 12) for i in range(5000)})
+    resume_data = extract_resume_data(ctx['corpus'][0][0])
+    columns = scorer.encode(resume_data)
+    return {
+        'analysis.role_scorer_score_5000_roles': measure(lambda: scorer.score_encoded(columns, 0.0),
+                                                         repeat=ctx['repeat'], number=10),
+        'analysis.role_scorer_rank_5000_roles': measure(lambda: scorer.rank(resume_data, top_k=10),
+                                                        repeat=ctx['repeat']),
+    }
+
+@benchmark('analysis')
+def bench_job_template_lookup(ctx):
+    import random
+    from benchmarks.corpus import TITLES
+    from analysis.job_templates import JobTemplateIndex, get_template_index
+    rng = random.Random(ctx['seed'])
+    builtin = get_template_index()
+    large = JobTemplateIndex(builtin.templates, builtin.default)
+    words = ["Platform", "Payments", "Growth", "Mobile", "Data", "Security", "Search", "Billing", "Embedded", "Web"]
+    for i in range(5000):
+        large.add(f"{rng.choice(words)} {rng.choice(TITLES)} {i}", "", [])
+    queries = ["Sr. SWE", "ML Eng", "sofware enginer", "Senior Data Scientist at Acme", "Chef", "product mgr"]
+
+    def lookup_all(index):
+        for query in queries:
+            index.match(query)
+
+    return {
+        'analysis.job_template_lookup_6_titles_builtin': measure(lambda: lookup_all(builtin), repeat=ctx['repeat'], number=10),
+        'analysis.job_template_lookup_6_titles_5000': measure(lambda: lookup_all(large), repeat=ctx['repeat']),
+    }
+
+@benchmark('analysis')
+def bench_similarity(ctx):
+    from analysis.similarity import SimilarityEngine
+    from analysis.skill_matcher import resume_text
+    texts = [resume_text(extract_resume_data(text)) for text, _ in ctx['corpus']]
+    descriptions = [description for _, (_, description, _) in ctx['corpus']]
+    engine = SimilarityEngine(memory_size=0)
+    cached = SimilarityEngine()
+    cached.encode(texts + descriptions)
+    return {
+        'analysis.similarity_encode_batch': measure(lambda: engine.encode(texts + descriptions), repeat=ctx['repeat']),
+        'analysis.similarity_cached': measure(lambda: [cached.similarity(t, d) for t, d in zip(texts, descriptions)],
+                                              repeat=ctx['repeat']),
+    }
+
+@benchmark('analysis')
+def bench_analysis_cache(ctx):
+    from analysis.analysis_cache import analysis_cache, analyze_resume
+    pairs = [(extract_resume_data(text), job) for text, job in ctx['corpus']]
+
+    def analyze_all(clear):
+        if clear:
+            analysis_cache.clear()
+        for resume_data, (_, description, requirements) in pairs:
+            analyze_resume(resume_data, description, requirements)
+
+    # Editing a 500-skill spec: every run adds one never-seen skill to the same resume
+    from benchmarks.corpus import SKILLS
+    resume_data, (_, description, requirements) = pairs[0]
+    base_skills = [f"{skill} {n}" if n else skill for n in range(10) for skill in SKILLS][:499]
+    analyze_resume(resume_data, description, dict(requirements, skills=base_skills))
+    counter = itertools.count()
+
+    def add_one_skill():
+        analyze_resume(resume_data, description, dict(requirements, skills=base_skills + [f"New Skill {next(counter)}"]))
+
+    return {
+        'analysis.analyze_resume_cold': measure(lambda: analyze_all(True), repeat=ctx['repeat']),
+        'analysis.analyze_resume_memoized': measure(lambda: analyze_all(False), repeat=ctx['repeat']),
+        'analysis.reanalyze_after_skill_edit_500': measure(add_one_skill, repeat=ctx['repeat']),
+    }
+
+@benchmark('analysis')
+def bench_chatbot_response(ctx):
+    resume_data = extract_resume_data(ctx['corpus'][0][0])
+    _, description, requirements = ctx['corpus'][0][1]
+
+    def ask_all():
+        for question in CHAT_QUESTIONS:
+            chatbot_response(question, resume_data, description, requirements)
+
+    return {'analysis.chatbot_response': measure(ask_all, repeat=ctx['repeat'])}
+
+def is_heading_only(chunk):
+    """A chunk that is only bold heading lines ("🔍 **Analysis:**") carries no answer yet"""
+    lines = [line.strip() for line in chunk.splitlines() if line.strip()]
+    return all(line.endswith('**') and line.count('**') == 2 for line in lines)
+
+@benchmark('analysis')
+def bench_chatbot_first_chunk(ctx):
+    from analysis import chatbot_response_stream
+    from analysis import incremental
+    from analysis.analysis_cache import analysis_cache
+    from analysis.similarity import SimilarityEngine, semantic_analysis
+    from analysis.skill_matcher import resume_text
+    resume_data = extract_resume_data(ctx['corpus'][0][0])
+    _, description, requirements = ctx['corpus'][0][1]
+    # No embedding memory, so every response pays for encoding like an uncached model call
+    engine = SimilarityEngine(memory_size=0)
+    ai_analysis = lambda: semantic_analysis(engine, resume_text(resume_data), description)
+
+    def respond(first_chunk_only):
+        analysis_cache.clear()
+        incremental._profiles.clear()
+        chunks = chatbot_response_stream("How can I improve my resume?", resume_data, description, requirements,
+                                         ai_analysis)
+        if first_chunk_only:
+            # Time to the first chunk with content, not a header yielded before any work
+            next(chunk for chunk in chunks if not is_heading_only(chunk))
+        else:
+            ''.join(chunks)
+
+    return {
+        'analysis.chatbot_time_to_first_content_cold': measure(lambda: respond(True), repeat=ctx['repeat']),
+        'analysis.chatbot_full_response_cold': measure(lambda: respond(False), repeat=ctx['repeat']),
+    }
+
+# ============================================================================
+# CHAT INTENTS
+# ============================================================================
+# The router's keywords were picked on intent_questions.json; the held-out set was written
+# separately and must not be used to tune them, so its accuracy is the one to compare
+INTENT_QUESTIONS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'intent_questions.json')
+INTENT_HOLDOUT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'intent_questions_holdout.json')
+
+def legacy_intent(message):
+    """The substring if-chain chatbot_response used before the intent router, for reference"""
+    if "improve" in message.lower() or "better" in message.lower():
+        return 'improve'
+    elif "selected" in message.lower() or "chance" in message.lower() or "probability" in message.lower():
+        return 'selection'
+    elif "honest" in message.lower() or "review" in message.lower():
+        return 'review'
+    elif "skills" in message.lower():
+        return 'skills'
+    elif "experience" in message.lower():
+        return 'experience'
+    elif "projects" in message.lower():
+        return 'projects'
+    elif "help" in message.lower() or "what" in message.lower():
+        return 'help'
+    return 'general'
+
+@benchmark('intent')
+def bench_intent_router(ctx):
+    from analysis.chatbot import chat_router
+    with open(INTENT_QUESTIONS_PATH, encoding='utf-8') as f:
+        labeled = json.load(f)
+    with open(INTENT_HOLDOUT_PATH, encoding='utf-8') as f:
+        holdout = json.load(f)
+    messages = [row['text'] for row in labeled]
+
+    def accuracy(classify, rows):
+        correct = sum(classify(row['text']) == row['intent'] for row in rows)
+        return round(correct / len(rows), 4)
+
+    results = {}
+    for name, classify in (('router', lambda m: chat_router.classify(m)[0]), ('legacy_if_chain', legacy_intent)):
+        stats = measure(lambda: [classify(message) for message in messages], repeat=ctx['repeat'], number=10)
+        stats['accuracy'] = accuracy(classify, holdout)
+        stats['tuning_set_accuracy'] = accuracy(classify, labeled)
+        results[f"intent.{name}_classify_{len(messages)}"] = stats
+    return results
+
+# ============================================================================
+# JOB TRACKER
+# ============================================================================
+@benchmark('tracker')
+def bench_application_funnel(ctx):
+    import random
+    from benchmarks.corpus import COMPANIES
+    from job_tracker import compute_application_funnel
+    rng = random.Random(ctx['seed'])
+    rows = []
+    for app_id in range(3000):
+        path = ['Applied']
+        if rng.random() < 0.4:
+            path.append('Interview')
+            if rng.random() < 0.3:
+                path.append('Offer')
+        if rng.random() < 0.3:
+            path.append('Rejected')
+        for i, status in enumerate(path):
+            rows.append({'application_id': app_id, 'company_name': rng.choice(COMPANIES), 'status': status,
+                         'seconds_in_stage': rng.randint(3600, 86400 * 30) if i < len(path) - 1 else None})
+    return {f"tracker.application_funnel_{len(rows)}_transitions":
+            measure(lambda: compute_application_funnel(rows), repeat=ctx['repeat'])}
+
+# ============================================================================
+# RESUME VERSIONS
+# ============================================================================
+@benchmark('versions')
+def bench_resume_versions(ctx):
+    import random
+    from config import VERSION_CONFIG
+    from resume_delta import make_delta, apply_delta, rebuild_text
+    rng = random.Random(ctx['seed'])
+    text = ctx['corpus'][0][0]
+    # A revision edits a couple of lines and adds one
+    revisions = [text]
+    for _ in range(VERSION_CONFIG['snapshot_interval'] - 1):
+        lines = revisions[-1].splitlines(keepends=True)
+        for _ in range(2):
+            i = rng.randrange(len(lines))
+            lines[i] = lines[i].rstrip('\n') + f" ({rng.randint(1, 99)})\n"
+        lines.insert(rng.randrange(len(lines)), f"Added line {len(revisions)}\n")
+        revisions.append(''.join(lines))
+    deltas = [make_delta(old, new) for old, new in zip(revisions, revisions[1:])]
+    chain = [{'version_number': 1, 'is_snapshot': True, 'raw_text': revisions[0]}]
+    chain += [{'version_number': i + 2, 'is_snapshot': False, 'text_delta': d} for i, d in enumerate(deltas)]
+    assert rebuild_text(chain) == revisions[-1]
+    stats = measure(lambda: make_delta(revisions[-2], revisions[-1]), repeat=ctx['repeat'])
+    stats['size_ratio'] = sum(map(len, deltas)) / sum(map(len, revisions[1:]))
+    return {
+        'versions.make_delta': stats,
+        'versions.apply_delta': measure(lambda: apply_delta(revisions[-2], deltas[-1]), repeat=ctx['repeat']),
+        f"versions.rebuild_{len(chain)}_version_chain": measure(lambda: rebuild_text(chain), repeat=ctx['repeat']),
+    }
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+def generate_applications(rng, count):
+    """Job application rows (title, company, description, notes) for search benchmarks"""
+    from benchmarks.corpus import COMPANIES, TITLES, MONTHS, generate_job_spec
+    descriptions = [generate_job_spec(rng)[1] for _ in range(200)]
+    for i in range(count):
+        yield (rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(descriptions),
+               f"Applied in {rng.choice(MONTHS)}, referral #{i}" if rng.random() < 0.5 else None)
+
+@benchmark('search')
+def bench_search_index(ctx):
+    import random
+    from search import SearchIndex
+    rng = random.Random(ctx['seed'])
+    rows = list(generate_applications(rng, ctx['search_rows']))
+
+    def build():
+        index = SearchIndex()
+        for i, (title, company, description, notes) in enumerate(rows):
+            index.add([(title, 3), (company, 3), (description, 1), (notes, 1)],
+                      {'kind': 'application', 'item_id': i, 'title': title, 'subtitle': company})
+        return index
+
+    index = build()
+    rows_label = ctx['search_rows']
+    return {
+        f"search.memory_build_{rows_label}": measure(build, repeat=1, warmup=0),
+        f"search.memory_query_page1_{rows_label}": measure(lambda: index.search("fintech backend developer", 20),
+                                                           repeat=ctx['repeat']),
+        f"search.memory_query_page50_{rows_label}": measure(lambda: index.search("fintech backend developer", 20, 980),
+                                                            repeat=ctx['repeat']),
+    }
+
+# ============================================================================
+# RECRUITER INDEX
+# ============================================================================
+@benchmark('index')
+def bench_resume_index(ctx):
+    import random
+    from benchmarks.corpus import generate_resume_text
+    from resume_index import ResumeIndex
+    rng = random.Random(ctx['seed'])
+    index = ResumeIndex()
+    rows = [index._vectorize(generate_resume_text(rng, ctx['size'])) for _ in range(500)]
+    for i in range(ctx['index_size']):
+        index._append(i, i, rows[i % len(rows)])
+    _, description, _ = ctx['corpus'][0][1]
+    index.query(description, 50)
+    return {
+        'index.add_resume': measure(lambda: index.add(-1, -1, ctx['corpus'][0][0]), repeat=ctx['repeat']),
+        f"index.query_top50_{ctx['index_size']}": measure(lambda: index.query(description, 50), repeat=ctx['repeat']),
+    }
+
+# ============================================================================
+# DATABASE (opt-in with --db, needs a reachable MySQL from config.py)
+# ============================================================================
+@benchmark('db')
+def bench_database(ctx):
+    from database import get_db_connection, hash_password
+    from resume_manager import (
+        save_resume, get_user_resumes, save_analysis, get_analysis_history, get_resume_improvement_trends,
+        rebuild_resume_score_trends
+    )
+    from chat_history import save_chat_messages, get_chat_messages
+    from write_queue import WriteQueue
+    from job_tracker import (
+        add_job_application, get_user_applications, update_application_status, update_application_status_bulk,
+        get_application_statistics, get_application_funnel
+    )
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('INSERT INTO users (email, password_hash, full_name) VALUES (%s, %s, %s)',
+                       (f"bench-{uuid.uuid4().hex}@example.com", hash_password('benchmark'), 'Benchmark User'))
+        user_id = cursor.lastrowid
+
+    repeat = ctx['repeat']
+    text, (title, description, requirements) = ctx['corpus'][0]
+    resume_data = extract_resume_data(text)
+    analysis_results = {'selection_probability': 55.0, 'missing_skills': requirements['skills'][:5]}
+    chat_turn = [{'role': 'user', 'content': CHAT_QUESTIONS[0]},
+                 {'role': 'assistant', 'content': chatbot_response(CHAT_QUESTIONS[0], resume_data, description,
+                                                                   requirements)}]
+    app_data = {'company_name': 'Benchmark Corp', 'job_title': title, 'application_date': '2024-01-15',
+                'status': 'Applied', 'notes': 'benchmark'}
+    write_queue = None
+    try:
+        _, resume_id, _ = save_resume(user_id, 'bench.pdf', 'uploads/bench.pdf', len(text), 'pdf', text, resume_data)
+        _, app_id, _ = add_job_application(user_id, app_data)
+        app_ids = [add_job_application(user_id, app_data)[1] for _ in range(20)]
+        toggle = itertools.cycle(['Interview', 'Applied'])
+
+        write_queue = WriteQueue(os.path.join(ctx['tmpdir'], 'write_queue.sqlite3')).start()
+        resume_payload = {'user_id': user_id, 'resume_name': 'bench.pdf', 'file_path': 'uploads/bench.pdf',
+                          'file_size': len(text), 'file_type': 'pdf', 'raw_text': text, 'extracted_data': resume_data}
+
+        def update_20_statuses():
+            status = next(toggle)
+            update_application_status_bulk(user_id, {a: status for a in app_ids})
+
+        return {
+            'db.save_resume': measure(lambda: save_resume(user_id, 'bench.pdf', 'uploads/bench.pdf', len(text),
+                                                          'pdf', text, resume_data), repeat=repeat),
+            'db.queue_save_resume_submit': measure(lambda: write_queue.submit('save_resume', resume_payload),
+                                                   repeat=repeat),
+            'db.queue_drain': measure(lambda: write_queue.flush(), repeat=1, warmup=0),
+            'db.get_user_resumes': measure(lambda: get_user_resumes(user_id), repeat=repeat),
+            'db.save_analysis': measure(lambda: save_analysis(resume_id, None, title, description,
+                                                              analysis_results), repeat=repeat),
+            'db.get_analysis_history': measure(lambda: get_analysis_history(resume_id), repeat=repeat),
+            'db.get_resume_improvement_trends': measure(lambda: get_resume_improvement_trends(user_id), repeat=repeat),
+            'db.rebuild_resume_score_trends': measure(lambda: rebuild_resume_score_trends(user_id), repeat=repeat),
+            'db.add_job_application': measure(lambda: add_job_application(user_id, app_data), repeat=repeat),
+            'db.get_user_applications': measure(lambda: get_user_applications(user_id), repeat=repeat),
+            'db.update_application_status': measure(lambda: update_application_status(app_id, user_id, 'Interview'),
+                                                    repeat=repeat),
+            'db.update_application_status_bulk_20': measure(update_20_statuses, repeat=repeat),
+            'db.get_application_statistics': measure(lambda: get_application_statistics(user_id), repeat=repeat),
+            'db.get_application_funnel': measure(lambda: get_application_funnel(user_id), repeat=repeat),
+            'db.save_chat_turn': measure(lambda: save_chat_messages(user_id, resume_id, chat_turn), repeat=repeat),
+            'db.get_chat_window': measure(lambda: get_chat_messages(user_id, 20), repeat=repeat),
+        }
+    finally:
+        if write_queue is not None:
+            write_queue.close()
+        with get_db_connection() as conn:
+            conn.cursor().execute('DELETE FROM users WHERE user_id = %s', (user_id,))
+
+@benchmark('db')
+def bench_search_database(ctx):
+    import random
+    import search
+    from database import get_db_connection, hash_password
+    from benchmarks.corpus import COMPANIES
+
+    rng = random.Random(ctx['seed'])
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('INSERT INTO users (email, password_hash, full_name) VALUES (%s, %s, %s)',
+                       (f"bench-{uuid.uuid4().hex}@example.com", hash_password('benchmark'), 'Benchmark User'))
+        user_id = cursor.lastrowid
+        cursor.executemany('INSERT IGNORE INTO companies (company_name) VALUES (%s)', [(name,) for name in COMPANIES])
+        placeholders = ', '.join(['%s'] * len(COMPANIES))
+        cursor.execute(f'SELECT company_id, company_name FROM companies WHERE company_name IN ({placeholders})', tuple(COMPANIES))
+        company_ids = {row['company_name']: row['company_id'] for row in cursor.fetchall()}
+
+    try:
+        batch = []
+        for title, company, description, notes in generate_applications(rng, ctx['search_rows']):
+            batch.append((user_id, company_ids[company], title, description, '2024-01-15', notes))
+            if len(batch) == 5000:
+                with get_db_connection() as conn:
+                    conn.cursor().executemany('INSERT INTO job_applications (user_id, company_id, job_title, job_description, application_date, notes) VALUES (%s, %s, %s, %s, %s, %s)', batch)
+                batch = []
+        if batch:
+            with get_db_connection() as conn:
+                conn.cursor().executemany('INSERT INTO job_applications (user_id, company_id, job_title, job_description, application_date, notes) VALUES (%s, %s, %s, %s, %s, %s)', batch)
+
+        rows = ctx['search_rows']
+        query = "fintech backend developer"
+        results = {
+            f"db.search_fulltext_page1_{rows}": measure(lambda: search.search_user_content(user_id, query, 1),
+                                                        repeat=ctx['repeat']),
+            f"db.search_fulltext_page50_{rows}": measure(lambda: search.search_user_content(user_id, query, 50),
+                                                         repeat=ctx['repeat']),
+        }
+        # The in-process fallback: one build from the database, then queries served from memory
+        fulltext_available = search._fulltext_available
+        search._fulltext_available = False
+        try:
+            results[f"db.search_memory_build_{rows}"] = measure(lambda: search._build_index(user_id), repeat=1, warmup=0)
+            results[f"db.search_memory_page1_{rows}"] = measure(lambda: search.search_user_content(user_id, query, 1),
+                                                                repeat=ctx['repeat'])
+        finally:
+            search._fulltext_available = fulltext_available
+            search.invalidate_search(user_id)
+        return results
+    finally:
+        with get_db_connection() as conn:
+            conn.cursor().execute('DELETE FROM users WHERE user_id = %s', (user_id,))
+
+def run(groups, seed=42, size='medium', count=10, repeat=20, index_size=100000, search_rows=100000):
+    """Run the registered benchmarks in the given groups and return the results"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ctx = {
+            'corpus': generate_corpus(seed=seed, count=count, size=size),
+            'size': size,
+            'seed': seed,
+            'index_size': index_size,
+            'search_rows': search_rows,
+            'repeat': repeat,
+            'tmpdir': tmpdir,
+        }
+        for group, func in BENCHMARKS:
+            if group not in groups:
+                continue
+            try:
+                results.update(func(ctx))
+            except Exception as e:
+                results[f"{group}.{func.__name__}"] = skipped(f"{type(e).__name__}: {e}")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--size', choices=sorted(SIZES), default='medium')
+    parser.add_argument('--count', type=int, default=10, help='Resume/job pairs in the corpus')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per benchmark')
+    parser.add_argument('--index-size', type=int, default=100000, help='Resumes in the recruiter index benchmark')
+    parser.add_argument('--search-rows', type=int, default=100000, help='Applications per user in the search benchmarks')
+    parser.add_argument('--groups', default=None, help='Comma-separated groups to run (default: all but db)')
+    parser.add_argument('--db', action='store_true', help='Also run the MySQL benchmarks')
+    parser.add_argument('--output', default='bench_output.json')
+    args = parser.parse_args(argv)
+
+    all_groups = {group for group, _ in BENCHMARKS}
+    groups = set(args.groups.split(',')) if args.groups else all_groups - {'db'}
+    if args.db:
+        groups.add('db')
+
+    results = run(groups, seed=args.seed, size=args.size, count=args.count, repeat=args.repeat,
+                  index_size=args.index_size, search_rows=args.search_rows)
+    report = build_report(results, seed=args.seed, size=args.size, count=args.count, repeat=args.repeat,
+                          groups=sorted(groups))
+    write_report(report, args.output)
+
+    for name, stats in report['results'].items():
+        if 'skipped' in stats:
+            print(f"{name:<55} skipped ({stats['skipped']})")
+        else:
+            accuracy = f"  accuracy {stats['accuracy']:.1%}" if 'accuracy' in stats else ''
+            size = f"  size {stats['size_ratio']:.1%} of full text" if 'size_ratio' in stats else ''
+            print(f"{name:<55} median {stats['median']:>12.1f} {stats['unit']}  p95 {stats['p95']:>12.1f}{accuracy}{size}")
+    print(f"\n📄 Results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Content-addressed blob store for original resume files
+Files live under BLOB_ROOT at ab/cd/<sha256>, so identical uploads are
+stored once and names never collide. Writes go to a temp file in the
+target directory and are renamed into place, so readers never see a
+partial file. Readers open a blob by its path().
+
+The database keeps one file_blobs row per blob with the number of resumes
+referencing it; resume_manager increments it when a resume is saved and
+delete_resume() drops the file when the last reference goes. A blob touched
+by a new upload within BLOB_DELETE_GRACE seconds is kept, which covers an
+upload whose save is still waiting in the write queue. Files that end up
+with no row (kept by the grace period, or from a save that failed) are
+removed by resume_manager.collect_orphan_blobs(), which the write queue's
+background thread runs every BLOB_SWEEP_INTERVAL seconds.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+from config import BLOB_CONFIG
+
+class BlobStore:
+    """SHA-256 addressed files, sharded two levels deep"""
+
+    def __init__(self, root=None, delete_grace=None):
+        self.root = root or BLOB_CONFIG['root']
+        self.delete_grace = BLOB_CONFIG['delete_grace_seconds'] if delete_grace is None else delete_grace
+
+    @staticmethod
+    def digest(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, data):
+        """Store bytes (or any buffer) and return their digest; existing content is not rewritten"""
+        digest = self.digest(data)
+        path = self.path(digest)
+        try:
+            # Already stored: refresh the mtime so a concurrent release keeps it
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            pass
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return digest
+
+    def delete(self, digest):
+        """Remove a blob unless an upload touched it within the grace period; returns whether it was removed"""
+        path = self.path(digest)
+        tombstone = f"{path}.deleting"
+        try:
+            # Renaming first means a concurrent put either touched the file before (kept below)
+            # or finds it missing and writes it again
+            os.replace(path, tombstone)
+        except FileNotFoundError:
+            return False
+        if time.time() - os.stat(tombstone).st_mtime < self.delete_grace:
+            os.replace(tombstone, path)
+            return False
+        os.remove(tombstone)
+        for directory in (os.path.dirname(path), os.path.dirname(os.path.dirname(path))):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+        return True
+
+    def digests(self):
+        """Every stored digest"""
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if len(name) == 64 and not name.startswith('.'):
+                    yield name
+
+_store = None
+
+def get_blob_store():
+    """Process-wide store rooted at BLOB_ROOT"""
+    global _store
+    if _store is None:
+        _store = BlobStore()
+    return _store
+
+def store_resume_file(data):
+    """Keep an uploaded file; returns (digest, path relative to the app)"""
+    store = get_blob_store()
+    digest = store.put(data)
+    return digest, store.path(digest)
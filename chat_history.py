@@ -0,0 +1,138 @@
+"""
+Chat history
+Chat turns are persisted to the chat_messages table in batched writes, and
+the session keeps only a bounded window of the latest messages. Older
+messages are paged in on request ("load earlier"), newest first, so the
+render cost of each rerun does not grow with the conversation.
+"""
+from collections import deque
+
+from config import CHAT_CONFIG
+from database import get_db_connection
+from metrics import timed_query
+
+@timed_query
+def save_chat_messages(user_id, resume_id, messages):
+    """Insert a batch of chat messages ({'role', 'content'}) in one round trip"""
+    if not messages:
+        return True, 0, "Nothing to save"
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('INSERT INTO chat_messages (user_id, resume_id, role, content) VALUES (%s, %s, %s, %s)',
+                               [(user_id, resume_id, message['role'], message['content']) for message in messages])
+            return True, len(messages), "Chat saved!"
+    except Exception as e:
+        return False, 0, f"Failed to save chat: {str(e)}"
+
+@timed_query
+def get_chat_messages(user_id, limit, offset=0):
+    """Get up to limit messages for a user, skipping the newest offset, oldest first"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT message_id, role, content, created_at FROM chat_messages WHERE user_id = %s ORDER BY message_id DESC LIMIT %s OFFSET %s', (user_id, limit, offset))
+            return list(reversed(cursor.fetchall()))
+    except Exception as e:
+        return []
+
+@timed_query
+def count_chat_messages(user_id):
+    """Count persisted chat messages for a user"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) AS total FROM chat_messages WHERE user_id = %s', (user_id,))
+            return cursor.fetchone()['total']
+    except Exception as e:
+        return 0
+
+@timed_query
+def clear_chat_messages(user_id):
+    """Delete a user's chat history"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM chat_messages WHERE user_id = %s', (user_id,))
+            return True, "Chat history cleared!"
+    except Exception as e:
+        return False, f"Failed: {str(e)}"
+
+class ChatHistory:
+    """Bounded chat window for one user, backed by the chat_messages table.
+
+    The window always holds the newest messages and earlier pages sit directly
+    before it, so together they are the newest persisted messages and the next
+    page starts at offset len(earlier) + len(window) - len(pending).
+    """
+
+    def __init__(self, user_id, resume_id=None, window=None, page_size=None, flush_every=None):
+        self.user_id = user_id
+        self.resume_id = resume_id
+        self.page_size = page_size or CHAT_CONFIG['page_size']
+        self.flush_every = flush_every or CHAT_CONFIG['flush_every']
+        self.window = deque(maxlen=window or CHAT_CONFIG['window'])
+        self.earlier = []
+        self.pending = []
+        self.has_earlier = False
+
+    def load(self):
+        """Fill the window with the newest persisted messages"""
+        messages = get_chat_messages(self.user_id, self.window.maxlen)
+        self.window.clear()
+        self.window.extend({'role': m['role'], 'content': m['content']} for m in messages)
+        self.earlier = []
+        self.has_earlier = count_chat_messages(self.user_id) > len(self.window)
+        return self
+
+    def append(self, role, content):
+        """Add a message to the window and write it out once a batch is full"""
+        message = {'role': role, 'content': content}
+        if len(self.window) == self.window.maxlen:
+            evicted = self.window[0]
+            if self.earlier:
+                # Keep loaded pages contiguous with the window
+                self.earlier.append(evicted)
+            else:
+                self.has_earlier = True
+        self.window.append(message)
+        self.pending.append(message)
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Persist buffered messages; they stay buffered if the write fails"""
+        if not self.pending:
+            return True
+        success, _, msg = save_chat_messages(self.user_id, self.resume_id, self.pending)
+        if success:
+            self.pending = []
+        else:
+            print(f"⚠️ {msg}")
+        return success
+
+    def load_earlier(self):
+        """Prepend the page of messages before everything currently loaded"""
+        self.flush()
+        offset = len(self.earlier) + len(self.window) - len(self.pending)
+        messages = get_chat_messages(self.user_id, self.page_size, offset)
+        self.earlier[:0] = [{'role': m['role'], 'content': m['content']} for m in messages]
+        self.has_earlier = len(messages) == self.page_size
+        return len(messages)
+
+    def hide_earlier(self):
+        """Drop loaded pages so only the window is rendered again"""
+        if self.earlier:
+            self.earlier = []
+            self.has_earlier = True
+
+    def clear(self):
+        self.window.clear()
+        self.earlier = []
+        self.pending = []
+        self.has_earlier = False
+        return clear_chat_messages(self.user_id)
+
+    def messages(self):
+        """Messages to render, oldest first"""
+        return self.earlier + list(self.window)
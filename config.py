@@ -34,3 +34,89 @@ STREAMLIT_CONFIG = {
     'server_port': int(os.getenv('PORT', '8501')),
     'server_address': os.getenv('SERVER_ADDRESS', '0.0.0.0'),
 }
+
+# Recruiter resume index (sparse TF-IDF, persisted to disk)
+INDEX_CONFIG = {
+    'path': os.getenv('RESUME_INDEX_PATH', 'data/resume_index'),
+    'snapshot_every': int(os.getenv('RESUME_INDEX_SNAPSHOT_EVERY', '500')),
+}
+
+# AI analysis (local embedding model under the ./models volume)
+AI_CONFIG = {
+    'models_dir': os.getenv('MODELS_DIR', 'models'),
+    'embedding_model': os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2'),
+}
+
+# Chat history (persisted turns, bounded in-memory window)
+CHAT_CONFIG = {
+    'window': int(os.getenv('CHAT_WINDOW', '20')),
+    'page_size': int(os.getenv('CHAT_PAGE_SIZE', '20')),
+    'flush_every': int(os.getenv('CHAT_FLUSH_EVERY', '2')),
+}
+
+# Per-session page data cache (sidebar stats, resume history, applications)
+SESSION_CACHE_CONFIG = {
+    'ttl_seconds': float(os.getenv('SESSION_CACHE_TTL', '300')),
+}
+
+# Write-behind queue for resume and analysis saves (SQLite journal, background writer)
+WRITE_QUEUE_CONFIG = {
+    'enabled': os.getenv('WRITE_QUEUE_ENABLED', 'True').lower() == 'true',
+    'path': os.getenv('WRITE_QUEUE_PATH', 'data/write_queue.sqlite3'),
+    'batch_size': int(os.getenv('WRITE_QUEUE_BATCH_SIZE', '50')),
+    'max_pending': int(os.getenv('WRITE_QUEUE_MAX_PENDING', '1000')),
+    'enqueue_timeout': float(os.getenv('WRITE_QUEUE_ENQUEUE_TIMEOUT', '5')),
+    'shutdown_timeout': float(os.getenv('WRITE_QUEUE_SHUTDOWN_TIMEOUT', '10')),
+}
+
+# JSON HTTP API (api_server.py, runs next to the Streamlit app)
+API_CONFIG = {
+    'host': os.getenv('API_HOST', '0.0.0.0'),
+    'port': int(os.getenv('API_PORT', '8000')),
+    'workers': int(os.getenv('API_WORKERS', str(os.cpu_count() or 2))),
+    'max_concurrency': int(os.getenv('API_MAX_CONCURRENCY', '32')),
+    'request_timeout': float(os.getenv('API_REQUEST_TIMEOUT', '30')),
+    'max_body_mb': float(os.getenv('API_MAX_BODY_MB', '10')),
+}
+
+# Prometheus metrics (latency histograms, counters and gauges on a local port)
+METRICS_CONFIG = {
+    'enabled': os.getenv('METRICS_ENABLED', 'False').lower() == 'true',
+    'host': os.getenv('METRICS_HOST', '127.0.0.1'),
+    'port': int(os.getenv('METRICS_PORT', '9464')),
+    'session_idle_seconds': float(os.getenv('METRICS_SESSION_IDLE', '300')),
+}
+
+# Per-rerun profiler for the Streamlit script (section timings, sampled cProfile dumps)
+PROFILER_CONFIG = {
+    'enabled': os.getenv('PROFILE_RERUNS', 'False').lower() == 'true',
+    'dir': os.getenv('PROFILE_DIR', 'data/profiles'),
+    'sample_rate': float(os.getenv('PROFILE_SAMPLE_RATE', '0.1')),
+    'keep': int(os.getenv('PROFILE_KEEP', '50')),
+    'overlay': os.getenv('PROFILE_OVERLAY', 'True').lower() == 'true',
+}
+
+# Content-addressed store for original resume files (sharded by SHA-256 under ./uploads)
+BLOB_CONFIG = {
+    'root': os.getenv('BLOB_ROOT', 'uploads'),
+    'delete_grace_seconds': float(os.getenv('BLOB_DELETE_GRACE', '600')),
+    'sweep_interval_seconds': float(os.getenv('BLOB_SWEEP_INTERVAL', '3600')),
+}
+
+# Resume versions: a re-upload under the same name is stored as a diff against the
+# previous version, with a full snapshot every RESUME_SNAPSHOT_INTERVAL versions (or
+# when the diff is over RESUME_SNAPSHOT_RATIO of the full text)
+VERSION_CONFIG = {
+    'snapshot_interval': int(os.getenv('RESUME_SNAPSHOT_INTERVAL', '10')),
+    'snapshot_ratio': float(os.getenv('RESUME_SNAPSHOT_RATIO', '0.5')),
+}
+
+# Full-text search over applications and resumes: MySQL FULLTEXT ('auto'), or always the
+# in-process index ('memory'); in-process indexes are rebuilt after SEARCH_INDEX_TTL seconds
+SEARCH_CONFIG = {
+    'backend': os.getenv('SEARCH_BACKEND', 'auto'),
+    'index_ttl': float(os.getenv('SEARCH_INDEX_TTL', '300')),
+    'max_indexes': int(os.getenv('SEARCH_MAX_INDEXES', '8')),
+    'page_size': int(os.getenv('SEARCH_PAGE_SIZE', '20')),
+    'max_page_size': 100,
+}
@@ -1,5 +1,6 @@
 import hashlib
 import os
+import threading
 from datetime import datetime
 from contextlib import contextmanager
 import mysql.connector
@@ -8,9 +9,48 @@ from mysql.connector import Error
 # Import MySQL configuration
 from config import MYSQL_CONFIG
 
+# Tables are created on the first connection rather than at import, so
+# importing this module never blocks on MySQL
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+# Errors raised through get_db_connection per thread, so callers can tell a failed
+# query from an empty result even when the query function swallows the error
+_failures = threading.local()
+
+def query_failures():
+    """Number of database errors on this thread so far"""
+    return getattr(_failures, 'count', 0)
+
+def ensure_database():
+    """Create the tables once per process; retried on the next connection if it fails"""
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        try:
+            init_database()
+            _schema_ready = True
+        except Exception as e:
+            print(f"⚠️ Database initialization skipped: {e}")
+            print("Database will be created when first accessed.")
+
 @contextmanager
 def get_db_connection():
     """Context manager for MySQL database connections"""
+    try:
+        ensure_database()
+        with _connect() as conn:
+            yield conn
+    except Exception:
+        _failures.count = query_failures() + 1
+        raise
+
+@contextmanager
+def _connect():
+    """Open a wrapped MySQL connection (committed on success, rolled back on error)"""
     try:
         conn = mysql.connector.connect(**MYSQL_CONFIG)
         cursor = conn.cursor(dictionary=True)  # Return results as dictionaries
@@ -61,7 +101,7 @@ def get_db_connection():
 
 def init_database():
     """Initialize MySQL database with all required tables"""
-    with get_db_connection() as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         
         # Users table
@@ -121,6 +161,8 @@ def init_database():
                 file_path VARCHAR(500),
                 file_size INT,
                 file_type VARCHAR(50),
+                blob_hash CHAR(64),
+                search_text LONGTEXT,
                 is_current BOOLEAN DEFAULT TRUE,
                 uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
@@ -133,9 +175,12 @@ def init_database():
                 version_id INT PRIMARY KEY AUTO_INCREMENT,
                 resume_id INT NOT NULL,
                 version_number INT NOT NULL,
+                is_snapshot BOOLEAN DEFAULT TRUE,
                 raw_text LONGTEXT,
+                text_delta LONGTEXT,
                 extracted_data TEXT,
                 changes_description TEXT,
+                blob_hash CHAR(64),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (resume_id) REFERENCES resumes(resume_id) ON DELETE CASCADE
             )
@@ -160,6 +205,30 @@ def init_database():
             )
         ''')
         
+        # Resume score trends (one row per analysis, maintained by save_analysis)
+        trends_existed = table_exists(cursor, 'resume_score_trends')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS resume_score_trends (
+                analysis_id INT PRIMARY KEY,
+                user_id INT NOT NULL,
+                resume_id INT NOT NULL,
+                job_title VARCHAR(255) NOT NULL,
+                analyzed_at TIMESTAMP NOT NULL,
+                selection_probability FLOAT,
+                previous_probability FLOAT,
+                delta FLOAT,
+                best_probability FLOAT,
+                run_index INT NOT NULL,
+                INDEX idx_trends_user_title (user_id, job_title, analyzed_at),
+                FOREIGN KEY (analysis_id) REFERENCES resume_analysis_history(analysis_id) ON DELETE CASCADE,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )
+        ''')
+        if not trends_existed:
+            # Analyses saved before the trends table existed are backfilled once
+            from resume_manager import backfill_score_trends
+            backfill_score_trends(cursor)
+        
         # Companies table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS companies (
@@ -216,9 +285,92 @@ def init_database():
             )
         ''')
         
+        # Embedding cache table (one row per text hash and model)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                text_hash CHAR(64) NOT NULL,
+                model_name VARCHAR(255) NOT NULL,
+                dimensions INT NOT NULL,
+                embedding MEDIUMBLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (text_hash, model_name)
+            )
+        ''')
+        
+        # Chat messages table (persisted chat history, paged newest first)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                message_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                user_id INT NOT NULL,
+                resume_id INT,
+                role VARCHAR(20) NOT NULL,
+                content MEDIUMTEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_chat_user (user_id, message_id),
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                FOREIGN KEY (resume_id) REFERENCES resumes(resume_id) ON DELETE SET NULL
+            )
+        ''')
+        
+        # Original resume files in the content-addressed blob store (one row per distinct file)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS file_blobs (
+                blob_hash CHAR(64) PRIMARY KEY,
+                size_bytes BIGINT NOT NULL,
+                ref_count INT NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Columns added after the first release (CREATE TABLE IF NOT EXISTS leaves existing tables as they were)
+        add_column_if_missing(cursor, 'resumes', 'blob_hash', 'CHAR(64) AFTER file_type')
+        add_column_if_missing(cursor, 'resume_versions', 'is_snapshot', 'BOOLEAN DEFAULT TRUE AFTER version_number')
+        add_column_if_missing(cursor, 'resume_versions', 'text_delta', 'LONGTEXT AFTER raw_text')
+        if add_column_if_missing(cursor, 'resume_versions', 'blob_hash', 'CHAR(64) AFTER changes_description'):
+            # Stored files were referenced by the resume until versions carried their own
+            cursor.execute('UPDATE resume_versions rv JOIN resumes r ON rv.resume_id = r.resume_id SET rv.blob_hash = r.blob_hash WHERE rv.version_number = 1 AND r.blob_hash IS NOT NULL')
+        if add_column_if_missing(cursor, 'resumes', 'search_text', 'LONGTEXT AFTER blob_hash'):
+            from search import backfill_resume_search_text
+            backfill_resume_search_text(cursor)
+        
+        # Full-text search indexes; without them search falls back to an in-process index
+        for table, index, columns in FULLTEXT_INDEXES:
+            try:
+                add_index_if_missing(cursor, table, index, f'FULLTEXT INDEX {index} ({columns})')
+            except Error as e:
+                print(f"⚠️ FULLTEXT index {index} not created ({e}); search will use the in-process index")
+        
         conn.commit()
         print("✅ Database initialized successfully!")
 
+FULLTEXT_INDEXES = [
+    ('job_applications', 'ft_applications', 'job_title, job_description, notes'),
+    ('companies', 'ft_companies', 'company_name'),
+    ('resumes', 'ft_resumes', 'resume_name, search_text'),
+]
+
+def add_index_if_missing(cursor, table, index, definition):
+    """Add an index to an existing table unless one with that name is already there; returns whether it was added"""
+    cursor.execute('SELECT COUNT(*) AS n FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s', (table, index))
+    if cursor.fetchone()['n']:
+        return False
+    cursor.execute(f'ALTER TABLE {table} ADD {definition}')
+    return True
+
+def table_exists(cursor, table):
+    """Whether a table exists in the current database"""
+    cursor.execute('SELECT COUNT(*) AS n FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s', (table,))
+    return bool(cursor.fetchone()['n'])
+
+def add_column_if_missing(cursor, table, column, definition):
+    """Add a column to an existing table unless it is already there; returns whether it was added"""
+    cursor.execute('SELECT COUNT(*) AS n FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s', (table, column))
+    if cursor.fetchone()['n']:
+        return False
+    cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return True
+
 def hash_password(password):
     """Hash password using SHA-256"""
     return hashlib.sha256(password.encode()).hexdigest()
@@ -227,9 +379,3 @@ def verify_password(password, password_hash):
     """Verify password against hash"""
     return hash_password(password) == password_hash
 
-# Initialize MySQL database on import
-try:
-    init_database()
-except Exception as e:
-    print(f"⚠️ Database initialization skipped: {e}")
-    print("Database will be created when first accessed.")
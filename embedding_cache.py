@@ -0,0 +1,54 @@
+import threading
+import numpy as np
+from database import get_db_connection
+from config import AI_CONFIG
+
+def get_cached_embeddings(text_hashes, model_name):
+    """Get stored embeddings for a list of text hashes"""
+    if not text_hashes:
+        return {}
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ', '.join(['%s'] * len(text_hashes))
+            cursor.execute(f'SELECT text_hash, embedding FROM embedding_cache WHERE model_name = %s AND text_hash IN ({placeholders})', (model_name, *text_hashes))
+            return {row['text_hash']: np.frombuffer(row['embedding'], dtype=np.float32) for row in cursor.fetchall()}
+    except Exception as e:
+        return {}
+
+def save_embeddings(vectors, model_name):
+    """Store embeddings keyed by text hash"""
+    if not vectors:
+        return True
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('INSERT IGNORE INTO embedding_cache (text_hash, model_name, dimensions, embedding) VALUES (%s, %s, %s, %s)', [(text_hash, model_name, len(vector), np.asarray(vector, dtype=np.float32).tobytes()) for text_hash, vector in vectors.items()])
+            return True
+    except Exception as e:
+        return False
+
+class DatabaseEmbeddingCache:
+    """Persistent embedding cache backed by the embedding_cache table"""
+    
+    def get_many(self, text_hashes, model_name):
+        return get_cached_embeddings(text_hashes, model_name)
+    
+    def put_many(self, vectors, model_name):
+        save_embeddings(vectors, model_name)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_similarity_engine():
+    """Similarity engine using the configured local model and the database cache"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            from analysis.similarity import SimilarityEngine
+            _engine = SimilarityEngine(
+                models_dir=AI_CONFIG['models_dir'],
+                model_name=AI_CONFIG['embedding_model'],
+                cache=DatabaseEmbeddingCache()
+            )
+        return _engine
@@ -1,7 +1,13 @@
 import json
 from datetime import datetime, date
+import numpy as np
 from database import get_db_connection
+from metrics import timed_query
+from search import invalidate_search
 
+APPLICATION_STATUSES = ["Applied", "Interview", "Offer", "Rejected"]
+
+@timed_query
 def add_job_application(user_id, app_data, resume_id=None):
     """Add a new job application"""
     try:
@@ -17,10 +23,12 @@ def add_job_application(user_id, app_data, resume_id=None):
             cursor.execute('INSERT INTO job_applications (user_id, company_id, resume_id, job_title, job_description, job_url, application_date, status, location, notes) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)', (user_id, company_id, resume_id, app_data['job_title'], app_data.get('job_description'), app_data.get('job_url'), app_data['application_date'], app_data.get('status', 'Applied'), app_data.get('location'), app_data.get('notes')))
             app_id = cursor.lastrowid
             cursor.execute('INSERT INTO application_status (application_id, status, notes) VALUES (%s, %s, %s)', (app_id, app_data.get('status', 'Applied'), 'Initial application'))
-            return True, app_id, "Application added successfully!"
+        invalidate_search(user_id)
+        return True, app_id, "Application added successfully!"
     except Exception as e:
         return False, None, f"Failed to add application: {str(e)}"
 
+@timed_query
 def get_user_applications(user_id, status=None):
     """Get all job applications for a user"""
     try:
@@ -34,6 +42,7 @@ def get_user_applications(user_id, status=None):
     except Exception as e:
         return []
 
+@timed_query
 def update_application_status(application_id, user_id, new_status, notes=None):
     """Update job application status"""
     try:
@@ -41,10 +50,33 @@ def update_application_status(application_id, user_id, new_status, notes=None):
             cursor = conn.cursor()
             cursor.execute('UPDATE job_applications SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE application_id = %s AND user_id = %s', (new_status, application_id, user_id))
             cursor.execute('INSERT INTO application_status (application_id, status, notes) VALUES (%s, %s, %s)', (application_id, new_status, notes or f'Status changed to {new_status}'))
-            return True, "Status updated successfully!"
+        invalidate_search(user_id)
+        return True, "Status updated successfully!"
     except Exception as e:
         return False, f"Failed to update status: {str(e)}"
 
+@timed_query
+def update_application_status_bulk(user_id, changes, notes=None):
+    """Apply {application_id: new_status} changes and their history rows in one transaction"""
+    if not changes:
+        return True, 0, "No changes to save"
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ', '.join(['%s'] * len(changes))
+            cursor.execute(f'SELECT application_id, status FROM job_applications WHERE user_id = %s AND application_id IN ({placeholders})', (user_id, *changes))
+            current = {row['application_id']: row['status'] for row in cursor.fetchall()}
+            updates = [(status, app_id, user_id) for app_id, status in changes.items() if app_id in current and current[app_id] != status]
+            if updates:
+                cursor.executemany('UPDATE job_applications SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE application_id = %s AND user_id = %s', updates)
+                cursor.executemany('INSERT INTO application_status (application_id, status, notes) VALUES (%s, %s, %s)', [(app_id, status, notes or f'Status changed to {status}') for status, app_id, _ in updates])
+        if updates:
+            invalidate_search(user_id)
+        return True, len(updates), f"Updated {len(updates)} application(s)!"
+    except Exception as e:
+        return False, 0, f"Failed to update statuses: {str(e)}"
+
+@timed_query
 def get_application_statistics(user_id):
     """Get statistics for user's job applications"""
     try:
@@ -60,3 +92,89 @@ def get_application_statistics(user_id):
             return {'total_applications': 0, 'active_applications': 0, 'success_rate': 0, 'avg_days_to_offer': 0}
     except Exception as e:
         return None
+
+# Funnel stages in order; a later stage implies the earlier ones were passed
+FUNNEL_STAGES = ["Applied", "Interview", "Offer"]
+
+def _group_medians(codes, values, groups):
+    """Median of values per integer group code (NaN where a group has no values)"""
+    medians = np.full(groups, np.nan)
+    if len(values):
+        order = np.lexsort((values, codes))
+        codes, values = codes[order], values[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(codes)]
+        lower, upper = values[(starts + ends - 1) // 2], values[(starts + ends) // 2]
+        medians[codes[starts]] = (lower + upper) / 2
+    return medians
+
+def compute_application_funnel(rows):
+    """Funnel conversion and median days per stage from status transitions.
+
+    rows: dicts with application_id, company_name, status and seconds_in_stage
+    (None while the application is still in that stage).
+    """
+    if not rows:
+        return {'funnel': [{'stage': stage, 'count': 0, 'conversion': 0.0} for stage in FUNNEL_STAGES],
+                'rejected': 0, 'time_in_stage': {}, 'by_company': []}
+
+    # Columnar view of the transitions
+    app_ids, app_index = np.unique(np.array([row['application_id'] for row in rows]), return_inverse=True)
+    status_names, status_code = np.unique(np.array([row['status'] for row in rows]), return_inverse=True)
+    company_names, company_code = np.unique(np.array([row['company_name'] or 'Unknown' for row in rows]),
+                                            return_inverse=True)
+    seconds = np.array([np.nan if row['seconds_in_stage'] is None else row['seconds_in_stage'] for row in rows],
+                       dtype=float)
+    rank_of_status = np.array([FUNNEL_STAGES.index(name) if name in FUNNEL_STAGES else -1 for name in status_names])
+
+    # Furthest stage each application reached, whether it was rejected, and its company;
+    # every application counts as Applied, even one whose only status is Rejected
+    furthest = np.zeros(len(app_ids), dtype=int)
+    np.maximum.at(furthest, app_index, rank_of_status[status_code])
+    rejected = np.zeros(len(app_ids), dtype=bool)
+    if 'Rejected' in status_names:
+        np.logical_or.at(rejected, app_index, status_code == np.searchsorted(status_names, 'Rejected'))
+    app_company = np.zeros(len(app_ids), dtype=int)
+    app_company[app_index] = company_code
+
+    # Applications reaching each stage, overall and per company
+    reached = np.stack([furthest >= i for i in range(len(FUNNEL_STAGES))])
+    counts = reached.sum(axis=1)
+    company_counts = np.stack([np.bincount(app_company, weights=r, minlength=len(company_names)) for r in reached])
+    funnel = [{'stage': stage, 'count': int(counts[i]),
+               'conversion': round(float(100.0 * counts[i] / counts[i - 1]), 1) if i and counts[i - 1] else (100.0 if i == 0 and counts[0] else 0.0)}
+              for i, stage in enumerate(FUNNEL_STAGES)]
+
+    # Median days spent in a status before moving on (finished stays only)
+    finished = ~np.isnan(seconds)
+    status_medians = _group_medians(status_code[finished], seconds[finished], len(status_names))
+    company_medians = _group_medians(company_code[finished], seconds[finished], len(company_names))
+    time_in_stage = {str(name): round(float(median) / 86400, 1)
+                     for name, median in zip(status_names, status_medians) if not np.isnan(median)}
+
+    applications = np.bincount(app_company, minlength=len(company_names))
+    by_company = []
+    for code, company in enumerate(company_names):
+        applied = company_counts[0][code]
+        by_company.append({
+            'company': str(company),
+            'applications': int(applications[code]),
+            'interview_rate': round(float(100.0 * company_counts[1][code] / applied), 1) if applied else 0.0,
+            'offer_rate': round(float(100.0 * company_counts[2][code] / applied), 1) if applied else 0.0,
+            'median_days_per_stage': None if np.isnan(company_medians[code]) else round(float(company_medians[code]) / 86400, 1),
+        })
+
+    return {'funnel': funnel, 'rejected': int(np.count_nonzero(rejected)), 'time_in_stage': time_in_stage,
+            'by_company': by_company}
+
+@timed_query
+def get_application_funnel(user_id):
+    """Funnel conversion rates and median time-in-stage from the status history"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT s.application_id, c.company_name, s.status, TIMESTAMPDIFF(SECOND, s.changed_at, LEAD(s.changed_at) OVER (PARTITION BY s.application_id ORDER BY s.changed_at, s.status_id)) AS seconds_in_stage FROM application_status s JOIN job_applications ja ON s.application_id = ja.application_id LEFT JOIN companies c ON ja.company_id = c.company_id WHERE ja.user_id = %s', (user_id,))
+            rows = cursor.fetchall()
+        return compute_application_funnel(rows)
+    except Exception as e:
+        return None
@@ -0,0 +1,307 @@
+"""
+Prometheus metrics
+Latency histograms and error counters per processing stage (parsing,
+extraction, gap analysis, chat) and per database function, plus gauges for
+active sessions and the in-process caches, served in the Prometheus text
+format at http://METRICS_HOST:METRICS_PORT/metrics.
+
+Whether to instrument is decided at import: with METRICS_ENABLED off,
+@timed and @timed_query return the function unchanged and stage() is a
+shared no-op context, so disabled metrics cost nothing per call.
+"""
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_CONFIG
+
+ENABLED = METRICS_CONFIG['enabled']
+PREFIX = 'jobpath'
+
+# Seconds; covers sub-millisecond cache hits up to slow parses and queries
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic count per label set, either incremented directly or read from a callback at scrape time"""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        if self.function is not None:
+            # Callbacks return {labelvalues tuple: number} of totals that only go up while the process runs
+            values = self.function()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labelnames, labelvalues), value
+
+class Gauge:
+    """Current value per label set, either set directly or read from a callback at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def samples(self):
+        if self.function is not None:
+            # Callbacks return a number, or {labelvalues tuple: number} for labelled gauges
+            values = self.function()
+            values = values if isinstance(values, dict) else {(): values}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labelnames, labelvalues), value
+
+class Histogram:
+    """Bucketed observations with sum and count per label set"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), sum
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labelvalues, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield (f"{self.name}_bucket",
+                       _format_labels(self.labelnames, labelvalues, ('le', _format_value(bound))), cumulative)
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labelvalues), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, labelvalues), cumulative
+
+class Registry:
+    """Metrics exposed by this process"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in metric.samples())
+            except Exception as e:
+                lines.append(f"# {metric.name} unavailable: {type(e).__name__}")
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(f'{PREFIX}_stage_duration_seconds',
+                                            'Time spent in a processing stage', ['stage']))
+STAGE_ERRORS = REGISTRY.register(Counter(f'{PREFIX}_stage_errors_total',
+                                         'Processing stages that raised', ['stage']))
+DB_SECONDS = REGISTRY.register(Histogram(f'{PREFIX}_db_query_duration_seconds',
+                                         'Time spent in a database function', ['function']))
+DB_ERRORS = REGISTRY.register(Counter(f'{PREFIX}_db_errors_total',
+                                      'Database functions that raised or reported failure', ['function']))
+
+def _failed(result):
+    """DB functions report failure as (False, ...) instead of raising"""
+    return isinstance(result, tuple) and result[:1] == (False,)
+
+def _instrument(fn, histogram, errors, label, check_result=False):
+    if inspect.isgeneratorfunction(fn):
+        # Streamed responses are timed from the call until the last chunk
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                yield from fn(*args, **kwargs)
+            except BaseException as e:
+                if not isinstance(e, GeneratorExit):
+                    errors.inc(label)
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start, label)
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            errors.inc(label)
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - start, label)
+        if check_result and _failed(result):
+            errors.inc(label)
+        return result
+    return wrapper
+
+def timed(stage_name):
+    """Record a function's latency under a processing stage"""
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+        return _instrument(fn, STAGE_SECONDS, STAGE_ERRORS, stage_name)
+    return decorator
+
+def timed_query(fn):
+    """Record a database function's latency and failures under its name"""
+    if not ENABLED:
+        return fn
+    return _instrument(fn, DB_SECONDS, DB_ERRORS, fn.__name__, check_result=True)
+
+_noop = nullcontext()
+
+@contextmanager
+def _stage(stage_name):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage_name)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage_name)
+
+def stage(stage_name):
+    """Context manager recording a block's latency under a processing stage"""
+    return _stage(stage_name) if ENABLED else _noop
+
+# Active sessions: every Streamlit rerun touches its session; idle ones age out
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def touch_session(session_id):
+    """Mark a session as active"""
+    if ENABLED:
+        with _sessions_lock:
+            _sessions[session_id] = time.monotonic()
+
+def _active_sessions():
+    cutoff = time.monotonic() - METRICS_CONFIG['session_idle_seconds']
+    with _sessions_lock:
+        for session_id in [s for s, seen in _sessions.items() if seen < cutoff]:
+            del _sessions[session_id]
+        return len(_sessions)
+
+def _cache_entries():
+    from analysis.analysis_cache import analysis_cache
+    from analysis import incremental
+    entries = {('analysis',): len(analysis_cache), ('resume_profile',): len(incremental._profiles)}
+    import embedding_cache
+    if embedding_cache._engine is not None:
+        entries[('embedding_memory',)] = len(embedding_cache._engine._memory)
+    return entries
+
+def _cache_lookups():
+    from analysis.analysis_cache import analysis_cache
+    return {('analysis', 'hit'): analysis_cache.hits, ('analysis', 'miss'): analysis_cache.misses}
+
+def _write_queue_pending():
+    import write_queue
+    return write_queue._queue.pending() if write_queue._queue is not None else 0
+
+REGISTRY.register(Gauge(f'{PREFIX}_active_sessions', 'Sessions seen within METRICS_SESSION_IDLE seconds',
+                        function=_active_sessions))
+REGISTRY.register(Gauge(f'{PREFIX}_cache_entries', 'Entries held by an in-process cache', ['cache'],
+                        function=_cache_entries))
+REGISTRY.register(Counter(f'{PREFIX}_cache_lookups_total', 'Cache lookups since start by result', ['cache', 'result'],
+                          function=_cache_lookups))
+REGISTRY.register(Gauge(f'{PREFIX}_write_queue_pending', 'Saves waiting in the write-behind queue',
+                        function=_write_queue_pending))
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves REGISTRY at /metrics"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(host=None, port=None):
+    """Serve /metrics from a background thread (once per process); returns whether it is running"""
+    global _server
+    if not ENABLED:
+        return False
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host or METRICS_CONFIG['host'], port or METRICS_CONFIG['port']),
+                                              MetricsHandler)
+            except OSError as e:
+                # Not retried on every rerun
+                print(f"⚠️ Metrics server not started: {e}")
+                _server = False
+                return False
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+            print(f"📈 Metrics at http://{_server.server_address[0]}:{_server.server_address[1]}/metrics")
+        return bool(_server)
@@ -0,0 +1,124 @@
+"""
+Per-rerun profiler for the Streamlit script
+Streamlit re-executes resume_chatbot.py on every interaction. With
+PROFILE_RERUNS on, each rerun's wall time is split into named page
+sections, and a sampled fraction of reruns is also run under cProfile and
+dumped to PROFILE_DIR as .prof files (open with snakeviz, or turn into a
+flamegraph with flameprof) next to a JSON file of the section timings.
+Only the newest PROFILE_KEEP dumps are kept.
+
+Sections are laps: section(name) ends the previous section and starts the
+next, so the script only needs one call per block. finish() closes the
+rerun and must run before any st.stop() or st.rerun(), which end the script
+with an exception (the app's stop_rerun() and rerun_page() do both). A
+rerun that ends with an error never reaches finish(); its profiler is
+disabled and discarded when the session's next rerun starts.
+"""
+import cProfile
+import glob
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+from config import PROFILER_CONFIG
+import metrics
+
+class RerunProfiler:
+    """Wall time per named section for one rerun, optionally under cProfile"""
+
+    def __init__(self, session_id, sample_rate=None, directory=None, keep=None):
+        self.session_id = session_id
+        self.directory = directory or PROFILER_CONFIG['dir']
+        self.keep = keep if keep is not None else PROFILER_CONFIG['keep']
+        self.sections = []
+        self._current = None
+        self._started = time.perf_counter()
+        self._section_started = self._started
+        self._profile = None
+        rate = PROFILER_CONFIG['sample_rate'] if sample_rate is None else sample_rate
+        if rate and random.random() < rate:
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiler is active (e.g. a concurrent session on Python 3.12+)
+                self._profile = None
+
+    def section(self, name):
+        """Start timing a named section (ends the previous one)"""
+        now = time.perf_counter()
+        if self._current is not None:
+            self.sections.append((self._current, now - self._section_started))
+        self._current = name
+        self._section_started = now
+
+    def finish(self):
+        """End the rerun; returns {'total', 'sections': [(name, seconds)], 'dump'}"""
+        _unfinished.pop(self.session_id, None)
+        now = time.perf_counter()
+        if self._current is not None:
+            self.sections.append((self._current, now - self._section_started))
+            self._current = None
+        total = now - self._started
+        dump = None
+        if self._profile is not None:
+            self._profile.disable()
+            dump = self._write_dump(total)
+            self._profile = None
+        if metrics.ENABLED:
+            for name, seconds in self.sections:
+                metrics.STAGE_SECONDS.observe(seconds, f"rerun.{name}")
+            metrics.STAGE_SECONDS.observe(total, 'rerun')
+        return {'total': total, 'sections': self.sections, 'dump': dump}
+
+    def abandon(self):
+        """Stop profiling without recording anything (the rerun raised before finish())"""
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile = None
+
+    def _write_dump(self, total):
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.join(self.directory, f"rerun-{datetime.now():%Y%m%d-%H%M%S-%f}-{self.session_id}-{total * 1000:.0f}ms")
+        self._profile.dump_stats(f"{stem}.prof")
+        with open(f"{stem}.json", 'w') as f:
+            json.dump({'session': self.session_id, 'total': total,
+                       'sections': [{'name': name, 'seconds': seconds} for name, seconds in self.sections]}, f, indent=2)
+        self._rotate()
+        return f"{stem}.prof"
+
+    def _rotate(self):
+        """Delete the oldest dumps beyond the configured number"""
+        dumps = sorted(glob.glob(os.path.join(self.directory, 'rerun-*.prof')), key=os.path.getmtime)
+        for path in dumps[:max(len(dumps) - self.keep, 0)]:
+            for stale in (path, path[:-len('.prof')] + '.json'):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+class NullProfiler:
+    """Stand-in used when profiling is off"""
+
+    def section(self, name):
+        pass
+
+    def finish(self):
+        return None
+
+_null_profiler = NullProfiler()
+
+# Session id -> profiler of a rerun that has not finished yet
+_unfinished = {}
+
+def start_rerun(session_id):
+    """Profiler for the rerun that is starting, or a no-op one when PROFILE_RERUNS is off"""
+    if not PROFILER_CONFIG['enabled']:
+        return _null_profiler
+    leftover = _unfinished.pop(session_id, None)
+    if leftover is not None:
+        leftover.abandon()
+    profiler = _unfinished[session_id] = RerunProfiler(session_id)
+    return profiler
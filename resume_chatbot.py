@@ -1,8 +1,8 @@
 import streamlit as st
 import os
-import pandas as pd
 import re
-from resume_parser import extract_text_from_pdf, extract_text_from_docx
+import secrets
+from resume_parser import extract_text_from_blob
 # from free_ai_analyzer import FreeAIAnalyzer  # Temporarily disabled
 from datetime import datetime, date
 
@@ -12,624 +12,98 @@ from auth import (
     get_user_profile, update_user_profile, check_authentication
 )
 from resume_manager import (
-    save_resume, get_user_resumes, save_analysis,
-    get_analysis_history, get_resume_improvement_trends
+    get_user_resumes, count_user_resumes, delete_resume, get_resume_versions,
+    get_analysis_history, get_resume_improvement_trends, get_resumes_by_ids
 )
 from job_tracker import (
     add_job_application, get_user_applications,
-    update_application_status, get_application_statistics
+    update_application_status_bulk, get_application_statistics, get_application_funnel,
+    APPLICATION_STATUSES
 )
 
-def extract_resume_data(raw_text):
-    """Extract structured data from resume text"""
-    lines = raw_text.split('\n')
-    
-    data = {
-        'name': '',
-        'email': '',
-        'phone': '',
-        'education': [],
-        'skills': [],
-        'experience': [],
-        'projects': [],
-        'certifications': []
-    }
-    
-    current_section = ""
-    current_project = []
-    current_experience = []
-    current_education = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Detect sections
-        if line.upper() in ['EDUCATION', 'SKILLS', 'EXPERIENCE', 'PROJECTS', 'CERTIFICATIONS', 'WORK EXPERIENCE']:
-            # Save current project/experience/education before switching sections
-            if current_section == "PROJECTS" and current_project:
-                data['projects'].append(' '.join(current_project))
-                current_project = []
-            elif current_section in ["EXPERIENCE", "WORK EXPERIENCE"] and current_experience:
-                data['experience'].append(' '.join(current_experience))
-                current_experience = []
-            elif current_section == "EDUCATION" and current_education:
-                data['education'].append(' '.join(current_education))
-                current_education = []
-            
-            current_section = line.upper()
-            continue
-            
-        # Extract name (first non-empty line that's not a section header)
-        if not data['name'] and current_section == "" and line and not line.upper() in ['EDUCATION', 'SKILLS', 'EXPERIENCE', 'PROJECTS', 'CERTIFICATIONS']:
-            data['name'] = line
-            continue
-            
-        # Extract email
-        if '@' in line and '.' in line:
-            email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', line)
-            if email_match:
-                data['email'] = email_match.group()
-                
-        # Extract phone
-        phone_match = re.search(r'[\+]?[1-9][\d]{0,15}', line)
-        if phone_match and len(phone_match.group()) >= 10:
-            data['phone'] = phone_match.group()
-            
-        # Extract content based on current section
-        if current_section == "EDUCATION":
-            # Check if this looks like a new education entry (contains degree keywords or dates)
-            if any(keyword in line.lower() for keyword in ['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'school', '202', '201', '2020', '2021', '2022', '2023', '2024']):
-                if current_education:  # Save previous education entry
-                    data['education'].append(' '.join(current_education))
-                    current_education = []
-            current_education.append(line)
-            
-        elif current_section == "SKILLS":
-            data['skills'].append(line)
-            
-        elif current_section in ["EXPERIENCE", "WORK EXPERIENCE"]:
-            # Check if this looks like a new job entry (contains job keywords or dates)
-            if any(keyword in line.lower() for keyword in ['202', '202', '201', 'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']) or \
-               any(keyword in line.lower() for keyword in ['engineer', 'developer', 'manager', 'analyst', 'specialist', 'coordinator', 'intern', 'associate']):
-                if current_experience:  # Save previous experience entry
-                    data['experience'].append(' '.join(current_experience))
-                    current_experience = []
-            current_experience.append(line)
-            
-        elif current_section == "PROJECTS":
-            # Detect new project: Look for project titles (short lines without bullet points)
-            # or lines that end with | or : which typically indicate project names
-            is_new_project = False
-            
-            # Check if it's a project title (not a bullet point)
-            if not (line.startswith('•') or line.startswith('-') or line.startswith('*') or line.startswith('○')):
-                # Check if it looks like a title (ends with | or :, or contains "Project" keyword)
-                if (line.endswith('|') or line.endswith(':') or 
-                    ('project' in line.lower() and len(line) < 80)):
-                    is_new_project = True
-            
-            if is_new_project and current_project:
-                # Save previous project
-                data['projects'].append(' '.join(current_project))
-                current_project = []
-            
-            current_project.append(line)
-            
-        elif current_section == "CERTIFICATIONS":
-            data['certifications'].append(line)
-    
-    # Save any remaining entries
-    if current_project:
-        data['projects'].append(' '.join(current_project))
-    if current_experience:
-        data['experience'].append(' '.join(current_experience))
-    if current_education:
-        data['education'].append(' '.join(current_education))
-    
-    return data
-
-def get_job_description_by_title(job_title):
-    """Auto-generate job description and skills based on job title"""
-    job_templates = {
-        "software engineer": {
-            "description": """We are seeking a talented Software Engineer to join our dynamic team. You will be responsible for designing, developing, and maintaining software applications. The ideal candidate should have strong programming skills, experience with modern development frameworks, and a passion for creating high-quality code.
-
-Key Responsibilities:
-• Design and develop scalable software solutions
-• Collaborate with cross-functional teams
-• Write clean, maintainable code
-• Participate in code reviews and technical discussions
-• Debug and resolve software issues
-• Stay updated with latest technologies and best practices""",
-            "skills": ["Python", "JavaScript", "Java", "React", "Node.js", "SQL", "Git", "Docker", "AWS", "REST APIs"]
-        },
-        "data scientist": {
-            "description": """We are looking for a Data Scientist to help us extract insights from complex data sets. You will work on machine learning models, statistical analysis, and data visualization to drive business decisions.
-
-Key Responsibilities:
-• Develop and implement machine learning models
-• Perform statistical analysis and data mining
-• Create data visualizations and reports
-• Collaborate with stakeholders to understand business needs
-• Optimize model performance and accuracy
-• Present findings to technical and non-technical audiences""",
-            "skills": ["Python", "R", "SQL", "Machine Learning", "Statistics", "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "Data Visualization"]
-        },
-        "frontend developer": {
-            "description": """We are seeking a Frontend Developer to create engaging user interfaces and experiences. You will work with modern web technologies to build responsive and accessible applications.
-
-Key Responsibilities:
-• Develop responsive web applications
-• Implement user interface designs
-• Optimize application performance
-• Ensure cross-browser compatibility
-• Collaborate with designers and backend developers
-• Write clean, maintainable code""",
-            "skills": ["HTML", "CSS", "JavaScript", "React", "Vue.js", "Angular", "TypeScript", "SASS", "Webpack", "Responsive Design"]
-        },
-        "backend developer": {
-            "description": """We are looking for a Backend Developer to build robust server-side applications and APIs. You will work on scalable architectures and database design.
-
-Key Responsibilities:
-• Design and develop server-side applications
-• Create and maintain RESTful APIs
-• Design and optimize databases
-• Implement security best practices
-• Monitor and optimize application performance
-• Collaborate with frontend developers""",
-            "skills": ["Python", "Java", "Node.js", "SQL", "MongoDB", "Redis", "Docker", "AWS", "REST APIs", "Microservices"]
-        },
-        "devops engineer": {
-            "description": """We are seeking a DevOps Engineer to streamline our development and deployment processes. You will work on infrastructure automation and CI/CD pipelines.
-
-Key Responsibilities:
-• Design and maintain CI/CD pipelines
-• Manage cloud infrastructure
-• Automate deployment processes
-• Monitor system performance and security
-• Implement infrastructure as code
-• Collaborate with development teams""",
-            "skills": ["Docker", "Kubernetes", "AWS", "Jenkins", "Terraform", "Linux", "Bash", "Python", "Git", "Monitoring"]
-        },
-        "product manager": {
-            "description": """We are looking for a Product Manager to drive product strategy and development. You will work with cross-functional teams to deliver successful products.
-
-Key Responsibilities:
-• Define product strategy and roadmap
-• Gather and prioritize product requirements
-• Work with development teams to deliver features
-• Analyze market trends and competition
-• Collaborate with stakeholders
-• Measure product success metrics""",
-            "skills": ["Product Strategy", "Market Research", "Agile", "User Research", "Data Analysis", "SQL", "Python", "A/B Testing", "Product Analytics", "JIRA", "Confluence"]
-        },
-        "ui/ux designer": {
-            "description": """We are seeking a UI/UX Designer to create intuitive and engaging user experiences. You will work on user research, wireframing, and visual design.
-
-Key Responsibilities:
-• Conduct user research and usability testing
-• Create wireframes and prototypes
-• Design user interfaces and experiences
-• Collaborate with developers and product managers
-• Create design systems and style guides
-• Iterate designs based on user feedback""",
-            "skills": ["Figma", "Adobe Creative Suite", "Sketch", "InVision", "HTML", "CSS", "JavaScript", "Prototyping", "Design Systems", "User Research", "Wireframing", "Usability Testing"]
-        },
-        "machine learning engineer": {
-            "description": """We are looking for a Machine Learning Engineer to develop and deploy machine learning models. You will work on data preprocessing, model training, and production deployment.
-
-Key Responsibilities:
-• Develop and implement machine learning models
-• Preprocess and analyze large datasets
-• Deploy models to production environments
-• Optimize model performance and accuracy
-• Collaborate with data scientists and engineers
-• Maintain and monitor ML pipelines""",
-            "skills": ["Python", "TensorFlow", "PyTorch", "Scikit-learn", "SQL", "Docker", "AWS", "MLOps", "Data Preprocessing", "Model Deployment", "Statistics", "Deep Learning"]
-        },
-        "cybersecurity analyst": {
-            "description": """We are seeking a Cybersecurity Analyst to protect our systems and data from security threats. You will monitor security systems and respond to incidents.
-
-Key Responsibilities:
-• Monitor security systems and networks
-• Investigate security incidents and threats
-• Implement security controls and policies
-• Conduct vulnerability assessments
-• Respond to security breaches
-• Maintain security documentation""",
-            "skills": ["SIEM", "Wireshark", "Nmap", "Metasploit", "Python", "Linux", "Network Security", "Incident Response", "Vulnerability Assessment", "Security Tools", "Firewall Management"]
-        },
-        "cloud engineer": {
-            "description": """We are looking for a Cloud Engineer to design and manage cloud infrastructure. You will work on cloud migration, automation, and optimization.
-
-Key Responsibilities:
-• Design and implement cloud architectures
-• Manage cloud infrastructure and services
-• Automate deployment and scaling processes
-• Monitor cloud performance and costs
-• Implement security best practices
-• Support cloud migration projects""",
-            "skills": ["AWS", "Azure", "GCP", "Terraform", "Docker", "Kubernetes", "CI/CD", "Python", "Bash", "Infrastructure as Code", "Cloud Security", "Monitoring"]
-        }
-    }
-    
-    # Find the best match for the job title
-    job_title_lower = job_title.lower()
-    for key, value in job_templates.items():
-        if key in job_title_lower or job_title_lower in key:
-            return value["description"], value["skills"]
-    
-    # Default template for unknown job titles
-    return """We are seeking a talented professional to join our team. The ideal candidate should have relevant experience and skills in their field.
-
-Key Responsibilities:
-• Perform assigned duties and responsibilities
-• Collaborate with team members
-• Meet project deadlines and goals
-• Continuously improve skills and knowledge
-• Contribute to team success""", ["Technical Analysis", "Problem Solving", "Data Analysis", "Project Management", "System Design"]
-
-def calculate_selection_probability(resume_data, job_requirements, gaps):
-    """Calculate the probability of being selected for the job"""
-    score = 100
-    
-    # Skills match (40% weight)
-    skills_match_percentage = max(0, 100 - (len(gaps['missing_skills']) * 10))
-    score -= (100 - skills_match_percentage) * 0.4
-    
-    # Experience quality (30% weight)
-    if gaps['weak_experience']:
-        score -= 20 * 0.3
-    else:
-        score += 10 * 0.3
-    
-    # Education match (15% weight)
-    if gaps['education_gaps']:
-        score -= 15 * 0.15
-    else:
-        score += 5 * 0.15
-    
-    # Projects quality (15% weight)
-    if gaps['project_gaps']:
-        score -= 15 * 0.15
-    else:
-        score += 5 * 0.15
-    
-    # Bonus for having certifications
-    if resume_data['certifications']:
-        score += 5
-    
-    return max(0, min(100, score))
-
-def generate_honest_review(resume_data, job_requirements, gaps, selection_probability):
-    """Generate an honest review of the resume"""
-    review = "🔍 **Honest Resume Review:**\n\n"
-    
-    # Overall assessment
-    if selection_probability >= 80:
-        review += "🎯 **Overall Assessment: Strong Candidate**\n"
-        review += "Your resume shows strong alignment with the job requirements. You have a good chance of being selected.\n\n"
-    elif selection_probability >= 60:
-        review += "📈 **Overall Assessment: Good Candidate**\n"
-        review += "Your resume is competitive but has some areas for improvement. With some enhancements, you could be a strong candidate.\n\n"
-    elif selection_probability >= 40:
-        review += "⚠️ **Overall Assessment: Needs Improvement**\n"
-        review += "Your resume needs significant improvements to be competitive for this position.\n\n"
-    else:
-        review += "❌ **Overall Assessment: Not Ready**\n"
-        review += "Your resume is not well-aligned with this job. Consider applying for positions that better match your current skills.\n\n"
-    
-    # Strengths
-    strengths = []
-    if not gaps['missing_skills']:
-        strengths.append("Strong skill match")
-    if not gaps['weak_experience']:
-        strengths.append("Good experience descriptions")
-    if not gaps['project_gaps']:
-        strengths.append("Relevant projects")
-    if resume_data['certifications']:
-        strengths.append("Professional certifications")
-    
-    if strengths:
-        review += "✅ **Strengths:**\n"
-        for strength in strengths:
-            review += f"• {strength}\n"
-        review += "\n"
-    
-    # Areas for improvement
-    improvements = []
-    if gaps['missing_skills']:
-        improvements.append(f"Missing key skills: {', '.join(gaps['missing_skills'][:3])}")
-    if gaps['weak_experience']:
-        improvements.append("Experience section needs strengthening")
-    if gaps['education_gaps']:
-        improvements.append("Education requirements not fully met")
-    if gaps['project_gaps']:
-        improvements.append("Need more relevant projects")
-    
-    if improvements:
-        review += "🔧 **Areas for Improvement:**\n"
-        for improvement in improvements:
-            review += f"• {improvement}\n"
-        review += "\n"
-    
-    # Selection probability
-    review += f"📊 **Selection Probability: {selection_probability:.1f}%**\n"
-    if selection_probability >= 80:
-        review += "🎉 High chance of being selected!"
-    elif selection_probability >= 60:
-        review += "👍 Good chance with some improvements"
-    elif selection_probability >= 40:
-        review += "⚠️ Moderate chance, needs work"
-    else:
-        review += "💡 Consider other opportunities or significant improvements"
-    
-    return review
-
-def analyze_resume_gaps(resume_data, job_description, job_requirements):
-    """Analyze gaps between resume and job requirements"""
-    gaps = {
-        'missing_skills': [],
-        'weak_experience': [],
-        'education_gaps': [],
-        'project_gaps': [],
-        'suggestions': []
-    }
-    
-    # Analyze skills
-    resume_skills = ' '.join(resume_data['skills']).lower()
-    for skill in job_requirements.get('skills', []):
-        if skill.lower() not in resume_skills:
-            gaps['missing_skills'].append(skill)
-    
-    # Analyze experience
-    if job_requirements.get('min_experience', 0) > 0:
-        experience_text = ' '.join(resume_data['experience']).lower()
-        experience_keywords = ['years', 'experience', 'worked', 'developed', 'managed']
-        experience_indicators = sum(1 for keyword in experience_keywords if keyword in experience_text)
-        
-        if experience_indicators < 3:
-            gaps['weak_experience'].append(f"Add more detailed work experience descriptions")
-    
-    # Analyze education
-    education_text = ' '.join(resume_data['education']).lower()
-    required_education = job_requirements.get('education_level', '').lower()
-    
-    if required_education == "bachelor's" and 'bachelor' not in education_text:
-        gaps['education_gaps'].append("Consider adding Bachelor's degree or equivalent")
-    elif required_education == "master's" and 'master' not in education_text:
-        gaps['education_gaps'].append("Consider adding Master's degree or equivalent")
-    
-    # Analyze projects
-    if len(resume_data['projects']) < 2:
-        gaps['project_gaps'].append("Add more relevant projects to showcase practical skills")
-    
-    return gaps
-
-def generate_improvement_suggestions(resume_data, job_description, gaps):
-    """Generate personalized improvement suggestions"""
-    suggestions = []
-    
-    # Skills suggestions
-    if gaps['missing_skills']:
-        suggestions.append({
-            'category': 'Skills',
-            'priority': 'High',
-            'suggestion': f"Add these missing skills: {', '.join(gaps['missing_skills'])}",
-            'action': "Consider taking online courses or adding relevant projects that demonstrate these skills"
-        })
-    
-    # Experience suggestions
-    if gaps['weak_experience']:
-        suggestions.append({
-            'category': 'Experience',
-            'priority': 'High',
-            'suggestion': "Strengthen your work experience section",
-            'action': "Add quantifiable achievements, use action verbs, and include specific technologies used"
-        })
-    
-    # Education suggestions
-    if gaps['education_gaps']:
-        suggestions.append({
-            'category': 'Education',
-            'priority': 'Medium',
-            'suggestion': gaps['education_gaps'][0],
-            'action': "Highlight relevant coursework or certifications that demonstrate required knowledge"
-        })
-    
-    # Project suggestions
-    if gaps['project_gaps']:
-        suggestions.append({
-            'category': 'Projects',
-            'priority': 'Medium',
-            'suggestion': "Add more relevant projects",
-            'action': "Create projects that showcase the required skills and technologies"
-        })
-    
-    # General suggestions
-    if not resume_data['certifications']:
-        suggestions.append({
-            'category': 'Certifications',
-            'priority': 'Low',
-            'suggestion': "Consider adding relevant certifications",
-            'action': "Look for industry-recognized certifications in your field"
-        })
-    
-    return suggestions
-
-def chatbot_response(user_message, resume_data, job_description, job_requirements):
-    """Generate enhanced chatbot response with AI features"""
-    
-    # Initialize AI analyzer
-    # if 'ai_analyzer' not in st.session_state:
-    #     st.session_state.ai_analyzer = FreeAIAnalyzer()  # Temporarily disabled
-    
-    # Analyze resume gaps
-    gaps = analyze_resume_gaps(resume_data, job_description, job_requirements)
-    suggestions = generate_improvement_suggestions(resume_data, job_description, gaps)
-    selection_probability = calculate_selection_probability(resume_data, job_requirements, gaps)
-    
-    # Get AI-powered analysis
-    # ai_analysis = st.session_state.ai_analyzer.advanced_resume_analysis(
-    #     ' '.join([str(v) for v in resume_data.values() if isinstance(v, (str, list))]),
-    #     job_description
-    # )
-    ai_analysis = {'similarity_score': 0, 'missing_keywords': [], 'strengths': [], 'improvements': []}
-    
-    # Try AI-powered response first (Temporarily disabled)
-    # try:
-    #     ai_response = st.session_state.ai_analyzer.enhanced_chatbot_response(
-    #         user_message, resume_data, job_requirements
-    #     )
-    #     
-    #     # Add AI insights
-    #     ai_insights = st.session_state.ai_analyzer.generate_ai_insights(resume_data, job_requirements)
-    #     
-    #     # Combine AI response with insights
-    #     enhanced_response = f"{ai_response}\n\n"
-    #     if ai_insights:
-    #         enhanced_response += "🎯 **AI Insights:**\n"
-    #         for insight in ai_insights[:3]:
-    #             enhanced_response += f"• {insight}\n"
-    #     
-    #     return enhanced_response
-    #     
-    # except Exception as e:
-    #     st.warning(f"AI response failed: {str(e)}")
-    #     # Fallback to original logic
-    
-    # Common user questions and responses (fallback)
-    if "improve" in user_message.lower() or "better" in user_message.lower():
-        response = "🔍 **Enhanced Resume Analysis:**\n\n"
-        
-        # Add AI analysis results
-        response += f"📊 **AI Similarity Score: {ai_analysis['similarity_score']:.1f}%**\n\n"
-        
-        if ai_analysis['missing_keywords']:
-            response += f"⚠️ **Missing Keywords:** {', '.join(ai_analysis['missing_keywords'][:5])}\n\n"
-        
-        if ai_analysis['strengths']:
-            response += "✅ **Strengths:**\n"
-            for strength in ai_analysis['strengths']:
-                response += f"• {strength}\n"
-            response += "\n"
-        
-        if ai_analysis['improvements']:
-            response += "🔧 **AI Suggestions:**\n"
-            for improvement in ai_analysis['improvements']:
-                response += f"• {improvement}\n"
-            response += "\n"
-        
-        if suggestions:
-            response += "**Priority Improvements:**\n"
-            for suggestion in suggestions[:3]:  # Top 3 suggestions
-                priority_emoji = "🔴" if suggestion['priority'] == 'High' else "🟡" if suggestion['priority'] == 'Medium' else "🟢"
-                response += f"{priority_emoji} **{suggestion['category']}**: {suggestion['suggestion']}\n"
-                response += f"   💡 *Action*: {suggestion['action']}\n\n"
-        else:
-            response += "✅ Your resume looks well-aligned with the job requirements!\n\n"
-        
-        return response
-    
-    elif "selected" in user_message.lower() or "chance" in user_message.lower() or "probability" in user_message.lower():
-        honest_review = generate_honest_review(resume_data, job_requirements, gaps, selection_probability)
-        return honest_review
-    
-    elif "honest" in user_message.lower() or "review" in user_message.lower():
-        honest_review = generate_honest_review(resume_data, job_requirements, gaps, selection_probability)
-        return honest_review
-    
-    elif "skills" in user_message.lower():
-        if gaps['missing_skills']:
-            response = "🎯 **Skills Analysis:**\n\n"
-            response += f"**Missing Skills**: {', '.join(gaps['missing_skills'])}\n\n"
-            response += "**Recommendations:**\n"
-            response += "• Take online courses (Coursera, Udemy, edX)\n"
-            response += "• Work on personal projects using these technologies\n"
-            response += "• Add relevant certifications to your resume\n"
-            response += "• Include these skills in your projects section\n"
-        else:
-            response = "✅ **Skills Analysis:** Your skills match well with the job requirements!"
-        return response
-    
-    elif "experience" in user_message.lower():
-        response = "💼 **Experience Analysis:**\n\n"
-        if gaps['weak_experience']:
-            response += "**Areas for Improvement:**\n"
-            response += "• Add quantifiable achievements (e.g., 'Increased efficiency by 25%')\n"
-            response += "• Use strong action verbs (Developed, Implemented, Managed)\n"
-            response += "• Include specific technologies and tools used\n"
-            response += "• Add metrics and results where possible\n"
-        else:
-            response += "✅ Your experience section looks strong!"
-        return response
-    
-    elif "projects" in user_message.lower():
-        response = "🚀 **Projects Analysis:**\n\n"
-        if gaps['project_gaps']:
-            response += "**Recommendations:**\n"
-            response += "• Add 2-3 relevant projects that showcase required skills\n"
-            response += "• Include GitHub links and live demos if available\n"
-            response += "• Describe the technologies used and your role\n"
-            response += "• Highlight problem-solving and technical skills\n"
-        else:
-            response += "✅ Your projects section looks good!"
-        return response
-    
-    elif "help" in user_message.lower() or "what" in user_message.lower():
-        response = "📊 **ResumePro Career Advisor**\n\n"
-        response += "I can help you improve your resume! Ask me about:\n\n"
-        response += "• **'How can I improve my resume?'** - Get overall suggestions\n"
-        response += "• **'Will I be selected?'** - Check selection probability\n"
-        response += "• **'Give me an honest review'** - Get detailed feedback\n"
-        response += "• **'Analyze my skills'** - Check skill gaps\n"
-        response += "• **'Review my experience'** - Experience section tips\n"
-        response += "• **'Check my projects'** - Project section advice\n\n"
-        response += "Just type your question and I'll provide personalized advice! 💡"
-        return response
-    
-    else:
-        # Default response with general tips
-        response = "💡 **General Resume Tips:**\n\n"
-        response += "• **Tailor your resume** to match the job description\n"
-        response += "• **Use keywords** from the job posting\n"
-        response += "• **Quantify achievements** with numbers and metrics\n"
-        response += "• **Keep it concise** (1-2 pages maximum)\n"
-        response += "• **Proofread carefully** for errors\n\n"
-        response += "Ask me specific questions like 'Will I be selected?' or 'Give me an honest review' for detailed feedback! 🎯"
-        return response
-#jo user upload krta vo memory me hoti h use computr me temp file banate hai wb->write binary (binary mode me file banata hai)
+# Import the analysis engine
+from analysis import (
+    extract_resume_data, match_job_template,
+    analyze_resume, chatbot_response_stream
+)
+from analysis.role_scorer import rank_best_fit_roles
+from analysis.similarity import semantic_analysis
+from analysis.skill_matcher import resume_text
+from embedding_cache import get_similarity_engine
+from chat_history import ChatHistory
+from session_cache import cached, invalidate, RESUMES, APPLICATIONS
+from write_queue import get_write_queue, queue_save_resume, queue_save_analysis
+from blob_store import store_resume_file
+from search import search_user_content
+from metrics import start_metrics_server, timed, touch_session
+from rerun_profiler import start_rerun
+from config import PROFILER_CONFIG
+
+#jo user upload krta vo memory me hoti h use blob store me save karte hai (same file dobara upload ho to ek hi copy rehti hai)
+@timed('process_resume_file')
 def process_resume_file(uploaded_file):
-    """Process uploaded resume file"""
+    """Store the uploaded resume file and extract its text; returns (raw_text, blob_hash, file_path)"""
     try:
-        # Create a temporary file
-        with open(f"temp_{uploaded_file.name}", "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        
-        file_path = f"temp_{uploaded_file.name}"
-        
-        # Extract text based on file type
-        if uploaded_file.name.endswith(".pdf"):
-            raw_text = extract_text_from_pdf(file_path)
-        elif uploaded_file.name.endswith(".docx"):
-            raw_text = extract_text_from_docx(file_path)
-        else:
+        file_type = uploaded_file.name.split('.')[-1].lower()
+        if file_type not in ('pdf', 'docx'):
             raise ValueError("Unsupported file format. Please upload PDF or DOCX files.")
         
-        # Clean up temporary file
-        os.remove(file_path)
+        # Keep the original file (content-addressed, written atomically)
+        blob_hash, file_path = store_resume_file(uploaded_file.getbuffer())
+        
+        # Extract text from the stored copy
+        raw_text = extract_text_from_blob(blob_hash, file_type)
         
-        return raw_text
+        return raw_text, blob_hash, file_path
         
     except Exception as e:
         st.error(f"Error processing {uploaded_file.name}: {str(e)}")
-        return None
+        return None, None, None
+
+def render_stream(chunks):
+    """Render response chunks as they arrive and return the full text"""
+    if hasattr(st, 'write_stream'):
+        return st.write_stream(chunks)
+    # Streamlit < 1.31 has no write_stream: redraw a placeholder with the text so far
+    placeholder = st.empty()
+    response = ""
+    for chunk in chunks:
+        response += chunk
+        placeholder.markdown(response + "▌")
+    placeholder.markdown(response)
+    return response
+
+def finish_rerun():
+    """End this rerun's profile and show its section timings to admins"""
+    timings = rerun_profiler.finish()
+    if timings and PROFILER_CONFIG['overlay'] and st.session_state.get('user', {}).get('role') == 'admin':
+        sections = ' · '.join(f"{name} {seconds * 1000:.0f} ms"
+                              for name, seconds in sorted(timings['sections'], key=lambda s: s[1], reverse=True))
+        dump = f" — profile {os.path.basename(timings['dump'])}" if timings['dump'] else ''
+        st.sidebar.caption(f"⏱️ Rerun {timings['total'] * 1000:.0f} ms: {sections}{dump}")
+
+def stop_rerun():
+    """Finish the rerun profile, then stop rendering the rest of the page"""
+    finish_rerun()
+    st.stop()
+
+def rerun_page():
+    """Finish the rerun profile, then rerun the script (st.rerun() raises, so nothing after it runs)"""
+    finish_rerun()
+    st.rerun()
 
 # Streamlit UI
 st.set_page_config(page_title="ResumePro Analyzer", page_icon="📊", layout="wide")
 
+# Metrics endpoint (no-op unless METRICS_ENABLED); every rerun marks its session active
+start_metrics_server()
+session_id = st.session_state.setdefault('_session_id', secrets.token_hex(8))
+touch_session(session_id)
+
+# Section timings for this rerun (no-op unless PROFILE_RERUNS)
+rerun_profiler = start_rerun(session_id)
+rerun_profiler.section("setup")
+
 # ============================================================================
 # AUTHENTICATION CHECK
 # ============================================================================
@@ -654,7 +128,7 @@ def show_login_page():
                     if success:
                         st.session_state['user'] = result
                         st.success("✅ Login successful!")
-                        st.rerun()
+                        rerun_page()
                     else:
                         st.error(f"❌ {result}")
     
@@ -684,30 +158,52 @@ def show_login_page():
                         st.error(f"❌ {message}")
 
 # Check if user is authenticated
+rerun_profiler.section("auth")
 if not check_authentication():
     show_login_page()
-    st.stop()
+    stop_rerun()
+
+# Check on resume/analysis saves queued by earlier runs (written in the background)
+rerun_profiler.section("pending writes")
+if st.session_state.get('pending_writes'):
+    write_queue = get_write_queue()
+    for job_id in list(st.session_state.pending_writes):
+        job_status, result, error = write_queue.status(job_id)
+        if job_status in ('pending', 'running'):
+            continue
+        st.session_state.pending_writes.remove(job_id)
+        invalidate(RESUMES)
+        if job_id == st.session_state.get('current_resume_job'):
+            del st.session_state['current_resume_job']
+            if job_status == 'done':
+                st.session_state.current_resume_id = result
+        if job_status != 'done':
+            st.warning(f"⚠️ A save could not be completed: {error or 'unknown job'}")
 
 # User is authenticated - show logout button in sidebar
+rerun_profiler.section("sidebar")
 with st.sidebar:
     st.write(f"**👤 {st.session_state['user']['full_name']}**")
     st.write(f"_{st.session_state['user']['email']}_")
     if st.button("🚪 Logout", use_container_width=True):
+        if 'chat_history' in st.session_state:
+            st.session_state.chat_history.flush()
+            del st.session_state['chat_history']
         logout_user(st.session_state['user']['session_token'])
         del st.session_state['user']
-        st.rerun()
+        invalidate()
+        rerun_page()
     st.divider()
     
     # Show user statistics
     st.subheader("📊 Your Stats")
     user_id = st.session_state['user']['user_id']
     
-    # Resume stats
-    resumes = get_user_resumes(user_id)
-    st.metric("Resumes", len(resumes))
+    # Resume stats (served from the session cache until a write invalidates them)
+    st.metric("Resumes", cached(RESUMES, count_user_resumes, user_id))
     
     # Job application stats
-    app_stats = get_application_statistics(user_id)
+    app_stats = cached(APPLICATIONS, get_application_statistics, user_id)
     if app_stats:
         st.metric("Applications", app_stats['total_applications'])
         st.metric("Success Rate", f"{app_stats['success_rate']:.1f}%")
@@ -720,16 +216,26 @@ with st.sidebar:
     if st.button("📄 My Resumes", use_container_width=True):
         st.session_state.show_resumes = True
         st.session_state.show_jobs = False
-        st.rerun()
+        st.session_state.show_recruiter = False
+        rerun_page()
     
     if st.button("💼 Job Tracker", use_container_width=True):
         st.session_state.show_jobs = True
         st.session_state.show_resumes = False
-        st.rerun()
+        st.session_state.show_recruiter = False
+        rerun_page()
+    
+    if st.session_state['user'].get('role') in ('recruiter', 'admin'):
+        if st.button("🧑‍💼 Recruiter Mode", use_container_width=True):
+            st.session_state.show_recruiter = True
+            st.session_state.show_resumes = False
+            st.session_state.show_jobs = False
+            rerun_page()
     
     st.divider()
 
 # Custom CSS for better styling
+rerun_profiler.section("header")
 st.markdown("""
 <style>
     .main-header {
@@ -781,11 +287,29 @@ st.markdown('<div class="main-header"><h1>🤖 ResumePro AI Analyzer</h1><p>Enha
 # SHOW RESUME HISTORY OR JOB TRACKER IF REQUESTED
 # ============================================================================
 if st.session_state.get('show_resumes', False):
+    rerun_profiler.section("resume history page")
+    import pandas as pd
+    
     st.markdown("---")
     st.header("📄 My Resume History")
     
     user_id = st.session_state['user']['user_id']
-    resumes = get_user_resumes(user_id)
+    resumes = cached(RESUMES, get_user_resumes, user_id)
+    
+    # Selection probability over time, one line per job title
+    trends = cached(RESUMES, get_resume_improvement_trends, user_id)
+    if trends:
+        st.subheader("📈 Improvement Trends")
+        trends_df = pd.DataFrame(trends)
+        chart_df = trends_df.pivot_table(index='analyzed_at', columns='job_title',
+                                         values='selection_probability', aggfunc='last')
+        st.line_chart(chart_df)
+    
+        latest = trends_df.groupby('job_title').tail(1).set_index('job_title')
+        trend_cols = st.columns(min(len(latest), 4))
+        for i, (title, row) in enumerate(latest.head(4).iterrows()):
+            delta = f"{row['delta']:+.1f}%" if pd.notna(row['delta']) else None
+            trend_cols[i].metric(title, f"{row['selection_probability']:.1f}%", delta)
     
     if resumes:
         for resume in resumes:
@@ -795,9 +319,19 @@ if st.session_state.get('show_resumes', False):
                 col2.metric("Analyses", resume['analysis_count'])
                 col3.metric("Size", f"{resume['file_size'] / 1024:.1f} KB")
                 
+                # Re-uploads under the same name are stored as versions of this resume
+                if resume['version_count'] > 1:
+                    st.subheader("Versions")
+                    versions = cached(RESUMES, get_resume_versions, resume['resume_id'])
+                    st.dataframe(pd.DataFrame([{
+                        'Version': v['version_number'],
+                        'Changes': v['changes_description'],
+                        'Date': v['created_at']
+                    } for v in versions]), use_container_width=True, hide_index=True)
+                
                 # Show analysis history
                 st.subheader("Analysis History")
-                history = get_analysis_history(resume['resume_id'])
+                history = cached(RESUMES, get_analysis_history, resume['resume_id'])
                 if history:
                     history_data = []
                     for h in history:
@@ -809,16 +343,29 @@ if st.session_state.get('show_resumes', False):
                     st.dataframe(pd.DataFrame(history_data), use_container_width=True, hide_index=True)
                 else:
                     st.info("No analysis history yet")
+                
+                if st.button("🗑️ Delete Resume", key=f"delete_resume_{resume['resume_id']}"):
+                    success, msg = delete_resume(resume['resume_id'], user_id)
+                    if success:
+                        invalidate(RESUMES)
+                        if st.session_state.get('current_resume_id') == resume['resume_id']:
+                            st.session_state.pop('current_resume_id', None)
+                        rerun_page()
+                    else:
+                        st.error(f"❌ {msg}")
     else:
         st.info("No resumes uploaded yet. Upload your first resume below!")
     
     if st.button("❌ Close Resume History", use_container_width=True):
         st.session_state.show_resumes = False
-        st.rerun()
+        rerun_page()
     
-    st.stop()  # Stop rendering the rest of the page
+    stop_rerun()  # Stop rendering the rest of the page
 
 if st.session_state.get('show_jobs', False):
+    rerun_profiler.section("job tracker page")
+    import pandas as pd
+    
     st.markdown("---")
     st.header("💼 Job Application Tracker")
     
@@ -834,7 +381,7 @@ if st.session_state.get('show_jobs', False):
                 job_url = st.text_input("Job URL")
             with col2:
                 application_date = st.date_input("Application Date", value=date.today())
-                status = st.selectbox("Status", ["Applied", "Interview", "Offer", "Rejected"])
+                status = st.selectbox("Status", APPLICATION_STATUSES)
                 location = st.text_input("Location")
             
             notes = st.text_area("Notes")
@@ -852,69 +399,185 @@ if st.session_state.get('show_jobs', False):
                     }
                     success, app_id, msg = add_job_application(user_id, app_data)
                     if success:
+                        invalidate(APPLICATIONS)
                         st.success(f"✅ {msg}")
-                        st.rerun()
+                        rerun_page()
                     else:
                         st.error(f"❌ {msg}")
                 else:
                     st.error("Company Name and Job Title are required")
     
     # Show statistics
-    app_stats = get_application_statistics(user_id)
+    app_stats = cached(APPLICATIONS, get_application_statistics, user_id)
     if app_stats and app_stats['total_applications'] > 0:
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("Total Applications", app_stats['total_applications'])
         col2.metric("Active", app_stats['active_applications'])
         col3.metric("Success Rate", f"{app_stats['success_rate']:.1f}%")
         col4.metric("Avg Days to Offer", f"{app_stats['avg_days_to_offer']:.0f}")
+        
+        # Funnel and time-in-stage from the status history (cached until a status changes)
+        funnel = cached(APPLICATIONS, get_application_funnel, user_id)
+        if funnel:
+            with st.expander("📊 Application Funnel", expanded=False):
+                fcol1, fcol2 = st.columns(2)
+                with fcol1:
+                    st.markdown("**Funnel**")
+                    funnel_df = pd.DataFrame(funnel['funnel']).set_index('stage')
+                    st.bar_chart(funnel_df['count'])
+                    for stage in funnel['funnel'][1:]:
+                        st.write(f"• {stage['stage']}: {stage['count']} ({stage['conversion']:.1f}% of previous stage)")
+                    st.write(f"• Rejected: {funnel['rejected']}")
+                with fcol2:
+                    st.markdown("**Median Days in Stage**")
+                    if funnel['time_in_stage']:
+                        st.dataframe(pd.DataFrame([{'Stage': stage, 'Median Days': days}
+                                                   for stage, days in funnel['time_in_stage'].items()]),
+                                     use_container_width=True, hide_index=True)
+                    else:
+                        st.info("No completed stages yet")
+                if len(funnel['by_company']) > 1:
+                    st.markdown("**By Company**")
+                    st.dataframe(pd.DataFrame(funnel['by_company']).rename(columns={
+                        'company': 'Company', 'applications': 'Applications', 'interview_rate': 'Interview %',
+                        'offer_rate': 'Offer %', 'median_days_per_stage': 'Median Days/Stage'
+                    }), use_container_width=True, hide_index=True)
+    
+    # Full-text search over applications (title, description, notes, company) and resumes
+    search_query = st.text_input("🔎 Search applications and resumes", placeholder="e.g. fintech backend role",
+                                 key="search_query")
+    if search_query.strip():
+        if st.session_state.get('search_last_query') != search_query:
+            st.session_state.search_last_query = search_query
+            st.session_state.search_page = 1
+        success, found, msg = search_user_content(user_id, search_query, st.session_state.search_page)
+        if not success:
+            st.error(f"❌ {msg}")
+        elif found['results']:
+            st.dataframe(pd.DataFrame([{
+                'Type': 'Resume' if hit['kind'] == 'resume' else 'Application',
+                'Title': hit['title'],
+                'Company': hit['subtitle'] or '',
+                'Status': hit['status'] or '',
+                'Date': hit['date']
+            } for hit in found['results']]), use_container_width=True, hide_index=True)
+            pcol1, pcol2, pcol3 = st.columns([1, 2, 1])
+            if pcol1.button("◀ Previous", disabled=found['page'] == 1, use_container_width=True):
+                st.session_state.search_page -= 1
+                rerun_page()
+            pcol2.caption(f"Page {found['page']}")
+            if pcol3.button("Next ▶", disabled=not found['has_more'], use_container_width=True):
+                st.session_state.search_page += 1
+                rerun_page()
+        else:
+            st.info("No matching applications or resumes")
     
-    # Show applications
+    # Show applications in one editable grid; status changes are saved together
     st.subheader("All Applications")
-    applications = get_user_applications(user_id)
+    applications = cached(APPLICATIONS, get_user_applications, user_id)
     
     if applications:
-        for app in applications:
-            with st.expander(f"{app['company_name']} - {app['job_title']} ({app['status']})", expanded=False):
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    st.write(f"**Status:** {app['status']}")
-                    st.write(f"**Applied:** {app['application_date']}")
-                    if app['location']:
-                        st.write(f"**Location:** {app['location']}")
-                    if app['notes']:
-                        st.write(f"**Notes:** {app['notes']}")
-                
-                with col2:
-                    new_status = st.selectbox(
-                        "Update Status",
-                        ["Applied", "Interview", "Offer", "Rejected"],
-                        index=["Applied", "Interview", "Offer", "Rejected"].index(app['status'])
-                        if app['status'] in ["Applied", "Interview", "Offer", "Rejected"] else 0,
-                        key=f"status_{app['application_id']}"
-                    )
-                    
-                    if st.button("Update", key=f"update_{app['application_id']}"):
-                        success, msg = update_application_status(
-                            app['application_id'],
-                            user_id,
-                            new_status
-                        )
-                        if success:
-                            st.success(msg)
-                            st.rerun()
-                        else:
-                            st.error(msg)
+        applications_df = pd.DataFrame([{
+            'Company': app['company_name'],
+            'Job Title': app['job_title'],
+            'Applied': app['application_date'],
+            'Location': app['location'] or '',
+            'Status': app['status'],
+            'Notes': app['notes'] or ''
+        } for app in applications], index=[app['application_id'] for app in applications])
+        
+        with st.form("applications_grid"):
+            edited_df = st.data_editor(
+                applications_df,
+                column_config={
+                    'Status': st.column_config.SelectboxColumn("Status", options=APPLICATION_STATUSES, required=True)
+                },
+                disabled=['Company', 'Job Title', 'Applied', 'Location', 'Notes'],
+                hide_index=True,
+                use_container_width=True,
+                key="applications_editor"
+            )
+            
+            if st.form_submit_button("💾 Save Status Changes", use_container_width=True):
+                changed = edited_df['Status'] != applications_df['Status']
+                changes = {int(app_id): status for app_id, status in edited_df.loc[changed, 'Status'].items()}
+                if changes:
+                    success, updated, msg = update_application_status_bulk(user_id, changes)
+                    if success:
+                        invalidate(APPLICATIONS)
+                        st.success(f"✅ {msg}")
+                        rerun_page()
+                    else:
+                        st.error(f"❌ {msg}")
+                else:
+                    st.info("No status changes to save")
     else:
         st.info("No job applications yet. Add your first application above!")
     
     if st.button("❌ Close Job Tracker", use_container_width=True):
         st.session_state.show_jobs = False
-        st.rerun()
+        rerun_page()
     
-    st.stop()  # Stop rendering the rest of the page
+    stop_rerun()  # Stop rendering the rest of the page
+
+if st.session_state.get('show_recruiter', False):
+    rerun_profiler.section("recruiter page")
+    import pandas as pd
+    from resume_index import rank_resumes_for_job, rebuild_resume_index
+    
+    st.markdown("---")
+    st.header("🧑‍💼 Recruiter Mode")
+    st.write("Rank every candidate's current resume against a job description.")
+    
+    recruiter_description = st.text_area(
+        "Job Description",
+        placeholder="Paste the full job description here...",
+        height=200,
+        key="recruiter_job_description"
+    )
+    top_k = st.number_input("Top Candidates", min_value=1, max_value=500, value=50)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        rank_clicked = st.button("🔍 Rank Resumes", type="primary", use_container_width=True)
+    with col2:
+        if st.button("♻️ Rebuild Index", use_container_width=True):
+            with st.spinner("Rebuilding resume index..."):
+                indexed = rebuild_resume_index()
+            st.success(f"✅ Indexed {indexed} resumes")
+    
+    if rank_clicked:
+        if not recruiter_description.strip():
+            st.error("Please enter a job description")
+        else:
+            ranked = rank_resumes_for_job(recruiter_description, int(top_k))
+            details = get_resumes_by_ids([resume_id for resume_id, _, _ in ranked])
+            rows = []
+            for rank, (resume_id, _, score) in enumerate(ranked, 1):
+                resume = details.get(resume_id)
+                if not resume:
+                    continue
+                rows.append({
+                    'Rank': rank,
+                    'Candidate': resume['full_name'],
+                    'Email': resume['email'],
+                    'Resume': resume['resume_name'],
+                    'Match': f"{score * 100:.1f}%",
+                    'Uploaded': resume['uploaded_at']
+                })
+            if rows:
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+            else:
+                st.info("No matching resumes found")
+    
+    if st.button("❌ Close Recruiter Mode", use_container_width=True):
+        st.session_state.show_recruiter = False
+        rerun_page()
+    
+    stop_rerun()  # Stop rendering the rest of the page
 
 # Main layout with better proportions
+rerun_profiler.section("job requirements")
 col1, col2, col3 = st.columns([2, 1, 2])
 
 # Left column - Job Description
@@ -926,9 +589,13 @@ with col1:
     
     # Auto-generate job description and skills based on job title
     if job_title and job_title.strip():
-        auto_description, auto_skills = get_job_description_by_title(job_title)
+        template_match = match_job_template(job_title)
+        auto_description, auto_skills = template_match['description'], template_match['skills']
         
-        st.info("✨ Auto-generated content based on job title. You can edit below:")
+        if template_match['title']:
+            st.info(f"✨ Auto-generated from the **{template_match['title'].title()}** template ({template_match['confidence'] * 100:.0f}% match). You can edit below:")
+        else:
+            st.info("✨ No close template found - using a general template. You can edit below:")
         
         job_description = st.text_area(
             "Job Description",
@@ -968,7 +635,21 @@ with col1:
         )
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Parse job requirements from the form
+skills = [skill.strip() for skill in re.split(r'[,\n]', skills_input) if skill.strip()]
+job_requirements = {
+    'skills': skills,
+    'min_experience': min_experience,
+    'education_level': education_level
+}
+
+# Keep an analyzed resume in step with the form so edits re-score without re-parsing
+if st.session_state.get('analyzed'):
+    st.session_state.job_description = job_description
+    st.session_state.job_requirements = job_requirements
+
 # Middle column - Upload and Analyze
+rerun_profiler.section("upload")
 with col2:
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.subheader("🤖 AI Features")
@@ -994,34 +675,32 @@ with col2:
                 st.error("Please enter a job description")
             else:
                 with st.spinner("Analyzing your resume..."):
-                    raw_text = process_resume_file(uploaded_file)
+                    raw_text, blob_hash, file_path = process_resume_file(uploaded_file)
                     
                     if raw_text:
                         # Extract resume data
                         resume_data = extract_resume_data(raw_text)
                         
-                        # Parse job requirements
-                        skills = [skill.strip() for skill in re.split(r'[,\n]', skills_input) if skill.strip()]
-                        job_requirements = {
-                            'skills': skills,
-                            'min_experience': min_experience,
-                            'education_level': education_level
-                        }
-                        
-                        # Save resume to database
+                        # Queue the resume save (written to the database in the background)
                         user_id = st.session_state['user']['user_id']
-                        success, resume_id, msg = save_resume(
+                        success, job_id, msg = queue_save_resume(
                             user_id=user_id,
                             resume_name=uploaded_file.name,
-                            file_path=f"uploads/{uploaded_file.name}",
+                            file_path=file_path,
                             file_size=uploaded_file.size,
-                            file_type=uploaded_file.name.split('.')[-1],
+                            file_type=uploaded_file.name.split('.')[-1].lower(),
                             raw_text=raw_text,
-                            extracted_data=resume_data
+                            extracted_data=resume_data,
+                            blob_hash=blob_hash
                         )
                         
                         if success:
-                            st.session_state.current_resume_id = resume_id
+                            st.session_state.current_resume_job = job_id
+                            st.session_state.setdefault('pending_writes', []).append(job_id)
+                            st.session_state.pop('current_resume_id', None)
+                            st.session_state.pop('analysis_saved', None)
+                        else:
+                            st.error(f"❌ {msg}")
                         
                         # Store in session state
                         st.session_state.resume_data = resume_data
@@ -1029,10 +708,11 @@ with col2:
                         st.session_state.job_requirements = job_requirements
                         st.session_state.analyzed = True
                         
-                        st.success("✅ Analysis complete! Resume saved to database.")
+                        st.success("✅ Analysis complete! Resume is being saved to your account.")
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Right column - Resume Summary
+rerun_profiler.section("summary column")
 with col3:
     if 'resume_data' in st.session_state and st.session_state.analyzed:
         resume_data = st.session_state.resume_data
@@ -1050,11 +730,13 @@ with col3:
         
         # Quick analysis
         if 'job_requirements' in st.session_state:
-            gaps = analyze_resume_gaps(resume_data, st.session_state.job_description, st.session_state.job_requirements)
-            selection_probability = calculate_selection_probability(resume_data, st.session_state.job_requirements, gaps)
+            analysis = analyze_resume(resume_data, st.session_state.job_description, st.session_state.job_requirements)
+            gaps = analysis['gaps']
+            selection_probability = analysis['selection_probability']
             
-            # Save analysis to database
-            if 'current_resume_id' in st.session_state and 'analysis_saved' not in st.session_state:
+            # Queue the analysis save; it may refer to a resume save that is still queued
+            has_resume = 'current_resume_id' in st.session_state or 'current_resume_job' in st.session_state
+            if has_resume and 'analysis_saved' not in st.session_state:
                 analysis_results = {
                     'selection_probability': selection_probability,
                     'missing_skills': gaps.get('missing_skills', []),
@@ -1063,13 +745,15 @@ with col3:
                     'suggestions': []
                 }
                 
-                save_analysis(
-                    resume_id=st.session_state.current_resume_id,
-                    version_id=None,
+                success, job_id, msg = queue_save_analysis(
                     job_title=st.session_state.get('job_title', 'Unknown'),
                     job_description=st.session_state.job_description,
-                    analysis_results=analysis_results
+                    analysis_results=analysis_results,
+                    resume_id=st.session_state.get('current_resume_id'),
+                    resume_job=st.session_state.get('current_resume_job')
                 )
+                if success:
+                    st.session_state.setdefault('pending_writes', []).append(job_id)
                 st.session_state.analysis_saved = True
             
             st.markdown("---")
@@ -1090,12 +774,22 @@ with col3:
                 st.warning(f"Missing skills: {', '.join(gaps['missing_skills'][:3])}")
             else:
                 st.success("✅ Skills match well!")
+            
+            # Best-fit roles across all job templates (plus the role being analyzed)
+            st.markdown("---")
+            st.subheader("🏆 Best-Fit Roles")
+            custom_roles = None
+            if st.session_state.get('job_title', '').strip():
+                custom_roles = {st.session_state.job_title.strip(): st.session_state.job_requirements['skills']}
+            for role in rank_best_fit_roles(resume_data, st.session_state.job_requirements, custom_roles):
+                st.markdown(f'<div class="metric-card"><strong>{role["title"].title()}:</strong> {role["selection_probability"]:.1f}% ({role["matched_skills"]}/{role["total_skills"]} skills)</div>', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
 # Full width sections below
 st.markdown("---")
 
 # Projects and Education Details
+rerun_profiler.section("details")
 if 'resume_data' in st.session_state and st.session_state.analyzed:
     resume_data = st.session_state.resume_data
     
@@ -1120,6 +814,7 @@ if 'resume_data' in st.session_state and st.session_state.analyzed:
             st.markdown('</div>', unsafe_allow_html=True)
 
 # Chatbot interface
+rerun_profiler.section("chat render")
 if 'analyzed' in st.session_state and st.session_state.analyzed:
     st.markdown('<div class="chat-container">', unsafe_allow_html=True)
     st.subheader("🤖 Chat with AI Career Advisor")
@@ -1130,26 +825,37 @@ if 'analyzed' in st.session_state and st.session_state.analyzed:
     else:
         st.info("ℹ️ Basic Analysis Mode - Standard rule-based responses")
     
-    # Initialize chat history
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-        # Add welcome message
+    # Load the latest chat turns for this user (older ones are paged in on request)
+    user_id = st.session_state['user']['user_id']
+    if "chat_history" not in st.session_state or st.session_state.chat_history.user_id != user_id:
+        st.session_state.chat_history = ChatHistory(user_id, st.session_state.get('current_resume_id')).load()
+    chat_history = st.session_state.chat_history
+    chat_history.resume_id = st.session_state.get('current_resume_id')
+    
+    if chat_history.has_earlier:
+        if st.button("⬆️ Load earlier messages"):
+            chat_history.load_earlier()
+            rerun_page()
+    elif chat_history.earlier:
+        if st.button("⬇️ Hide earlier messages"):
+            chat_history.hide_earlier()
+            rerun_page()
+    
+    # Welcome message at the start of the conversation
+    if not chat_history.has_earlier:
         welcome_msg = "🤖 Hi! I'm your AI Career Advisor powered by free AI models! I've analyzed your resume against the job description. Ask me anything about improving your resume! Try asking:\n\n• 'How can I improve my resume?'\n• 'Analyze my skills'\n• 'Review my experience'\n• 'What's missing?'\n• 'Give me AI insights'\n• 'What are trending skills?'"
-        
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": welcome_msg
-        })
+        with st.chat_message("assistant"):
+            st.markdown(welcome_msg)
     
-    # Display chat messages
-    for message in st.session_state.messages:
+    # Display chat messages (bounded window plus any pages loaded on request)
+    for message in chat_history.messages():
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
     # Chat input
     if prompt := st.chat_input("Ask me about improving your resume..."):
         # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        chat_history.append("user", prompt)
         
         # Display user message
         with st.chat_message("user"):
@@ -1157,16 +863,24 @@ if 'analyzed' in st.session_state and st.session_state.analyzed:
         
         # Generate and display assistant response
         with st.chat_message("assistant"):
-            response = chatbot_response(
+            ai_analysis = None
+            if enable_ai:
+                # Evaluated by the response generator only when a section needs it
+                resume_data = st.session_state.resume_data
+                job_description = st.session_state.job_description
+                ai_analysis = lambda: semantic_analysis(get_similarity_engine(), resume_text(resume_data),
+                                                        job_description)
+            chunks = chatbot_response_stream(
                 prompt,
                 st.session_state.resume_data,
                 st.session_state.job_description,
-                st.session_state.job_requirements
+                st.session_state.job_requirements,
+                ai_analysis
             )
-            st.markdown(response)
+            response = render_stream(chunks)
         
-        # Add assistant response to chat history
-        st.session_state.messages.append({"role": "assistant", "content": response})
+        # Add assistant response to chat history (written to the database once the turn is complete)
+        chat_history.append("assistant", response)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1176,6 +890,7 @@ else:
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Instructions in a subtle footer
+rerun_profiler.section("footer")
 st.markdown("---")
 st.markdown("""
 <div style="text-align: center; color: #666; font-size: 0.9rem; padding: 1rem;">
@@ -1185,3 +900,5 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Duplicate sections removed - they are now at the top of the page
+
+finish_rerun()
@@ -0,0 +1,76 @@
+"""
+Line-based deltas between resume versions
+A delta is a JSON list of operations applied to the previous version's
+lines: [start, end] copies lines start..end-1 from it, and a string is
+inserted as-is. Resume revisions usually change a few lines, so a delta
+is a small fraction of the full text.
+
+resume_versions rows are either snapshots (full raw_text) or deltas
+against the version before them; rebuild_text() folds a chain that starts
+at a snapshot.
+"""
+import difflib
+import json
+
+def make_delta(old_text, new_text):
+    """Encode new_text as operations on old_text's lines"""
+    old_lines = old_text.splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(new_lines[j1:j2]))
+    return json.dumps(ops, separators=(',', ':'))
+
+def apply_delta(old_text, delta):
+    """Rebuild a version from the previous version's text and its delta"""
+    old_lines = old_text.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_lines[op[0]:op[1]])
+    return ''.join(parts)
+
+def rebuild_text(rows):
+    """Fold version rows (snapshot first, then deltas, oldest to newest) into the last version's text"""
+    text = None
+    for row in rows:
+        if row['is_snapshot']:
+            text = row['raw_text'] or ''
+        elif text is None:
+            raise ValueError(f"Version {row['version_number']} has no snapshot before it")
+        else:
+            text = apply_delta(text, row['text_delta'])
+    return text
+
+def summarize_changes(old_text, new_text, old_data=None, new_data=None):
+    """Lines added/removed between two versions, plus skill changes when extracted data is given"""
+    old_lines = old_text.splitlines()
+    new_lines = new_text.splitlines()
+    added = removed = 0
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            removed += i2 - i1
+            added += j2 - j1
+    summary = {'lines_added': added, 'lines_removed': removed, 'skills_added': [], 'skills_removed': []}
+    if old_data is not None and new_data is not None:
+        old_skills = set(old_data.get('skills', []))
+        new_skills = set(new_data.get('skills', []))
+        summary['skills_added'] = sorted(new_skills - old_skills)
+        summary['skills_removed'] = sorted(old_skills - new_skills)
+    return summary
+
+def describe_changes(summary):
+    """One-line changes_description for a version"""
+    parts = [f"+{summary['lines_added']} / -{summary['lines_removed']} lines"]
+    if summary['skills_added']:
+        parts.append(f"added skills: {', '.join(summary['skills_added'])}")
+    if summary['skills_removed']:
+        parts.append(f"removed skills: {', '.join(summary['skills_removed'])}")
+    return '; '.join(parts)
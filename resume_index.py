@@ -0,0 +1,351 @@
+"""
+Recruiter resume index
+Sparse TF-IDF index over every user's current resume, used to rank all
+stored resumes against one job description.
+
+Resumes are hashed into a fixed feature space (so the index can grow one
+resume at a time without refitting a vocabulary) and kept as sublinear
+term-frequency rows. Document frequencies are maintained incrementally,
+so IDF weights are always current, and a query is a single sparse
+matrix-vector product followed by a partial sort for the top results.
+
+On disk the index is a snapshot (.npz) plus an append-only journal of
+rows added (and users removed) since the snapshot; loading replays the
+journal. The Streamlit app, the API server and the write queue each keep
+their own copy in memory, so every change and compaction happens under a
+file lock (.lock), and each copy first catches up with the files: it
+replays journal lines written by other processes and reloads when another
+process has written a new snapshot. A rebuild holds the lock until its
+snapshot is written, so changes made meanwhile wait and land after it.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single process
+    fcntl = None
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from config import INDEX_CONFIG
+
+N_FEATURES = 2 ** 18
+
+@contextmanager
+def _locked(path, shared=False):
+    """Hold the index's file lock (shared for readers) across processes"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.lock", 'a') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _file_id(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+class ResumeIndex:
+    """Incrementally built, disk-persisted TF-IDF index of current resumes"""
+
+    def __init__(self, path=None, snapshot_every=None):
+        self.path = path
+        self.snapshot_every = snapshot_every or INDEX_CONFIG['snapshot_every']
+        self._vectorizer = HashingVectorizer(n_features=N_FEATURES, alternate_sign=False, norm=None,
+                                             stop_words='english', dtype=np.float32)
+        self._lock = threading.Lock()
+        self._clear()
+        if path:
+            with _locked(path, shared=True):
+                self._load()
+
+    def _clear(self):
+        self._matrix = sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self._pending = []
+        self._doc_freq = np.zeros(N_FEATURES, dtype=np.int32)
+        self.resume_ids = []
+        self.user_ids = []
+        self._active = []
+        self._user_rows = {}
+        self._norms = None
+        self._norms_docs = 0
+        self._journal_size = 0
+        self._journal_offset = 0   # bytes of the journal already applied
+        self._snapshot_id = None   # (inode, mtime, size) of the snapshot loaded
+
+    @contextmanager
+    def _synced(self, shared=False):
+        """File lock plus the in-process lock, with changes from other processes applied"""
+        with _locked(self.path, shared) if self.path else nullcontext():
+            with self._lock:
+                if self.path:
+                    self._sync()
+                yield
+
+    def __len__(self):
+        return len(self._user_rows)
+
+    def _vectorize(self, text):
+        row = self._vectorizer.transform([text or ''])
+        row.data = np.log1p(row.data)
+        return row.tocsr()
+
+    def _append(self, resume_id, user_id, row):
+        previous = self._user_rows.get(user_id)
+        if previous is not None:
+            self._active[previous] = False
+            self._doc_freq[self._row(previous).indices] -= 1
+        self._user_rows[user_id] = len(self.resume_ids)
+        self.resume_ids.append(resume_id)
+        self.user_ids.append(user_id)
+        self._active.append(True)
+        self._pending.append(row)
+        self._doc_freq[row.indices] += 1
+
+    def _remove(self, user_id):
+        position = self._user_rows.pop(user_id, None)
+        if position is None:
+            return False
+        self._active[position] = False
+        self._doc_freq[self._row(position).indices] -= 1
+        return True
+
+    def _row(self, position):
+        if position < self._matrix.shape[0]:
+            return self._matrix[position]
+        return self._pending[position - self._matrix.shape[0]]
+
+    def _compact(self, force=True):
+        # Folding rows into the main matrix copies it, so small batches are scored separately
+        if self._pending and (force or len(self._pending) > max(256, self._matrix.shape[0] // 20)):
+            self._matrix = sparse.vstack([self._matrix] + self._pending, format='csr')
+            self._pending = []
+
+    def _scoring_blocks(self):
+        self._compact(force=False)
+        blocks = [self._matrix]
+        if self._pending:
+            blocks.append(sparse.vstack(self._pending, format='csr'))
+        return blocks
+
+    def _update_norms(self, blocks, idf):
+        # IDF drifts slowly as resumes are added, so norms are only fully recomputed
+        # once the corpus has grown by 1%; new rows get their norms appended
+        docs = len(self._user_rows)
+        if self._norms is None or abs(docs - self._norms_docs) > self._norms_docs // 100:
+            self._norms = np.empty(0, dtype=np.float32)
+            self._norms_docs = docs
+        offset, parts = 0, [self._norms]
+        for block in blocks:
+            start = max(len(self._norms) - offset, 0)
+            if start < block.shape[0]:
+                rows = block[start:]
+                parts.append(np.sqrt(rows.multiply(rows).tocsr() @ (idf * idf)).astype(np.float32))
+            offset += block.shape[0]
+        self._norms = np.concatenate(parts)
+
+    def _drop_inactive(self):
+        keep = np.flatnonzero(self._active)
+        if len(keep) == len(self._active):
+            return
+        self._matrix = self._matrix[keep]
+        self.resume_ids = [self.resume_ids[i] for i in keep]
+        self.user_ids = [self.user_ids[i] for i in keep]
+        self._active = [True] * len(keep)
+        self._user_rows = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        self._norms = None
+
+    def add(self, resume_id, user_id, text):
+        """Index a user's current resume, replacing their previous one"""
+        row = self._vectorize(text)
+        with self._synced():
+            self._append(resume_id, user_id, row)
+            if self.path:
+                self._journal(resume_id, user_id, row)
+
+    def remove(self, user_id):
+        """Drop a user's resume (their last one was deleted); returns whether one was indexed"""
+        with self._synced():
+            removed = self._remove(user_id)
+            if removed and self.path:
+                self._journal_entry({'user_id': user_id, 'removed': True})
+            return removed
+
+    def query(self, job_description, top_k=50):
+        """Return [(resume_id, user_id, score)] for the best matching current resumes"""
+        query = self._vectorize(job_description)
+        with self._synced(shared=True):
+            if not self._user_rows or not query.nnz:
+                return []
+            blocks = self._scoring_blocks()
+            idf = (np.log((1 + len(self._user_rows)) / (1 + self._doc_freq)) + 1).astype(np.float32)
+            self._update_norms(blocks, idf)
+
+            weights = np.zeros(N_FEATURES, dtype=np.float32)
+            weights[query.indices] = query.data * idf[query.indices] ** 2
+            query_norm = np.linalg.norm(query.data * idf[query.indices])
+            scores = np.concatenate([block @ weights for block in blocks])
+            scores /= np.maximum(self._norms, 1e-9) * query_norm
+            scores[~np.asarray(self._active, dtype=bool)] = -np.inf
+
+            count = min(top_k, len(self._user_rows))
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top])]
+            return [(self.resume_ids[i], self.user_ids[i], float(scores[i])) for i in top]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    @property
+    def _snapshot_path(self):
+        return f"{self.path}.npz"
+
+    @property
+    def _journal_path(self):
+        return f"{self.path}.log"
+
+    def _journal(self, resume_id, user_id, row):
+        self._journal_entry({'resume_id': resume_id, 'user_id': user_id,
+                             'indices': row.indices.tolist(), 'data': row.data.tolist()})
+
+    def _journal_entry(self, entry):
+        line = (json.dumps(entry) + '\n').encode('utf-8')
+        with open(self._journal_path, 'ab') as f:
+            f.write(line)
+        self._journal_offset += len(line)
+        self._journal_size += 1
+        if self._journal_size >= self.snapshot_every:
+            self._save_snapshot()
+
+    def save(self):
+        """Write a full snapshot and truncate the journal"""
+        with self._synced():
+            self._save_snapshot()
+
+    def _save_snapshot(self):
+        self._compact()
+        self._drop_inactive()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, data=self._matrix.data, indices=self._matrix.indices, indptr=self._matrix.indptr,
+                 doc_freq=self._doc_freq, resume_ids=np.asarray(self.resume_ids, dtype=np.int64),
+                 user_ids=np.asarray(self.user_ids, dtype=np.int64), active=np.asarray(self._active, dtype=bool))
+        os.replace(tmp_path, self._snapshot_path)
+        if os.path.exists(self._journal_path):
+            os.remove(self._journal_path)
+        self._snapshot_id = _file_id(self._snapshot_path)
+        self._journal_size = 0
+        self._journal_offset = 0
+
+    def _sync(self):
+        # Another process compacted (new snapshot, journal restarted): reload everything
+        if _file_id(self._snapshot_path) != self._snapshot_id or \
+                (_file_id(self._journal_path) or (0, 0, 0))[2] < self._journal_offset:
+            self._clear()
+            self._load()
+        else:
+            self._replay_journal()
+
+    def _load(self):
+        if os.path.exists(self._snapshot_path):
+            with np.load(self._snapshot_path) as snapshot:
+                self._matrix = sparse.csr_matrix(
+                    (snapshot['data'], snapshot['indices'], snapshot['indptr']),
+                    shape=(len(snapshot['indptr']) - 1, N_FEATURES))
+                self._doc_freq = snapshot['doc_freq'].copy()
+                self.resume_ids = snapshot['resume_ids'].tolist()
+                self.user_ids = snapshot['user_ids'].tolist()
+                self._active = snapshot['active'].tolist()
+            self._user_rows = {user_id: i for i, (user_id, active) in enumerate(zip(self.user_ids, self._active))
+                               if active}
+            self._snapshot_id = _file_id(self._snapshot_path)
+        self._replay_journal()
+
+    def _replay_journal(self):
+        """Apply journal lines past the ones already applied"""
+        if not os.path.exists(self._journal_path):
+            return
+        with open(self._journal_path, 'rb') as f:
+            f.seek(self._journal_offset)
+            for line in f:
+                try:
+                    entry = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    break  # Torn final write; everything before it is intact
+                self._journal_offset += len(line)
+                self._journal_size += 1
+                if entry.get('removed'):
+                    self._remove(entry['user_id'])
+                    continue
+                row = sparse.csr_matrix((np.asarray(entry['data'], dtype=np.float32),
+                                         np.asarray(entry['indices'], dtype=np.int32), [0, len(entry['indices'])]),
+                                        shape=(1, N_FEATURES))
+                self._append(entry['resume_id'], entry['user_id'], row)
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_resume_index():
+    """Process-wide resume index loaded from INDEX_CONFIG['path']"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ResumeIndex(INDEX_CONFIG['path'])
+        return _index
+
+def index_resume(resume_id, user_id, raw_text):
+    """Add a freshly saved resume to the recruiter index"""
+    get_resume_index().add(resume_id, user_id, raw_text)
+
+def unindex_user(user_id):
+    """Remove a user from the recruiter index after their last resume was deleted"""
+    return get_resume_index().remove(user_id)
+
+def rebuild_resume_index(batch_size=1000):
+    """Rebuild the index from every user's current resume in the database"""
+    global _index
+    from database import get_db_connection
+    from resume_delta import rebuild_text
+
+    index = ResumeIndex()
+    index.path = INDEX_CONFIG['path']
+    # Adds and removals from any process wait for the lock and are applied on top of the new snapshot
+    with _locked(index.path):
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # Latest text of each current resume: its last snapshot followed by the diffs after it
+            cursor.execute('SELECT r.resume_id, r.user_id, rv.version_number, rv.is_snapshot, rv.raw_text, rv.text_delta FROM resumes r JOIN resume_versions rv ON rv.resume_id = r.resume_id WHERE r.is_current = 1 AND rv.version_number >= (SELECT MAX(version_number) FROM resume_versions WHERE resume_id = r.resume_id AND is_snapshot = 1) ORDER BY r.uploaded_at, r.resume_id, rv.version_number')
+            chain = []
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                for row in rows:
+                    if chain and row['resume_id'] != chain[-1]['resume_id']:
+                        index._append(chain[-1]['resume_id'], chain[-1]['user_id'], index._vectorize(rebuild_text(chain)))
+                        chain = []
+                    chain.append(row)
+                if not rows:
+                    break
+            if chain:
+                index._append(chain[-1]['resume_id'], chain[-1]['user_id'], index._vectorize(rebuild_text(chain)))
+        with index._lock:
+            index._save_snapshot()
+    with _index_lock:
+        _index = index
+    return len(index)
+
+def rank_resumes_for_job(job_description, top_k=50):
+    """Rank all current resumes against a job description"""
+    return get_resume_index().query(job_description, top_k)
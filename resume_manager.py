@@ -1,40 +1,256 @@
 import json
 from datetime import datetime
+from config import VERSION_CONFIG
 from database import get_db_connection
+from metrics import timed_query
+from resume_delta import make_delta, rebuild_text, summarize_changes, describe_changes
+from search import invalidate_search
 
-def save_resume(user_id, resume_name, file_path, file_size, file_type, raw_text, extracted_data):
+def insert_resume(cursor, user_id, resume_name, file_path, file_size, file_type, raw_text, extracted_data, blob_hash=None):
+    """Insert a resume on an open cursor, or a new version of the user's resume with the same name; returns the resume_id"""
+    cursor.execute('UPDATE resumes SET is_current = 0 WHERE user_id = %s', (user_id,))
+    cursor.execute('SELECT resume_id FROM resumes WHERE user_id = %s AND resume_name = %s ORDER BY resume_id DESC LIMIT 1 FOR UPDATE', (user_id, resume_name))
+    existing = cursor.fetchone()
+    if existing:
+        resume_id = existing['resume_id']
+        if insert_version(cursor, resume_id, raw_text, extracted_data, blob_hash, file_size):
+            cursor.execute('UPDATE resumes SET file_path = %s, file_size = %s, file_type = %s, blob_hash = %s, search_text = %s, is_current = 1 WHERE resume_id = %s', (file_path, file_size, file_type, blob_hash, raw_text, resume_id))
+        else:
+            cursor.execute('UPDATE resumes SET is_current = 1 WHERE resume_id = %s', (resume_id,))
+        return resume_id
+    cursor.execute('INSERT INTO resumes (user_id, resume_name, file_path, file_size, file_type, blob_hash, search_text, is_current) VALUES (%s, %s, %s, %s, %s, %s, %s, 1)', (user_id, resume_name, file_path, file_size, file_type, blob_hash, raw_text))
+    resume_id = cursor.lastrowid
+    cursor.execute('INSERT INTO resume_versions (resume_id, version_number, is_snapshot, raw_text, extracted_data, changes_description, blob_hash) VALUES (%s, 1, 1, %s, %s, %s, %s)', (resume_id, raw_text, json.dumps(extracted_data), 'Initial upload', blob_hash))
+    _reference_blob(cursor, blob_hash, file_size)
+    return resume_id
+
+def insert_version(cursor, resume_id, raw_text, extracted_data, blob_hash=None, file_size=None):
+    """Add the next version of a resume as a diff (or a snapshot), returning its number or None if the text is unchanged"""
+    chain = _select_version_chain(cursor, resume_id)
+    previous_text = rebuild_text(chain)
+    latest = chain[-1]
+    if raw_text == previous_text:
+        return None
+    summary = summarize_changes(previous_text, raw_text, json.loads(latest['extracted_data'] or '{}'), extracted_data)
+    delta = make_delta(previous_text, raw_text)
+    # A snapshot bounds how many diffs a read has to apply, and is smaller than a diff of a rewrite
+    snapshot = len(chain) >= VERSION_CONFIG['snapshot_interval'] or len(delta) > VERSION_CONFIG['snapshot_ratio'] * len(raw_text)
+    version_number = latest['version_number'] + 1
+    cursor.execute('INSERT INTO resume_versions (resume_id, version_number, is_snapshot, raw_text, text_delta, extracted_data, changes_description, blob_hash) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)', (resume_id, version_number, snapshot, raw_text if snapshot else None, None if snapshot else delta, json.dumps(extracted_data), describe_changes(summary), blob_hash))
+    _reference_blob(cursor, blob_hash, file_size)
+    return version_number
+
+def _reference_blob(cursor, blob_hash, size_bytes):
+    if blob_hash:
+        cursor.execute('INSERT INTO file_blobs (blob_hash, size_bytes, ref_count) VALUES (%s, %s, 1) ON DUPLICATE KEY UPDATE ref_count = ref_count + 1', (blob_hash, size_bytes or 0))
+
+def _select_version_chain(cursor, resume_id, version_number=None):
+    """Rows from the last snapshot up to a version (default: the latest), oldest first"""
+    if version_number is None:
+        cursor.execute('SELECT version_number, is_snapshot, raw_text, text_delta, extracted_data FROM resume_versions WHERE resume_id = %s AND version_number >= (SELECT MAX(version_number) FROM resume_versions WHERE resume_id = %s AND is_snapshot = 1) ORDER BY version_number', (resume_id, resume_id))
+    else:
+        cursor.execute('SELECT version_number, is_snapshot, raw_text, text_delta, extracted_data FROM resume_versions WHERE resume_id = %s AND version_number <= %s AND version_number >= (SELECT MAX(version_number) FROM resume_versions WHERE resume_id = %s AND is_snapshot = 1 AND version_number <= %s) ORDER BY version_number', (resume_id, version_number, resume_id, version_number))
+    return cursor.fetchall()
+
+def reconstruct_version(cursor, resume_id, version_number=None):
+    """Text of a resume version (default: the latest) on an open cursor, or None if it does not exist"""
+    chain = _select_version_chain(cursor, resume_id, version_number)
+    if not chain or (version_number is not None and chain[-1]['version_number'] != version_number):
+        return None
+    return rebuild_text(chain)
+
+@timed_query
+def save_resume(user_id, resume_name, file_path, file_size, file_type, raw_text, extracted_data, blob_hash=None):
     """Save a new resume for user"""
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('UPDATE resumes SET is_current = 0 WHERE user_id = %s', (user_id,))
-            cursor.execute('INSERT INTO resumes (user_id, resume_name, file_path, file_size, file_type, is_current) VALUES (%s, %s, %s, %s, %s, 1)', (user_id, resume_name, file_path, file_size, file_type))
-            resume_id = cursor.lastrowid
-            cursor.execute('INSERT INTO resume_versions (resume_id, version_number, raw_text, extracted_data, changes_description) VALUES (%s, 1, %s, %s, %s)', (resume_id, raw_text, json.dumps(extracted_data), 'Initial upload'))
-            return True, resume_id, "Resume saved successfully!"
+            resume_id = insert_resume(cursor, user_id, resume_name, file_path, file_size, file_type, raw_text, extracted_data, blob_hash)
+        update_recruiter_index(resume_id, user_id, raw_text)
+        invalidate_search(user_id)
+        return True, resume_id, "Resume saved successfully!"
     except Exception as e:
         return False, None, f"Failed to save resume: {str(e)}"
 
+@timed_query
+def delete_resume(resume_id, user_id):
+    """Delete a resume (versions and analyses cascade) and its original file once no resume references it"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT is_current FROM resumes WHERE resume_id = %s AND user_id = %s', (resume_id, user_id))
+            resume = cursor.fetchone()
+            if not resume:
+                return False, "Resume not found"
+            # Each version holds one reference to the file it was uploaded as
+            cursor.execute('SELECT blob_hash, COUNT(*) AS refs FROM resume_versions WHERE resume_id = %s AND blob_hash IS NOT NULL GROUP BY blob_hash', (resume_id,))
+            blob_refs = cursor.fetchall()
+            cursor.execute('DELETE FROM resumes WHERE resume_id = %s', (resume_id,))
+            released = []
+            for row in blob_refs:
+                cursor.execute('UPDATE file_blobs SET ref_count = ref_count - %s WHERE blob_hash = %s', (row['refs'], row['blob_hash']))
+                cursor.execute('DELETE FROM file_blobs WHERE blob_hash = %s AND ref_count <= 0', (row['blob_hash'],))
+                if cursor.rowcount:
+                    released.append(row['blob_hash'])
+            current = None
+            if resume['is_current']:
+                # The newest remaining resume becomes current (and replaces this one in the recruiter index)
+                cursor.execute('SELECT resume_id FROM resumes WHERE user_id = %s ORDER BY uploaded_at DESC, resume_id DESC LIMIT 1', (user_id,))
+                current = cursor.fetchone()
+                if current:
+                    cursor.execute('UPDATE resumes SET is_current = 1 WHERE resume_id = %s', (current['resume_id'],))
+                    current_text = reconstruct_version(cursor, current['resume_id'])
+        if released:
+            from blob_store import get_blob_store
+            for blob_hash in released:
+                get_blob_store().delete(blob_hash)
+        if current:
+            update_recruiter_index(current['resume_id'], user_id, current_text)
+        elif resume['is_current']:
+            # That was the user's last resume
+            remove_from_recruiter_index(user_id)
+        invalidate_search(user_id)
+        return True, "Resume deleted"
+    except Exception as e:
+        return False, f"Failed to delete resume: {str(e)}"
+
+def collect_orphan_blobs():
+    """Remove stored files that no resume references (kept back by the delete grace period, or from failed saves)"""
+    from blob_store import get_blob_store
+    store = get_blob_store()
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT blob_hash FROM file_blobs')
+            referenced = {row['blob_hash'] for row in cursor.fetchall()}
+        removed = sum(store.delete(digest) for digest in list(store.digests()) if digest not in referenced)
+        return True, removed, f"Removed {removed} unreferenced file(s)"
+    except Exception as e:
+        return False, 0, f"Failed to collect files: {str(e)}"
+
+def update_recruiter_index(resume_id, user_id, raw_text):
+    """Add a saved resume to the recruiter index without failing the save"""
+    try:
+        from resume_index import index_resume
+        index_resume(resume_id, user_id, raw_text)
+    except Exception as e:
+        print(f"⚠️ Recruiter index update skipped: {e}")
+
+def remove_from_recruiter_index(user_id):
+    """Drop a user with no resumes left from the recruiter index without failing the delete"""
+    try:
+        from resume_index import unindex_user
+        unindex_user(user_id)
+    except Exception as e:
+        print(f"⚠️ Recruiter index update skipped: {e}")
+
+@timed_query
 def get_user_resumes(user_id):
     """Get all resumes for a user"""
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT r.*, COUNT(DISTINCT rv.version_id) as version_count, COUNT(DISTINCT rah.analysis_id) as analysis_count FROM resumes r LEFT JOIN resume_versions rv ON r.resume_id = rv.resume_id LEFT JOIN resume_analysis_history rah ON r.resume_id = rah.resume_id WHERE r.user_id = %s GROUP BY r.resume_id ORDER BY r.uploaded_at DESC', (user_id,))
+            cursor.execute('SELECT r.resume_id, r.user_id, r.resume_name, r.file_path, r.file_size, r.file_type, r.blob_hash, r.is_current, r.uploaded_at, COUNT(DISTINCT rv.version_id) as version_count, COUNT(DISTINCT rah.analysis_id) as analysis_count FROM resumes r LEFT JOIN resume_versions rv ON r.resume_id = rv.resume_id LEFT JOIN resume_analysis_history rah ON r.resume_id = rah.resume_id WHERE r.user_id = %s GROUP BY r.resume_id ORDER BY r.uploaded_at DESC', (user_id,))
             return cursor.fetchall()
     except Exception as e:
         return []
 
+@timed_query
+def get_resume_versions(resume_id):
+    """Get the versions of a resume with their change descriptions, newest first"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT version_id, version_number, is_snapshot, changes_description, created_at, LENGTH(COALESCE(raw_text, text_delta)) AS stored_bytes FROM resume_versions WHERE resume_id = %s ORDER BY version_number DESC', (resume_id,))
+            return cursor.fetchall()
+    except Exception as e:
+        return []
+
+@timed_query
+def get_resume_text(resume_id, version_number=None):
+    """Get the full text of a resume version (default: the latest)"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            return reconstruct_version(cursor, resume_id, version_number)
+    except Exception as e:
+        return None
+
+@timed_query
+def compare_resume_versions(resume_id, from_version, to_version):
+    """Summarize what changed between two versions of a resume (lines and skills added/removed)"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            texts = {}
+            for version_number in (from_version, to_version):
+                texts[version_number] = reconstruct_version(cursor, resume_id, version_number)
+                if texts[version_number] is None:
+                    return False, None, f"Version {version_number} not found"
+            cursor.execute('SELECT version_number, extracted_data FROM resume_versions WHERE resume_id = %s AND version_number IN (%s, %s)', (resume_id, from_version, to_version))
+            data = {row['version_number']: json.loads(row['extracted_data'] or '{}') for row in cursor.fetchall()}
+            summary = summarize_changes(texts[from_version], texts[to_version], data.get(from_version), data.get(to_version))
+            return True, summary, describe_changes(summary)
+    except Exception as e:
+        return False, None, f"Failed to compare versions: {str(e)}"
+
+@timed_query
+def count_user_resumes(user_id):
+    """Count resumes for a user without fetching them"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) AS total FROM resumes WHERE user_id = %s', (user_id,))
+            return cursor.fetchone()['total']
+    except Exception as e:
+        return 0
+
+def insert_analysis(cursor, resume_id, version_id, job_title, job_description, analysis_results):
+    """Insert analysis results on an open cursor and extend the user's score trend"""
+    cursor.execute('INSERT INTO resume_analysis_history (resume_id, version_id, job_title, job_description, selection_probability, missing_skills, strengths, weaknesses, suggestions) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)', (resume_id, version_id, job_title, job_description, analysis_results.get('selection_probability'), json.dumps(analysis_results.get('missing_skills', [])), json.dumps(analysis_results.get('strengths', [])), json.dumps(analysis_results.get('weaknesses', [])), json.dumps(analysis_results.get('suggestions', []))))
+    analysis_id = cursor.lastrowid
+    append_score_trend(cursor, analysis_id, resume_id, job_title, analysis_results.get('selection_probability'))
+    return analysis_id
+
+def append_score_trend(cursor, analysis_id, resume_id, job_title, selection_probability):
+    """Add one analysis to the per-user, per-job-title trend using only the previous point"""
+    job_title = job_title or 'Unknown'
+    cursor.execute('SELECT user_id FROM resumes WHERE resume_id = %s', (resume_id,))
+    user_id = cursor.fetchone()['user_id']
+    cursor.execute('SELECT selection_probability, best_probability, run_index FROM resume_score_trends WHERE user_id = %s AND job_title = %s ORDER BY analyzed_at DESC, analysis_id DESC LIMIT 1', (user_id, job_title))
+    previous = cursor.fetchone()
+    previous_probability = previous['selection_probability'] if previous else None
+    delta = selection_probability - previous_probability if selection_probability is not None and previous_probability is not None else None
+    best = max([p for p in (selection_probability, previous['best_probability'] if previous else None) if p is not None], default=None)
+    run_index = previous['run_index'] + 1 if previous else 1
+    cursor.execute('INSERT INTO resume_score_trends (analysis_id, user_id, resume_id, job_title, analyzed_at, selection_probability, previous_probability, delta, best_probability, run_index) SELECT analysis_id, %s, resume_id, %s, analyzed_at, selection_probability, %s, %s, %s, %s FROM resume_analysis_history WHERE analysis_id = %s', (user_id, job_title, previous_probability, delta, best, run_index, analysis_id))
+
+@timed_query
 def save_analysis(resume_id, version_id, job_title, job_description, analysis_results):
     """Save resume analysis results"""
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('INSERT INTO resume_analysis_history (resume_id, version_id, job_title, job_description, selection_probability, missing_skills, strengths, weaknesses, suggestions) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)', (resume_id, version_id, job_title, job_description, analysis_results.get('selection_probability'), json.dumps(analysis_results.get('missing_skills', [])), json.dumps(analysis_results.get('strengths', [])), json.dumps(analysis_results.get('weaknesses', [])), json.dumps(analysis_results.get('suggestions', []))))
+            insert_analysis(cursor, resume_id, version_id, job_title, job_description, analysis_results)
             return True, "Analysis saved!"
     except Exception as e:
         return False, f"Failed: {str(e)}"
 
+@timed_query
+def get_resumes_by_ids(resume_ids):
+    """Get resume and owner details for a list of resume ids"""
+    if not resume_ids:
+        return {}
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ', '.join(['%s'] * len(resume_ids))
+            cursor.execute(f'SELECT r.resume_id, r.resume_name, r.uploaded_at, u.user_id, u.full_name, u.email FROM resumes r JOIN users u ON r.user_id = u.user_id WHERE r.resume_id IN ({placeholders})', tuple(resume_ids))
+            return {row['resume_id']: row for row in cursor.fetchall()}
+    except Exception as e:
+        return {}
+
+@timed_query
 def get_analysis_history(resume_id):
     """Get analysis history for a resume"""
     try:
@@ -45,6 +261,50 @@ def get_analysis_history(resume_id):
     except:
         return []
 
-def get_resume_improvement_trends(user_id):
-    """Get improvement trends"""
-    return []
+def backfill_score_trends(cursor, user_id=None):
+    """Compute score trends from the analysis history with window functions on an open cursor; returns the row count"""
+    user_filter = 'WHERE r.user_id = %s' if user_id is not None else ''
+    params = (user_id,) if user_id is not None else ()
+    cursor.execute(f'''
+        INSERT INTO resume_score_trends (analysis_id, user_id, resume_id, job_title, analyzed_at, selection_probability, previous_probability, delta, best_probability, run_index)
+        SELECT rah.analysis_id, r.user_id, rah.resume_id, COALESCE(rah.job_title, 'Unknown'), rah.analyzed_at, rah.selection_probability,
+               LAG(rah.selection_probability) OVER w,
+               rah.selection_probability - LAG(rah.selection_probability) OVER w,
+               MAX(rah.selection_probability) OVER (w ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW),
+               ROW_NUMBER() OVER w
+        FROM resume_analysis_history rah
+        JOIN resumes r ON rah.resume_id = r.resume_id
+        {user_filter}
+        WINDOW w AS (PARTITION BY r.user_id, COALESCE(rah.job_title, 'Unknown') ORDER BY rah.analyzed_at, rah.analysis_id)
+    ''', params)
+    return cursor.rowcount
+
+@timed_query
+def rebuild_resume_score_trends(user_id=None):
+    """Recompute score trends from the full analysis history with window functions"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            if user_id is not None:
+                cursor.execute('DELETE FROM resume_score_trends WHERE user_id = %s', (user_id,))
+            else:
+                cursor.execute('DELETE FROM resume_score_trends')
+            return True, backfill_score_trends(cursor, user_id), "Trends rebuilt!"
+    except Exception as e:
+        return False, 0, f"Failed to rebuild trends: {str(e)}"
+
+def _select_score_trends(cursor, user_id, job_title=None):
+    if job_title:
+        cursor.execute('SELECT job_title, analyzed_at, selection_probability, delta, best_probability, run_index FROM resume_score_trends WHERE user_id = %s AND job_title = %s ORDER BY analyzed_at, analysis_id', (user_id, job_title))
+    else:
+        cursor.execute('SELECT job_title, analyzed_at, selection_probability, delta, best_probability, run_index FROM resume_score_trends WHERE user_id = %s ORDER BY job_title, analyzed_at, analysis_id', (user_id,))
+    return cursor.fetchall()
+
+@timed_query
+def get_resume_improvement_trends(user_id, job_title=None):
+    """Get the selection probability trend per job title, oldest first"""
+    try:
+        with get_db_connection() as conn:
+            return _select_score_trends(conn.cursor(), user_id, job_title)
+    except Exception as e:
+        return []
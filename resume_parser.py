@@ -1,13 +1,26 @@
-import fitz  # PyMuPDF(other name) extract pdf text , uses less ram ,alternates->pdfplumber(good for tables,slower),pdfminer(complex but heavy)
-import docx
+from metrics import timed
 
+# fitz and docx are imported on first use so app startup does not pay for them
+@timed('parse_pdf')
 def extract_text_from_pdf(file_path):
+    import fitz  # PyMuPDF(other name) extract pdf text , uses less ram ,alternates->pdfplumber(good for tables,slower),pdfminer(complex but heavy)
     text = ""
     pdf = fitz.open(file_path)
     for page in pdf:
         text += page.get_text()
     return text
 
+@timed('parse_docx')
 def extract_text_from_docx(file_path):
+    import docx
     doc = docx.Document(file_path)
     return "\n".join([para.text for para in doc.paragraphs])
+
+def extract_text_from_blob(digest, file_type):
+    """Re-parse a stored original file (see blob_store)"""
+    from blob_store import get_blob_store
+    # Both parsers open the stored file by path (zipfile needs a real seekable file for DOCX)
+    path = get_blob_store().path(digest)
+    if file_type == 'pdf':
+        return extract_text_from_pdf(path)
+    return extract_text_from_docx(path)
@@ -0,0 +1,195 @@
+"""
+Full-text search over a user's job applications and resumes
+Applications are matched on job title, description, notes and company
+name, resumes on their name and latest text. MySQL FULLTEXT indexes do
+the matching and ranking; when the server has none (the index could not
+be created, or SEARCH_BACKEND=memory) an in-process inverted index with
+BM25 ranking is built per user and kept for SEARCH_INDEX_TTL seconds.
+
+Results come back a page at a time, best match first.
+"""
+import itertools
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from config import SEARCH_CONFIG
+from metrics import timed_query
+from resume_delta import rebuild_text
+
+# MySQL errors meaning FULLTEXT is not usable: no matching index / engine without FULLTEXT
+FULLTEXT_UNAVAILABLE_ERRORS = (1191, 1214)
+
+_fulltext_available = SEARCH_CONFIG['backend'] != 'memory'
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize(text):
+    """Lowercase word tokens (keeps c++ and c# whole)"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+class SearchIndex:
+    """Inverted index with BM25 ranking over weighted fields"""
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.positions = defaultdict(list)    # token -> doc positions
+        self.frequencies = defaultdict(list)  # token -> weighted term frequency per position
+        self.items = []     # position -> result row
+        self.lengths = []   # position -> weighted token count
+        self._arrays = {}   # token -> postings as numpy arrays, filled by searches
+        self._norms = None
+
+    def add(self, fields, item):
+        """Index a document from [(text, weight)] fields; item (a dict) is returned in its results"""
+        position = len(self.items)
+        tokens = []
+        for text, weight in fields:
+            tokens.extend(tokenize(text) * weight)
+        counts = Counter(tokens)
+        for token, count in counts.items():
+            self.positions[token].append(position)
+            self.frequencies[token].append(count)
+        self.items.append(item)
+        self.lengths.append(len(tokens))
+        self._arrays = {}
+        self._norms = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def _posting(self, token):
+        arrays = self._arrays.get(token)
+        if arrays is None and token in self.positions:
+            arrays = self._arrays[token] = (np.asarray(self.positions[token], dtype=np.int64),
+                                            np.asarray(self.frequencies[token], dtype=np.float64))
+        return arrays
+
+    def search(self, query, limit, offset=0):
+        """Return up to limit+1 results after offset (the extra one tells whether there is a next page)"""
+        n = len(self.items)
+        if not n:
+            return []
+        if self._norms is None:
+            lengths = np.asarray(self.lengths, dtype=np.float64)
+            self._norms = self.K1 * (1 - self.B + self.B * lengths / (lengths.mean() or 1.0))
+        scores = np.zeros(n)
+        for token in set(tokenize(query)):
+            posting = self._posting(token)
+            if posting is None:
+                continue
+            positions, frequencies = posting
+            idf = math.log(1 + (n - len(positions) + 0.5) / (len(positions) + 0.5))
+            scores[positions] += idf * frequencies * (self.K1 + 1) / (frequencies + self._norms[positions])
+        hits = np.flatnonzero(scores)
+        wanted = offset + limit + 1
+        if len(hits) > wanted:
+            hits = hits[np.argpartition(-scores[hits], wanted - 1)[:wanted]]
+        # Best score first; ties go to the most recently added document
+        ranked = sorted(hits.tolist(), key=lambda position: (-scores[position], -position))
+        return [dict(self.items[position], score=float(scores[position])) for position in ranked[offset:]]
+
+# Per-user fallback indexes: (built_at, SearchIndex), least recently built evicted first
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def _build_index(user_id):
+    from database import get_db_connection
+
+    index = SearchIndex()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT ja.application_id, ja.job_title, ja.job_description, ja.notes, ja.status, ja.application_date, c.company_name FROM job_applications ja LEFT JOIN companies c ON ja.company_id = c.company_id WHERE ja.user_id = %s', (user_id,))
+        for row in cursor.fetchall():
+            index.add([(row['job_title'], 3), (row['company_name'], 3), (row['job_description'], 1), (row['notes'], 1)],
+                      {'kind': 'application', 'item_id': row['application_id'], 'title': row['job_title'],
+                       'subtitle': row['company_name'], 'status': row['status'], 'date': row['application_date']})
+        cursor.execute('SELECT resume_id, resume_name, uploaded_at, search_text FROM resumes WHERE user_id = %s', (user_id,))
+        for row in cursor.fetchall():
+            index.add([(row['resume_name'], 3), (row['search_text'], 1)],
+                      {'kind': 'resume', 'item_id': row['resume_id'], 'title': row['resume_name'],
+                       'subtitle': None, 'status': None, 'date': row['uploaded_at']})
+    return index
+
+def get_search_index(user_id):
+    """The user's in-process index, rebuilt when older than SEARCH_INDEX_TTL"""
+    with _indexes_lock:
+        entry = _indexes.get(user_id)
+    if entry is not None and time.monotonic() - entry[0] <= SEARCH_CONFIG['index_ttl']:
+        return entry[1]
+    index = _build_index(user_id)
+    with _indexes_lock:
+        _indexes.pop(user_id, None)
+        _indexes[user_id] = (time.monotonic(), index)
+        while len(_indexes) > SEARCH_CONFIG['max_indexes']:
+            _indexes.pop(next(iter(_indexes)))
+    return index
+
+def invalidate_search(user_id):
+    """Drop a user's in-process index after one of their applications or resumes changed"""
+    with _indexes_lock:
+        _indexes.pop(user_id, None)
+
+def _search_fulltext(cursor, user_id, query, limit, offset):
+    # Company matches count double so "stripe" ranks Stripe applications above mentions in notes
+    cursor.execute('''
+        SELECT * FROM (
+            SELECT 'application' AS kind, ja.application_id AS item_id, ja.job_title AS title, c.company_name AS subtitle, ja.status, ja.application_date AS date,
+                   MATCH(ja.job_title, ja.job_description, ja.notes) AGAINST (%s IN NATURAL LANGUAGE MODE) + 2 * IFNULL(MATCH(c.company_name) AGAINST (%s IN NATURAL LANGUAGE MODE), 0) AS score
+            FROM job_applications ja LEFT JOIN companies c ON ja.company_id = c.company_id
+            WHERE ja.user_id = %s AND (MATCH(ja.job_title, ja.job_description, ja.notes) AGAINST (%s IN NATURAL LANGUAGE MODE) OR MATCH(c.company_name) AGAINST (%s IN NATURAL LANGUAGE MODE))
+            UNION ALL
+            SELECT 'resume', r.resume_id, r.resume_name, NULL, NULL, r.uploaded_at,
+                   MATCH(r.resume_name, r.search_text) AGAINST (%s IN NATURAL LANGUAGE MODE)
+            FROM resumes r
+            WHERE r.user_id = %s AND MATCH(r.resume_name, r.search_text) AGAINST (%s IN NATURAL LANGUAGE MODE)
+        ) hits
+        ORDER BY score DESC, kind, item_id DESC
+        LIMIT %s OFFSET %s
+    ''', (query, query, user_id, query, query, query, user_id, query, limit + 1, offset))
+    return cursor.fetchall()
+
+@timed_query
+def search_user_content(user_id, query, page=1, page_size=None):
+    """Search a user's applications and resumes; returns (success, {'results', 'page', 'page_size', 'has_more', 'backend'}, msg)"""
+    global _fulltext_available
+    from database import get_db_connection
+
+    page = max(int(page), 1)
+    page_size = min(max(int(page_size or SEARCH_CONFIG['page_size']), 1), SEARCH_CONFIG['max_page_size'])
+    offset = (page - 1) * page_size
+    result = {'results': [], 'page': page, 'page_size': page_size, 'has_more': False, 'backend': None}
+    if not tokenize(query):
+        return True, result, "Enter words to search for"
+    try:
+        rows = None
+        if _fulltext_available:
+            try:
+                with get_db_connection() as conn:
+                    rows = _search_fulltext(conn.cursor(), user_id, query, page_size, offset)
+                result['backend'] = 'fulltext'
+            except Exception as e:
+                if getattr(e, 'errno', None) not in FULLTEXT_UNAVAILABLE_ERRORS:
+                    raise
+                print(f"⚠️ FULLTEXT search unavailable ({e}), using the in-process index")
+                _fulltext_available = False
+        if rows is None:
+            rows = get_search_index(user_id).search(query, page_size, offset)
+            result['backend'] = 'memory'
+        result['has_more'] = len(rows) > page_size
+        result['results'] = rows[:page_size]
+        return True, result, f"{len(result['results'])} result(s)"
+    except Exception as e:
+        return False, result, f"Search failed: {str(e)}"
+
+def backfill_resume_search_text(cursor):
+    """Fill resumes.search_text with each resume's latest text (run once when the column is added)"""
+    cursor.execute('SELECT rv.resume_id, rv.version_number, rv.is_snapshot, rv.raw_text, rv.text_delta FROM resume_versions rv WHERE rv.version_number >= (SELECT MAX(version_number) FROM resume_versions WHERE resume_id = rv.resume_id AND is_snapshot = 1) ORDER BY rv.resume_id, rv.version_number')
+    rows = cursor.fetchall()
+    for resume_id, chain in itertools.groupby(rows, key=lambda row: row['resume_id']):
+        cursor.execute('UPDATE resumes SET search_text = %s WHERE resume_id = %s', (rebuild_text(list(chain)), resume_id))
@@ -0,0 +1,49 @@
+"""
+Per-session data cache
+Streamlit re-runs the whole script on every interaction. Page data such as
+the sidebar stats is loaded once per session and served from
+st.session_state until one of the app's own write actions invalidates its
+group (or the entry is older than SESSION_CACHE_TTL seconds, for changes
+made from another session). A load that hit a database error is not
+cached, even when the loader swallowed it and returned [] or 0, so the
+next rerun tries again instead of showing empty data for the whole TTL.
+"""
+import time
+
+import streamlit as st
+
+from config import SESSION_CACHE_CONFIG
+from database import query_failures
+
+CACHE_KEY = '_data_cache'
+
+# Cache groups invalidated by write actions
+RESUMES = 'resumes'
+APPLICATIONS = 'applications'
+
+def _entries():
+    if CACHE_KEY not in st.session_state:
+        st.session_state[CACHE_KEY] = {}
+    return st.session_state[CACHE_KEY]
+
+def cached(group, loader, *args):
+    """Return loader(*args), loading it at most once per session until the group is invalidated"""
+    entries = _entries()
+    key = (group, loader.__name__, args)
+    entry = entries.get(key)
+    if entry is None or time.monotonic() - entry[0] > SESSION_CACHE_CONFIG['ttl_seconds']:
+        failures = query_failures()
+        value = loader(*args)
+        if value is None or query_failures() != failures:
+            entries.pop(key, None)
+            return value
+        entry = (time.monotonic(), value)
+        entries[key] = entry
+    return entry[1]
+
+def invalidate(*groups):
+    """Drop cached data for the given groups, or everything when no group is given"""
+    entries = _entries()
+    for key in list(entries):
+        if not groups or key[0] in groups:
+            del entries[key]
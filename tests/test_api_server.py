@@ -0,0 +1,61 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from api_server import APIError, APIRequestHandler, Request, analyze, score, _job_arguments
+
+@pytest.mark.parametrize('data, message', [
+    ({'job_description': ['not', 'text']}, 'job_description'),
+    ({'job_requirements': ['Python']}, 'job_requirements must be an object'),
+    ({'job_requirements': 'Python'}, 'job_requirements must be an object'),
+    ({'job_requirements': {'skills': 'Python'}}, 'skills'),
+    ({'job_requirements': {'skills': ['Python', 3]}}, 'skills'),
+    ({'job_requirements': {'education_level': 3}}, 'education_level'),
+    ({'job_requirements': {'min_experience': 'a few'}}, 'min_experience'),
+    ({'job_requirements': {'min_experience': [2]}}, 'min_experience'),
+])
+def test_malformed_job_arguments_are_rejected(data, message):
+    with pytest.raises(APIError) as error:
+        _job_arguments(data)
+    assert error.value.status == 400
+    assert message in error.value.message
+
+def test_job_arguments_fill_defaults():
+    description, requirements = _job_arguments({'job_requirements': {'skills': ['Python'], 'min_experience': '3'}})
+    assert description == ''
+    assert requirements == {'skills': ['Python'], 'min_experience': 3, 'education_level': 'Any'}
+
+@pytest.mark.parametrize('endpoint, body', [
+    (analyze, {'resume_text': 'Python developer', 'job_requirements': ['Python']}),
+    (analyze, {'resume_data': {'skills': 'Python'}}),
+    (analyze, {'resume_text': 'Python developer', 'job_requirements': {'education_level': None}}),
+    (score, {'resumes': 'Python developer'}),
+    (score, {'resumes': [{'skills': ['Python']}, 7]}),
+])
+def test_malformed_payloads_return_400(endpoint, body):
+    with pytest.raises(APIError) as error:
+        endpoint(Request({}, {}, json.dumps(body).encode('utf-8')))
+    assert error.value.status == 400
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), APIRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.parametrize('length', ['abc', '-5'])
+def test_bad_content_length_returns_400(server, length):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    connection.putrequest('POST', '/api/login')
+    connection.putheader('Content-Length', length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read())['error'] == "Invalid Content-Length"
+    connection.close()
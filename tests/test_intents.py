@@ -0,0 +1,49 @@
+import pytest
+
+from analysis.chatbot import chat_router
+from analysis.intents import IntentRouter
+
+@pytest.mark.parametrize('message, intent', [
+    # The old if-chain sent these to the wrong branch
+    ('Review my experience', 'experience'),
+    ('Can you review my projects?', 'projects'),
+    ('What is your opinion of my resume?', 'review'),
+    ('Show me my skill gaps', 'skills'),
+    ('am I a good fit for this role', 'selection'),
+])
+def test_phrasings_the_if_chain_misrouted(message, intent):
+    assert chat_router.classify(message)[0] == intent
+
+@pytest.mark.parametrize('message, intent', [
+    # Keywords of several intents: the heavier keyword wins, then the higher priority
+    ('Help me improve my resume', 'improve'),
+    ('Will my projects improve my chances?', 'improve'),
+    ('What is your honest review of my skills?', 'review'),
+    ('What skills do I need to learn?', 'skills'),
+])
+def test_ambiguous_phrasings(message, intent):
+    assert chat_router.classify(message)[0] == intent
+
+@pytest.mark.parametrize('message, intent', [
+    # Known misroutes from the held-out set; strict so a fix shows up here
+    ('How do I explain a gap in employment?', 'experience'),
+    ('Do I know enough Python for this?', 'skills'),
+    ('What file format should I upload?', 'general'),
+])
+@pytest.mark.xfail(strict=True, reason='keywords were not tuned on the held-out set')
+def test_known_misroutes(message, intent):
+    assert chat_router.classify(message)[0] == intent
+
+def test_ties_go_to_the_higher_priority():
+    router = IntentRouter()
+    router.register('general', {}, 'general')
+    router.register('low', {'resume': 1}, 'low', priority=1)
+    router.register('high', {'resume': 1}, 'high', priority=2)
+    assert router.classify('my resume') == ('high', 1.0)
+
+def test_unmatched_message_falls_back_to_the_default():
+    router = IntentRouter()
+    router.register('general', {}, 'general')
+    router.register('greeting', {'hello': 1}, 'hi')
+    router.set_classifier(lambda message: ('greeting', 0.2), min_confidence=0.5)
+    assert router.classify('tell me a joke') == ('general', 0.0)
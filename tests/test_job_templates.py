@@ -0,0 +1,20 @@
+import pytest
+
+from analysis.job_templates import get_template_index, match_job_template
+
+@pytest.mark.parametrize('job_title', ['Data Engineer', 'iOS Developer', 'Project Manager', 'Java Developer'])
+def test_titles_sharing_only_a_role_noun_use_the_default_template(job_title):
+    match = match_job_template(job_title)
+    assert match['title'] is None
+    assert match['skills'] == get_template_index().default['skills']
+
+@pytest.mark.parametrize('job_title, expected', [
+    ('Sr. SWE', 'software engineer'),
+    ('ML Eng', 'machine learning engineer'),
+    ('data sci', 'data scientist'),
+    ('sofware enginer', 'software engineer'),
+    ('Security Analyst', 'cybersecurity analyst'),
+    ('Senior Product Manager', 'product manager'),
+])
+def test_abbreviated_and_misspelled_titles_still_match(job_title, expected):
+    assert match_job_template(job_title)['title'] == expected
@@ -0,0 +1,17 @@
+from job_tracker import compute_application_funnel
+
+def transition(application_id, status, seconds=None, company="Acme"):
+    return {'application_id': application_id, 'company_name': company, 'status': status, 'seconds_in_stage': seconds}
+
+def test_rejected_only_application_counts_as_applied():
+    rows = [transition(1, 'Applied', 86400), transition(1, 'Interview'),
+            transition(2, 'Rejected')]
+    result = compute_application_funnel(rows)
+    counts = {stage['stage']: stage['count'] for stage in result['funnel']}
+    assert counts == {'Applied': 2, 'Interview': 1, 'Offer': 0}
+    assert result['rejected'] == 1
+    assert result['by_company'][0]['interview_rate'] == 50.0
+
+def test_empty_history():
+    result = compute_application_funnel([])
+    assert [stage['count'] for stage in result['funnel']] == [0, 0, 0]
@@ -0,0 +1,11 @@
+from metrics import REGISTRY, Counter
+
+def test_callback_counter_is_exposed_as_a_counter():
+    counter = Counter('test_lookups_total', 'Lookups', ['result'], function=lambda: {('hit',): 3, ('miss',): 1})
+    assert list(counter.samples()) == [('test_lookups_total', '{result="hit"}', 3),
+                                       ('test_lookups_total', '{result="miss"}', 1)]
+
+def test_cache_lookups_are_a_counter():
+    text = REGISTRY.render()
+    assert '# TYPE jobpath_cache_lookups_total counter' in text
+    assert 'jobpath_cache_lookups_total{cache="analysis",result="miss"}' in text
@@ -0,0 +1,14 @@
+import rerun_profiler
+from rerun_profiler import PROFILER_CONFIG, start_rerun
+
+def test_rerun_that_raised_is_abandoned_when_the_next_starts(tmp_path, monkeypatch):
+    monkeypatch.setitem(PROFILER_CONFIG, 'enabled', True)
+    monkeypatch.setitem(PROFILER_CONFIG, 'sample_rate', 1.0)
+    monkeypatch.setitem(PROFILER_CONFIG, 'dir', str(tmp_path))
+    failed = start_rerun('session')
+    assert failed._profile is not None
+    following = start_rerun('session')
+    assert failed._profile is None
+    timings = following.finish()
+    assert timings['dump'] and 'session' not in rerun_profiler._unfinished
+    assert len(list(tmp_path.glob('*.prof'))) == 1
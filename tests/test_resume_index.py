@@ -0,0 +1,55 @@
+from resume_index import ResumeIndex
+
+JOB = "Python developer with Django and PostgreSQL experience"
+
+def build(path=None):
+    index = ResumeIndex(path)
+    index.add(1, 10, "Python Django PostgreSQL backend developer")
+    index.add(2, 20, "Python data analyst, pandas and SQL")
+    index.add(3, 30, "Graphic designer, Photoshop and Illustrator")
+    return index
+
+def test_removed_user_is_not_ranked():
+    index = build()
+    assert index.remove(10)
+    assert not index.remove(10)
+    results = index.query(JOB, top_k=3)
+    assert [user_id for _, user_id, _ in results] == [20, 30]
+    assert len(index) == 2
+
+def test_top_k_is_filled_after_removal():
+    index = build()
+    index.add(4, 40, "Senior Python engineer, Django REST framework")
+    index.remove(10)
+    results = index.query("python", top_k=2)
+    assert sorted(user_id for _, user_id, _ in results) == [20, 40]
+
+def test_removal_survives_reload(tmp_path):
+    path = str(tmp_path / "index")
+    build(path).remove(10)
+    reloaded = ResumeIndex(path)
+    assert len(reloaded) == 2
+    assert 10 not in [user_id for _, user_id, _ in reloaded.query(JOB)]
+    reloaded.save()
+    assert 10 not in [user_id for _, user_id, _ in ResumeIndex(path).query(JOB)]
+
+def test_copies_sharing_files_see_each_others_changes(tmp_path):
+    # The app, the API server and the write queue each hold their own copy of the index
+    path = str(tmp_path / "index")
+    app, api = ResumeIndex(path, snapshot_every=1000), ResumeIndex(path, snapshot_every=1000)
+    app.add(1, 10, "Python Django PostgreSQL backend developer")
+    api.add(2, 20, "Python data analyst, pandas and SQL")
+    assert sorted(user_id for _, user_id, _ in app.query("python")) == [10, 20]
+    app.save()
+    api.add(3, 30, "Python machine learning engineer")
+    api.remove(10)
+    assert sorted(user_id for _, user_id, _ in app.query("python")) == [20, 30]
+    assert sorted(user_id for _, user_id, _ in ResumeIndex(path).query("python")) == [20, 30]
+
+def test_compaction_by_another_copy_keeps_its_changes(tmp_path):
+    path = str(tmp_path / "index")
+    first, second = ResumeIndex(path, snapshot_every=2), ResumeIndex(path, snapshot_every=2)
+    first.add(1, 10, "Python developer")
+    second.add(2, 20, "Python analyst")  # second write compacts the journal into a snapshot
+    first.add(3, 30, "Python engineer")
+    assert sorted(user_id for _, user_id, _ in second.query("python")) == [10, 20, 30]
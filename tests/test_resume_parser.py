@@ -0,0 +1,21 @@
+import pytest
+
+import blob_store
+from blob_store import BlobStore
+from resume_parser import extract_text_from_blob
+
+pytest.importorskip('docx')
+from benchmarks.corpus import write_docx
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / 'uploads'), delete_grace=0)
+    monkeypatch.setattr(blob_store, '_store', store)
+    return store
+
+def test_docx_blob_is_parsed(store, tmp_path):
+    text = "Jane Doe\nSkills: Python, SQL\nExperience: Backend Developer"
+    path = tmp_path / 'resume.docx'
+    write_docx(text, str(path))
+    digest = store.put(path.read_bytes())
+    assert extract_text_from_blob(digest, 'docx') == text
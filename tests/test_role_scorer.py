@@ -0,0 +1,22 @@
+from analysis.job_templates import get_template_index
+from analysis.role_scorer import RoleScorer, rank_best_fit_roles
+
+RESUME = {'skills': ['Python', 'SQL', 'Docker', 'React'], 'experience': ['Backend Developer - 3 years'],
+          'education': ['Bachelor of Technology'], 'projects': [], 'certifications': []}
+
+def _scores(roles):
+    return [(role['selection_probability'], role['matched_skills'], role['total_skills']) for role in roles]
+
+def test_custom_roles_rank_like_a_combined_scorer():
+    templates = {title: template['skills'] for title, template in get_template_index().templates.items()}
+    replaced = next(iter(templates))
+    for custom in ({'Platform Engineer': ['Python', 'Docker', 'Kubernetes']}, {replaced: ['Python', 'SQL']}):
+        roles = {title: skills for title, skills in templates.items() if title not in custom}
+        roles.update(custom)
+        expected = RoleScorer(roles).rank(RESUME, None, 5)
+        assert _scores(rank_best_fit_roles(RESUME, None, custom, 5)) == _scores(expected)
+
+def test_replaced_template_is_not_listed_twice():
+    title = next(iter(get_template_index().templates))
+    ranked = rank_best_fit_roles(RESUME, None, {title: ['Python']}, None)
+    assert [role['title'] for role in ranked].count(title) == 1
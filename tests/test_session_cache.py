@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+
+import pytest
+
+import database
+import session_cache
+from resume_manager import count_user_resumes, get_user_resumes
+
+class FakeCursor:
+    def execute(self, query, params=None):
+        self.query = query
+
+    def fetchall(self):
+        return [{'resume_id': 1}]
+
+    def fetchone(self):
+        return {'total': 1}
+
+class FakeConnection:
+    def cursor(self):
+        return FakeCursor()
+
+@pytest.fixture
+def database_state(monkeypatch):
+    state = {'down': True}
+
+    @contextmanager
+    def connect():
+        if state['down']:
+            raise ConnectionError('MySQL server has gone away')
+        yield FakeConnection()
+
+    monkeypatch.setattr(database, 'ensure_database', lambda: None)
+    monkeypatch.setattr(database, '_connect', connect)
+    monkeypatch.setattr(session_cache.st, 'session_state', {}, raising=False)
+    return state
+
+@pytest.mark.parametrize('loader, empty, loaded', [(get_user_resumes, [], [{'resume_id': 1}]),
+                                                   (count_user_resumes, 0, 1)])
+def test_failed_load_is_not_cached(database_state, loader, empty, loaded):
+    assert session_cache.cached(session_cache.RESUMES, loader, 7) == empty
+    database_state['down'] = False
+    assert session_cache.cached(session_cache.RESUMES, loader, 7) == loaded
+    database_state['down'] = True
+    assert session_cache.cached(session_cache.RESUMES, loader, 7) == loaded
+
+def test_empty_result_is_cached(database_state):
+    calls = []
+    def loader(user_id):
+        calls.append(user_id)
+        return []
+    assert session_cache.cached(session_cache.RESUMES, loader, 7) == []
+    assert session_cache.cached(session_cache.RESUMES, loader, 7) == []
+    assert calls == [7]
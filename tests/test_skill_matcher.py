@@ -0,0 +1,22 @@
+from analysis.skill_matcher import SkillMatcher, tokenize
+
+def test_slash_and_hyphen_joined_skills_match_their_parts():
+    matcher = SkillMatcher(['Java', 'Python', 'HTML', 'CSS', 'React', 'Redux'])
+    matched, missing = matcher.match("Java/Python developer\nHTML/CSS\nPython-based tools\nReact-Redux apps")
+    assert matched == ['Java', 'Python', 'HTML', 'CSS', 'React', 'Redux']
+    assert missing == []
+
+def test_known_joined_skills_stay_whole():
+    assert tokenize("CI/CD with scikit-learn and Node.js") == ['ci/cd', 'with', 'scikit-learn', 'and', 'node.js']
+    matcher = SkillMatcher(['CI/CD', 'scikit-learn', 'Node.js', 'Learn'])
+    matched, missing = matcher.match("CI/CD pipelines, scikit-learn models, Node.js services")
+    assert matched == ['CI/CD', 'scikit-learn', 'Node.js']
+    assert missing == ['Learn']
+
+def test_joined_skill_names_still_match_whole():
+    matcher = SkillMatcher(['React-Native', 'UI/UX'])
+    assert matcher.match("Built React-Native apps with a UI/UX focus") == (['React-Native', 'UI/UX'], [])
+
+def test_word_boundaries_are_kept():
+    matcher = SkillMatcher(['Java', 'Go'])
+    assert matcher.match("JavaScript at Google") == ([], ['Java', 'Go'])
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+
+import pytest
+
+import write_queue
+from write_queue import DONE, FAILED, PENDING, WriteQueue
+
+class FakeConnection:
+    def cursor(self):
+        return None
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    applied, failing = [], set()
+
+    @contextmanager
+    def connection():
+        yield FakeConnection()
+
+    def save_resume(cursor, payload, resolve):
+        if payload['resume_name'] in failing:
+            raise ValueError('duplicate entry')
+        applied.append(payload['resume_name'])
+        return len(applied)
+
+    def save_analysis(cursor, payload, resolve):
+        resume_id = payload.get('resume_id') or resolve(payload['resume_job'])
+        applied.append(f"analysis of {resume_id}")
+        return resume_id
+
+    monkeypatch.setattr(write_queue, 'get_db_connection', connection)
+    monkeypatch.setattr(write_queue, 'WRITE_HANDLERS', {'save_resume': (save_resume, None),
+                                                        'save_analysis': (save_analysis, None)})
+    queue = WriteQueue(str(tmp_path / 'queue.sqlite3'), max_attempts=2)
+    queue.applied, queue.failing = applied, failing
+    return queue
+
+def drain(queue):
+    batch = queue._claim()
+    if batch:
+        queue._process(batch)
+
+def test_failed_job_holds_back_its_dependents_only(queue):
+    queue.failing.add('broken')
+    resume_job = queue.submit('save_resume', {'user_id': 1, 'resume_name': 'broken'})
+    analysis_job = queue.submit('save_analysis', {'resume_job': resume_job})
+    same_user_job = queue.submit('save_resume', {'user_id': 1, 'resume_name': 'later'})
+    other_user_job = queue.submit('save_resume', {'user_id': 2, 'resume_name': 'unrelated'})
+    drain(queue)
+    assert queue.applied == ['unrelated']
+    assert queue.status(other_user_job)[0] == DONE
+    for job_id in (resume_job, analysis_job, same_user_job):
+        assert queue.status(job_id)[0] == PENDING
+    # While the failed job waits for its retry nothing that depends on it is claimed
+    assert queue._claim() == []
+
+def test_dependents_run_in_order_after_the_retry_succeeds(queue, monkeypatch):
+    queue.failing.add('flaky')
+    resume_job = queue.submit('save_resume', {'user_id': 1, 'resume_name': 'flaky'})
+    analysis_job = queue.submit('save_analysis', {'resume_job': resume_job})
+    drain(queue)
+    queue.failing.clear()
+    monkeypatch.setattr(write_queue.time, 'time', lambda: 1e12)
+    drain(queue)
+    assert queue.applied == ['flaky', 'analysis of 1']
+    assert queue.status(analysis_job)[0] == DONE
+
+def test_analysis_fails_when_its_resume_fails_for_good(queue, monkeypatch):
+    queue.failing.add('broken')
+    resume_job = queue.submit('save_resume', {'user_id': 1, 'resume_name': 'broken'})
+    analysis_job = queue.submit('save_analysis', {'resume_job': resume_job})
+    drain(queue)
+    monkeypatch.setattr(write_queue.time, 'time', lambda: 1e12)
+    drain(queue)
+    assert queue.status(resume_job)[0] == FAILED
+    drain(queue)
+    status, _, error = queue.status(analysis_job)
+    assert status == FAILED and 'failed' in error
+    assert queue.pending() == 0
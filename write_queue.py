@@ -0,0 +1,386 @@
+"""
+Write-behind queue
+Resume and analysis saves are journaled to a local SQLite file and applied
+to MySQL by a background thread in batches (one transaction per batch), so
+the Streamlit script thread never waits on database writes.
+
+- Durable: jobs survive restarts and are replayed on the next start.
+- Ordered: jobs are applied in submission order, so an analysis can refer
+  to a resume that is still queued (resume_job=<job_id>). A failed job is
+  retried with backoff; until it succeeds, later jobs of the same user and
+  analyses of its resume wait behind it while unrelated jobs carry on. When
+  it fails for good, analyses of its resume fail too.
+- Back-pressure: when max_pending jobs are waiting, submit() waits up to
+  enqueue_timeout seconds and then writes synchronously instead.
+- Shutdown: an atexit hook drains the queue for up to shutdown_timeout seconds.
+- Housekeeping: when idle, the thread removes unreferenced resume files
+  every sweep_interval seconds (collect_orphan_blobs).
+
+One queue (one journal file) per process is assumed.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import WRITE_QUEUE_CONFIG, BLOB_CONFIG
+from database import get_db_connection
+from resume_manager import insert_resume, insert_analysis, update_recruiter_index, collect_orphan_blobs
+from search import invalidate_search
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Finished jobs are kept this long so sessions can look up their results
+DONE_RETENTION_SECONDS = 24 * 3600
+
+class DependencyFailed(LookupError):
+    """The queued job a write depends on (resume_job) failed for good"""
+
+def _dependency_keys(job_id, payload):
+    # Jobs sharing a key are applied in submission order, even across failures and retries
+    keys = {('job', job_id)}
+    if payload.get('user_id') is not None:
+        keys.add(('user', payload['user_id']))
+    if payload.get('resume_job') is not None:
+        keys.add(('job', payload['resume_job']))
+    return keys
+
+def _apply_save_resume(cursor, payload, resolve):
+    return insert_resume(cursor, payload['user_id'], payload['resume_name'], payload['file_path'],
+                         payload['file_size'], payload['file_type'], payload['raw_text'], payload['extracted_data'],
+                         payload.get('blob_hash'))
+
+def _after_save_resume(payload, resume_id):
+    update_recruiter_index(resume_id, payload['user_id'], payload['raw_text'])
+    invalidate_search(payload['user_id'])
+
+def _apply_save_analysis(cursor, payload, resolve):
+    resume_id = payload.get('resume_id') or resolve(payload['resume_job'])
+    return insert_analysis(cursor, resume_id, payload.get('version_id'), payload['job_title'],
+                           payload['job_description'], payload['analysis_results'])
+
+# kind -> (apply(cursor, payload, resolve) -> result, after_commit(payload, result) or None)
+WRITE_HANDLERS = {
+    'save_resume': (_apply_save_resume, _after_save_resume),
+    'save_analysis': (_apply_save_analysis, None),
+}
+
+class WriteQueue:
+    """SQLite-journaled queue of database writes drained by a background thread"""
+
+    def __init__(self, path, batch_size=50, max_pending=1000, enqueue_timeout=5.0, max_attempts=10,
+                 poll_interval=1.0, sweep_interval=0):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.enqueue_timeout = enqueue_timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.sweep_interval = sweep_interval  # 0 disables the orphan file sweep
+        self._last_sweep = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                retry_at REAL NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                finished_at REAL
+            )
+        ''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, job_id)')
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._outages = 0
+        with self._lock:
+            # Jobs claimed by a previous process that died mid-batch run again
+            self._db.execute('UPDATE jobs SET status = ? WHERE status = ?', (PENDING, RUNNING))
+            self._db.execute('DELETE FROM jobs WHERE status = ? AND finished_at < ?',
+                             (DONE, time.time() - DONE_RETENTION_SECONDS))
+            self._pending = self._db.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (PENDING,)).fetchone()[0]
+
+    def start(self):
+        """Start the background writer (idempotent)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='write-queue', daemon=True)
+            self._thread.start()
+        return self
+
+    def pending(self):
+        return self._pending
+
+    def submit(self, kind, payload):
+        """Queue a write and return its job_id; writes synchronously when the queue stays full"""
+        if kind not in WRITE_HANDLERS:
+            raise ValueError(f"Unknown write kind: {kind}")
+        data = json.dumps(payload, default=str)
+        # Only the decision is made under the lock; a synchronous write runs without it
+        with self._space:
+            queued = self._space.wait_for(lambda: self._pending < self.max_pending, timeout=self.enqueue_timeout)
+            if queued:
+                cursor = self._db.execute('INSERT INTO jobs (kind, payload, status, created_at) VALUES (?, ?, ?, ?)',
+                                          (kind, data, PENDING, time.time()))
+                self._pending += 1
+        if not queued:
+            return self._write_now(kind, payload, data)
+        self._wake.set()
+        return cursor.lastrowid
+
+    def _write_now(self, kind, payload, data):
+        # The queue is still full after enqueue_timeout (or disabled): write in the caller's thread
+        if self.max_pending:
+            print(f"⚠️ Write queue full ({self._pending} pending), writing {kind} synchronously")
+        apply, after_commit = WRITE_HANDLERS[kind]
+        status, result, error = DONE, None, None
+
+        def resolve(job_id):
+            with self._lock:
+                return self._resolve_locked(job_id)
+
+        try:
+            with get_db_connection() as conn:
+                result = apply(conn.cursor(), payload, resolve)
+            if after_commit:
+                after_commit(payload, result)
+        except Exception as e:
+            status, error = FAILED, str(e)
+        with self._lock:
+            cursor = self._db.execute(
+                'INSERT INTO jobs (kind, payload, status, attempts, result, error, created_at, finished_at) VALUES (?, ?, ?, 1, ?, ?, ?, ?)',
+                (kind, data, status, json.dumps(result), error, time.time(), time.time()))
+        return cursor.lastrowid
+
+    def status(self, job_id):
+        """Return (status, result, error) for a job, or (None, None, None) if unknown"""
+        with self._lock:
+            row = self._db.execute('SELECT status, result, error FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None, None, None
+        return row[0], json.loads(row[1]) if row[1] is not None else None, row[2]
+
+    def result(self, job_id):
+        """Result of a finished job (e.g. the new resume_id), or None while it is pending"""
+        status, result, _ = self.status(job_id)
+        return result if status == DONE else None
+
+    def _resolve_locked(self, job_id):
+        row = self._db.execute('SELECT status, result, error FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if row is not None and row[0] == FAILED:
+            raise DependencyFailed(f"Job {job_id} failed: {row[2]}")
+        if row is None or row[0] != DONE:
+            raise LookupError(f"Job {job_id} has not completed ({row[0] if row else 'unknown'})")
+        return json.loads(row[1])
+
+    def _claim(self):
+        now = time.time()
+        batch, blocked = [], set()
+        with self._lock:
+            # A job waiting for its retry holds back the later jobs that share a key with it
+            for job_id, kind, payload, attempts, retry_at in self._db.execute(
+                    'SELECT job_id, kind, payload, attempts, retry_at FROM jobs WHERE status = ? ORDER BY job_id', (PENDING,)):
+                payload = json.loads(payload)
+                keys = _dependency_keys(job_id, payload)
+                if retry_at > now or keys & blocked:
+                    blocked |= keys
+                    continue
+                batch.append((job_id, kind, payload, attempts))
+                if len(batch) == self.batch_size:
+                    break
+            if batch:
+                self._db.executemany('UPDATE jobs SET status = ? WHERE job_id = ?', [(RUNNING, job[0]) for job in batch])
+            return batch
+
+    def _apply(self, batch):
+        """Apply a batch in one transaction; returns {job_id: result}"""
+        results = {}
+
+        def resolve(job_id):
+            if job_id in results:
+                return results[job_id]
+            with self._lock:
+                return self._resolve_locked(job_id)
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for job_id, kind, payload, _ in batch:
+                results[job_id] = WRITE_HANDLERS[kind][0](cursor, payload, resolve)
+        return results
+
+    def _finish(self, batch, results):
+        now = time.time()
+        with self._space:
+            self._db.executemany('UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE job_id = ?',
+                                 [(DONE, json.dumps(results[job[0]]), now, job[0]) for job in batch])
+            self._pending -= len(batch)
+            self._space.notify_all()
+        for job_id, kind, payload, _ in batch:
+            after_commit = WRITE_HANDLERS[kind][1]
+            if after_commit:
+                try:
+                    after_commit(payload, results[job_id])
+                except Exception as e:
+                    print(f"⚠️ Post-write step for {kind} job {job_id} failed: {e}")
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._db.executemany('UPDATE jobs SET status = ? WHERE job_id = ?', [(PENDING, job[0]) for job in batch])
+
+    def _fail(self, job, error):
+        job_id, kind, _, attempts = job
+        attempts += 1
+        status = FAILED if attempts >= self.max_attempts or isinstance(error, DependencyFailed) else PENDING
+        now = time.time()
+        with self._space:
+            # Retried with exponential backoff; _claim holds back the jobs that depend on it meanwhile
+            self._db.execute('UPDATE jobs SET status = ?, attempts = ?, retry_at = ?, error = ?, finished_at = ? WHERE job_id = ?',
+                             (status, attempts, now + min(300, 0.5 * 2 ** attempts), str(error),
+                              now if status == FAILED else None, job_id))
+            if status == FAILED:
+                self._pending -= 1
+                self._space.notify_all()
+                print(f"❌ Write queue gave up on {kind} job {job_id}: {error}")
+
+    def _database_available(self):
+        try:
+            with get_db_connection():
+                return True
+        except Exception:
+            return False
+
+    def _process(self, batch):
+        """Apply a batch; returns False when the database is unreachable"""
+        try:
+            results = self._apply(batch)
+        except Exception as e:
+            if not self._database_available():
+                # An outage doesn't count against the jobs: put them back and back off
+                self._requeue(batch)
+                self._outages += 1
+                self._stop.wait(min(60, 0.5 * 2 ** self._outages))
+                return False
+            if len(batch) == 1:
+                self._fail(batch[0], e)
+                return True
+            # One bad job fails the whole transaction: retry one job at a time to isolate it,
+            # leaving the jobs behind a failed one that depend on it for the next claim
+            blocked = set()
+            for position, job in enumerate(batch):
+                keys = _dependency_keys(job[0], job[2])
+                if keys & blocked:
+                    self._requeue([job])
+                    blocked |= keys
+                    continue
+                if not self._process([job]):
+                    self._requeue(batch[position + 1:])
+                    return False
+                if self.status(job[0])[0] != DONE:
+                    blocked |= keys
+            return True
+        self._outages = 0
+        self._finish(batch, results)
+        return True
+
+    def _sweep(self):
+        # First sweep on the first idle moment after start, then every sweep_interval seconds
+        if not self.sweep_interval:
+            return
+        now = time.monotonic()
+        if self._last_sweep is not None and now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        success, removed, message = collect_orphan_blobs()
+        if not success:
+            print(f"⚠️ {message}")
+        elif removed:
+            print(f"✅ {message}")
+
+    def _run(self):
+        while True:
+            batch = self._claim()
+            if batch:
+                if not self._process(batch) and self._stop.is_set():
+                    return  # database down during shutdown: jobs stay journaled for the next start
+                continue
+            if self._stop.is_set():
+                return
+            self._sweep()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def flush(self, timeout=None):
+        """Wait until every queued job has been applied or has failed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._space:
+            return self._space.wait_for(lambda: self._pending == 0,
+                                        timeout=None if deadline is None else max(0, deadline - time.monotonic()))
+
+    def close(self, timeout=10.0):
+        """Drain the queue (up to timeout seconds) and stop the writer; unfinished jobs stay journaled"""
+        if self._thread is not None and self._thread.is_alive():
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+        with self._lock:
+            left = self._pending
+        if left:
+            print(f"⚠️ {left} queued write(s) left for the next start")
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_write_queue():
+    """Process-wide write queue, started on first use and drained at exit"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            if WRITE_QUEUE_CONFIG['enabled']:
+                _queue = WriteQueue(WRITE_QUEUE_CONFIG['path'], batch_size=WRITE_QUEUE_CONFIG['batch_size'],
+                                    max_pending=WRITE_QUEUE_CONFIG['max_pending'],
+                                    enqueue_timeout=WRITE_QUEUE_CONFIG['enqueue_timeout'],
+                                    sweep_interval=BLOB_CONFIG['sweep_interval_seconds']).start()
+                atexit.register(_queue.close, WRITE_QUEUE_CONFIG['shutdown_timeout'])
+            else:
+                # Disabled: every submit writes inline and is recorded as a finished job
+                _queue = WriteQueue(WRITE_QUEUE_CONFIG['path'], max_pending=0, enqueue_timeout=0)
+        return _queue
+
+def queue_save_resume(user_id, resume_name, file_path, file_size, file_type, raw_text, extracted_data, blob_hash=None):
+    """Queue save_resume; the job's result is the new resume_id"""
+    try:
+        job_id = get_write_queue().submit('save_resume', {
+            'user_id': user_id, 'resume_name': resume_name, 'file_path': file_path, 'file_size': file_size,
+            'file_type': file_type, 'raw_text': raw_text, 'extracted_data': extracted_data, 'blob_hash': blob_hash
+        })
+        return True, job_id, "Resume queued for saving!"
+    except Exception as e:
+        return False, None, f"Failed to queue resume: {str(e)}"
+
+def queue_save_analysis(job_title, job_description, analysis_results, resume_id=None, resume_job=None, version_id=None):
+    """Queue save_analysis for a saved resume (resume_id) or a queued one (resume_job)"""
+    try:
+        job_id = get_write_queue().submit('save_analysis', {
+            'resume_id': resume_id, 'resume_job': resume_job, 'version_id': version_id, 'job_title': job_title,
+            'job_description': job_description, 'analysis_results': analysis_results
+        })
+        return True, job_id, "Analysis queued for saving!"
+    except Exception as e:
+        return False, None, f"Failed to queue analysis: {str(e)}"